@@ -0,0 +1,62 @@
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from src.models.session import Session
+from src.models.session_store import SessionStore
+from src.services.category_aggregator import CategoryAggregator
+
+SESSION_COUNT = 1_000_000
+PROJECT_COUNT = 20
+TASKS_PER_PROJECT = 10
+
+
+def build_sessions() -> List[Session]:
+    rng = random.Random(0)
+    task_names = [f"プロジェクト{p} 作業{t}" for p in range(PROJECT_COUNT) for t in range(TASKS_PER_PROJECT)]
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    sessions: List[Session] = []
+    for _ in range(SESSION_COUNT):
+        session = Session(rng.choice(task_names))
+        minutes = rng.randint(1, 90)
+        session.start_time = start
+        session.end_time = start + timedelta(minutes=minutes)
+        sessions.append(session)
+        start += timedelta(minutes=minutes)
+    return sessions
+
+
+def build_categories() -> Dict[str, Any]:
+    return {
+        "categories": [
+            {"name": f"プロジェクト{p}", "tasks": [f"プロジェクト{p} 作業{t}" for t in range(TASKS_PER_PROJECT)]}
+            for p in range(PROJECT_COUNT)
+        ]
+    }
+
+
+def main() -> None:
+    sessions = build_sessions()
+    categories = build_categories()
+    store = SessionStore()
+    for session in sessions:
+        store.append(session)
+    aggregator = CategoryAggregator()
+
+    started = time.perf_counter()
+    per_session = aggregator.aggregate(sessions, categories)
+    per_session_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    columnar = aggregator.aggregate_store(store, categories)
+    columnar_seconds = time.perf_counter() - started
+
+    assert [c["total_time"] for c in columnar] == [c["total_time"] for c in per_session]
+    print(f"sessions: {SESSION_COUNT:,}")
+    print(f"aggregate:       {per_session_seconds * 1000:10.1f} ms")
+    print(f"aggregate_store: {columnar_seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import time
+from typing import Dict, List
+from unittest.mock import patch
+
+from src.services.gemini_client import GeminiClient
+
+TASK_COUNT = 600
+MODEL_LATENCY = 0.05
+CHUNK_TOKENS = 400
+TASK_NAMES = [f"プロジェクト{i % 30} 作業{i}" for i in range(TASK_COUNT)]
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeAsyncModel:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        await asyncio.sleep(self.latency)
+        tasks = json.loads(prompt.split("タスクリスト:\n", 1)[1].split("\n", 1)[0])
+        categories: Dict[str, List[str]] = {}
+        for task in tasks:
+            categories.setdefault(task.split()[0], []).append(task)
+        return FakeResponse(
+            json.dumps({"categories": [{"name": name, "tasks": names} for name, names in categories.items()]})
+        )
+
+
+def main() -> None:
+    with patch("google.generativeai.configure"), patch("google.generativeai.GenerativeModel"):
+        client = GeminiClient(api_key="benchmark")
+
+    chunk_count = len(client._chunk_tasks(TASK_NAMES, CHUNK_TOKENS))
+    print(f"tasks: {TASK_COUNT}, chunks: {chunk_count}, fake model latency: {MODEL_LATENCY * 1000:.0f} ms")
+    for concurrency in (1, 2, 4, 8, 16):
+        client.model = FakeAsyncModel(latency=MODEL_LATENCY)  # type: ignore[assignment]
+        started = time.perf_counter()
+        asyncio.run(client.categorize_tasks_batched(TASK_NAMES, CHUNK_TOKENS, concurrency))
+        seconds = time.perf_counter() - started
+        print(f"concurrency {concurrency:2d}: {seconds * 1000:8.1f} ms, {TASK_COUNT / seconds:10,.0f} tasks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import statistics
+import time
+from typing import Callable, List
+
+from google.generativeai import client as genai_client
+
+from src.services.gemini_client import GeminiClient, clear_clients, get_client
+
+SUMMARY_COUNT = 50
+
+
+def prepare_transport(client: GeminiClient) -> None:
+    # What the first generate_content call does before any network traffic
+    if client.model._client is None:
+        client.model._client = genai_client.get_default_generative_client()  # type: ignore[assignment]
+
+
+def measure(create_client: Callable[[], GeminiClient]) -> List[float]:
+    timings: List[float] = []
+    for _ in range(SUMMARY_COUNT):
+        started = time.perf_counter()
+        prepare_transport(create_client())
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    print(
+        f"{label:22s} first: {timings[0] * 1000:8.3f} ms, "
+        f"later median: {statistics.median(timings[1:]) * 1000:8.3f} ms"
+    )
+
+
+def main() -> None:
+    clear_clients()
+    print(f"summaries: {SUMMARY_COUNT} (client setup up to the network call)")
+    report("client per summary", measure(lambda: GeminiClient(api_key="benchmark")))
+    report("shared client", measure(lambda: get_client("benchmark")))
+    print("a fresh client also drops the pooled gRPC channel, so each real summary pays a new TLS handshake")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import json
+import time
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+from src.services.gemini_client import GeminiClient
+
+TASK_COUNT = 600
+CATEGORY_COUNT = 30
+CHUNK_CHARS = 64
+CHUNK_LATENCY = 0.001
+TASK_NAMES = [f"プロジェクト{i % CATEGORY_COUNT} 作業{i}" for i in range(TASK_COUNT)]
+
+
+class FakeChunk:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeStreamingModel:
+    # Emits the reply a few characters at a time, like a model generating tokens
+    def generate_content(self, prompt: str, stream: bool = False) -> Iterator[FakeChunk]:
+        tasks = json.loads(prompt.split("タスクリスト:\n", 1)[1].split("\n", 1)[0])
+        categories: Dict[str, List[str]] = {}
+        for task in tasks:
+            categories.setdefault(task.split()[0], []).append(task)
+        text = json.dumps(
+            {"categories": [{"name": name, "tasks": names} for name, names in categories.items()]},
+            ensure_ascii=False,
+        )
+        for start in range(0, len(text), CHUNK_CHARS):
+            time.sleep(CHUNK_LATENCY)
+            yield FakeChunk(text[start : start + CHUNK_CHARS])
+
+
+def main() -> None:
+    with patch("google.generativeai.configure"), patch("google.generativeai.GenerativeModel"):
+        client = GeminiClient(api_key="benchmark")
+    client.model = FakeStreamingModel()  # type: ignore[assignment]
+
+    arrivals: List[float] = []
+    started = time.perf_counter()
+
+    def on_category(category: Dict[str, Any]) -> None:
+        arrivals.append(time.perf_counter() - started)
+
+    client.categorize_tasks(TASK_NAMES, on_category=on_category)
+    total = time.perf_counter() - started
+
+    print(
+        f"tasks: {TASK_COUNT}, categories: {len(arrivals)}, chunk: {CHUNK_CHARS} chars / {CHUNK_LATENCY * 1000:.0f} ms"
+    )
+    print(f"first category: {arrivals[0] * 1000:8.1f} ms ({arrivals[0] / total:6.1%} of full response)")
+    print(f"full response:  {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import time
+
+from src.models.task_tracker import TaskTracker
+from src.storage.journal import SessionJournal
+
+EVENT_COUNT = 1_000_000
+REPEATS = 3
+# Best replay of the whole journal into a tracker; above budget exits non-zero
+REPLAY_BUDGET_MS = 750.0
+TASK_NAMES = [f"プロジェクト{p} 作業{t}" for p in range(20) for t in range(10)]
+
+
+def write_journal(path: str) -> None:
+    journal = SessionJournal(path, fsync_interval=60.0, compact_every=EVENT_COUNT * 2)
+    tracker = journal.load()
+    journal.attach(tracker)
+    events = 0
+    index = 0
+    while events < EVENT_COUNT:
+        tracker.start_task(TASK_NAMES[index % len(TASK_NAMES)])
+        tracker.pause_current()
+        tracker.resume_current()
+        events += 4
+        index += 1
+    tracker.stop_all()
+    journal.detach()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.journal")
+
+        started = time.perf_counter()
+        write_journal(path)
+        write_seconds = time.perf_counter() - started
+
+        replay_timings = []
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            tracker: TaskTracker = SessionJournal(path).load()
+            replay_timings.append(time.perf_counter() - started)
+        replay_ms = min(replay_timings) * 1000
+
+        status = "ok" if replay_ms <= REPLAY_BUDGET_MS else "REGRESSION"
+        print(f"events: {EVENT_COUNT:,} ({os.path.getsize(path) / 1_000_000:.1f} MB)")
+        print(f"write:  {write_seconds * 1000:10.1f} ms")
+        print(
+            f"replay: {replay_ms:10.1f} ms ({len(tracker.sessions):,} sessions, "
+            f"{replay_ms * 1_000_000 / EVENT_COUNT:.0f} ns/event, budget {REPLAY_BUDGET_MS:.0f} ms) {status}"
+        )
+        if status != "ok":
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+from benchmarks.fake_gemini import FakeGeminiModel, fixed, lognormal
+from src.models.session import Session
+from src.services.categorizer_chain import CategorizerChain
+from src.services.category_aggregator import CategoryAggregator
+from src.services.category_cache import CategoryCallback
+from src.services.gemini_client import clear_clients
+from src.services.request_scheduler import RequestScheduler
+from src.utils.markdown import format_sessions_to_markdown
+
+TASK_LIST_SIZES = (20, 200, 1000)
+CONCURRENCY_LEVELS = (1, 4, 8)
+REQUESTS_PER_RUN = 32
+PROJECT_COUNT = 25
+
+# Scaled-down stand-in for the real model: long-tailed first token, steady generation, occasional 503s
+FIRST_TOKEN_MEDIAN = 0.02
+FIRST_TOKEN_SIGMA = 0.6
+CHARS_PER_SECOND = 200_000.0
+ERROR_RATE = 0.02
+
+# p95 of the pipeline itself against an instant model; above budget exits non-zero
+OVERHEAD_BUDGET_MS: Dict[int, float] = {20: 5.0, 200: 20.0, 1000: 80.0}
+
+
+def build_workload(size: int) -> Tuple[List[str], List[Session]]:
+    # Client names miss the local rules, so every task reaches the model
+    task_names = [f"顧客{chr(65 + i % PROJECT_COUNT)} 作業{i}" for i in range(size)]
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    sessions: List[Session] = []
+    for index, task_name in enumerate(task_names):
+        session = Session(task_name)
+        session.start_time = start
+        session.end_time = start + timedelta(minutes=5 + index % 40)
+        session.is_running = False
+        sessions.append(session)
+        start = session.end_time
+    return task_names, sessions
+
+
+@contextmanager
+def fake_sdk(model: FakeGeminiModel) -> Iterator[None]:
+    # Every client the chains build talks to the fake model; no cache or rule file is read
+    environment = {
+        name: value
+        for name, value in os.environ.items()
+        if name not in ("TASK_TRACKER_CATEGORY_CACHE", "TASK_TRACKER_RULES")
+    }
+    with (
+        patch.dict(os.environ, environment, clear=True),
+        patch("google.generativeai.configure"),
+        patch("google.generativeai.GenerativeModel", return_value=model),
+    ):
+        try:
+            yield
+        finally:
+            clear_clients()
+
+
+def run_pipeline(
+    api_key: str,
+    scheduler: Optional[RequestScheduler],
+    task_names: List[str],
+    sessions: List[Session],
+    on_category: Optional[CategoryCallback] = None,
+) -> float:
+    # The summary screen's path: a chain per summary, categories streamed as they close, then the totals.
+    # Each summary gets its own key so learned labels never let a later one skip the model.
+    started = time.perf_counter()
+    chain = CategorizerChain(api_key, scheduler=scheduler, on_category=on_category or (lambda category: None))
+    categories = chain.categorize_tasks(task_names)
+    CategoryAggregator().aggregate(sessions, categories)
+    format_sessions_to_markdown(sessions)
+    return time.perf_counter() - started
+
+
+def measure(model: FakeGeminiModel, size: int, concurrency: int) -> Tuple[List[float], float, Any]:
+    task_names, sessions = build_workload(size)
+    scheduler = RequestScheduler(max_workers=concurrency, backoff_base=0.01, backoff_cap=0.05)
+
+    with fake_sdk(model), ThreadPoolExecutor(max_workers=concurrency) as callers:
+        started = time.perf_counter()
+        latencies = list(
+            callers.map(
+                lambda index: run_pipeline(f"benchmark-{index}", scheduler, task_names, sessions),
+                range(REQUESTS_PER_RUN),
+            )
+        )
+        elapsed = time.perf_counter() - started
+    metrics = scheduler.metrics()
+    scheduler.close()
+    return latencies, elapsed, metrics
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure_streaming(size: int) -> Tuple[float, float]:
+    task_names, sessions = build_workload(size)
+    model = FakeGeminiModel(fixed(FIRST_TOKEN_MEDIAN), chars_per_second=CHARS_PER_SECOND)
+
+    arrivals: List[float] = []
+    with fake_sdk(model):
+        started = time.perf_counter()
+        total = run_pipeline(
+            "benchmark-stream",
+            None,
+            task_names,
+            sessions,
+            on_category=lambda category: arrivals.append(time.perf_counter() - started),
+        )
+    return arrivals[0], total
+
+
+def main() -> None:
+    print(
+        f"fake model: first token lognormal(median {FIRST_TOKEN_MEDIAN * 1000:.0f} ms, sigma {FIRST_TOKEN_SIGMA}), "
+        f"{CHARS_PER_SECOND:,.0f} chars/s, error rate {ERROR_RATE:.0%}; {REQUESTS_PER_RUN} requests per run"
+    )
+    percentiles = " ".join(f"{column:>9s}" for column in ("p50 ms", "p95 ms", "p99 ms"))
+    print(f"{'tasks':>6s} {'conc':>4s} {percentiles} {'req/s':>8s} {'tasks/s':>10s} retries")
+    for size in TASK_LIST_SIZES:
+        for concurrency in CONCURRENCY_LEVELS:
+            model = FakeGeminiModel(
+                lognormal(FIRST_TOKEN_MEDIAN, FIRST_TOKEN_SIGMA),
+                chars_per_second=CHARS_PER_SECOND,
+                error_rate=ERROR_RATE,
+                seed=size * 31 + concurrency,
+            )
+            latencies, elapsed, metrics = measure(model, size, concurrency)
+            print(
+                f"{size:6d} {concurrency:4d} {percentile(latencies, 0.5) * 1000:9.1f} "
+                f"{percentile(latencies, 0.95) * 1000:9.1f} {percentile(latencies, 0.99) * 1000:9.1f} "
+                f"{REQUESTS_PER_RUN / elapsed:8.1f} {REQUESTS_PER_RUN * size / elapsed:10,.0f} {metrics.retries:7d}"
+            )
+
+    print()
+    for size in TASK_LIST_SIZES:
+        first, total = measure_streaming(size)
+        print(f"streaming {size:5d} tasks: first category {first * 1000:7.1f} ms, full response {total * 1000:7.1f} ms")
+
+    print()
+    failed = False
+    for size, budget_ms in OVERHEAD_BUDGET_MS.items():
+        latencies, _, _ = measure(FakeGeminiModel(), size, 1)
+        overhead_ms = percentile(latencies, 0.95) * 1000
+        status = "ok" if overhead_ms <= budget_ms else "REGRESSION"
+        failed = failed or status != "ok"
+        print(f"pipeline overhead {size:5d} tasks: p95 {overhead_ms:7.2f} ms (budget {budget_ms:5.1f} ms) {status}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import random
+import re
+import time
+from typing import Callable, List, Optional
+
+from src.services.rule_categorizer import DEFAULT_RULES, CategoryRule, RuleCategorizer
+
+TASK_COUNT = 100_000
+REPEATS = 5
+TARGET_NAMES_PER_SECOND = 100_000
+KEYWORDS = ["定例", "レビュー", "採用面接", "経費精算", "standup", "retro", "1on1", "incident", "deploy", "hotfix"]
+PREFIXES = ["OPS-", "SUP-", "HR-", "社内"]
+WORDS = ["資料作成", "メール返信", "会議", "調査", "実装", "テスト", "design", "review", "sync", "雑務"]
+
+
+def build_rules() -> List[CategoryRule]:
+    rules = [CategoryRule("prefix", prefix, prefix.rstrip("-")) for prefix in PREFIXES]
+    rules += [CategoryRule("keyword", f"{keyword}{i}", f"Team{i}") for keyword in KEYWORDS for i in range(20)]
+    rules += [CategoryRule("keyword", keyword, keyword) for keyword in KEYWORDS]
+    return rules + DEFAULT_RULES
+
+
+def build_tasks() -> List[str]:
+    rng = random.Random(0)
+    tasks = []
+    for i in range(TASK_COUNT):
+        choice = rng.random()
+        word = rng.choice(WORDS)
+        if choice < 0.3:
+            tasks.append(f"プロジェクト{rng.choice('ABCDEFG')}{i % 50} {word}")
+        elif choice < 0.5:
+            tasks.append(f"{rng.choice(PREFIXES)}{i} {word}")
+        elif choice < 0.8:
+            tasks.append(f"{word} {rng.choice(KEYWORDS)} {i}")
+        else:
+            tasks.append(f"{word} {i}")
+    return tasks
+
+
+def legacy_categorize(task: str) -> Optional[str]:
+    # The per-task loop GeminiClient._get_mock_response used before the rule engine
+    project_patterns = [
+        r"(プロジェクト[A-Za-z0-9]+)",
+        r"(Project[A-Za-z0-9]+)",
+        r"([A-Z][A-Za-z0-9]+プロジェクト)",
+        r"([A-Z][A-Za-z0-9]+案件)",
+    ]
+    for pattern in project_patterns:
+        match = re.search(pattern, task)
+        if match:
+            return match.group(1)
+    return None
+
+
+def best_rate(categorize: Callable[[str], Optional[str]], tasks: List[str]) -> float:
+    # Best of several passes, so the engine and the legacy loop are compared on equally quiet runs
+    best_seconds = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for task in tasks:
+            categorize(task)
+        best_seconds = min(best_seconds, time.perf_counter() - started)
+    return len(tasks) / best_seconds
+
+
+def main() -> None:
+    tasks = build_tasks()
+    rules = build_rules()
+
+    started = time.perf_counter()
+    categorizer = RuleCategorizer(rules)
+    compile_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resolved = sum(1 for task in tasks if categorizer.categorize(task) is not None)
+    rules_seconds = time.perf_counter() - started
+
+    default_rate = best_rate(RuleCategorizer(DEFAULT_RULES).categorize, tasks)
+    legacy_rate = best_rate(legacy_categorize, tasks)
+
+    rate = TASK_COUNT / rules_seconds
+    print(f"rules: {len(rules)}, compile: {compile_seconds * 1000:.1f} ms")
+    print(f"tasks: {TASK_COUNT:,}, resolved locally: {resolved / TASK_COUNT:.0%}")
+    print(f"full rule set:        {rate:12,.0f} names/s (target {TARGET_NAMES_PER_SECOND:,})")
+    print(f"default patterns:     {default_rate:12,.0f} names/s ({default_rate / legacy_rate:.2f}x legacy)")
+    print(f"legacy pattern loop:  {legacy_rate:12,.0f} names/s")
+    assert rate >= TARGET_NAMES_PER_SECOND, "Rule engine is below the target throughput"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from src.models.session import Session
+
+SESSION_COUNT = 100_000
+DURATION_CALLS = 1_000_000
+
+
+class LegacySession:
+    def __init__(self, task_name: str) -> None:
+        self.task_name = task_name
+        self.is_running = False
+        self.is_paused = False
+        self.start_time: Optional[datetime] = None
+        self.end_time: Optional[datetime] = None
+        self.pause_start_time: Optional[datetime] = None
+        self.paused_time: float = 0
+
+    def start(self) -> None:
+        self.is_running = True
+        self.start_time = datetime.now()
+
+    def stop(self) -> None:
+        self.is_running = False
+        self.end_time = datetime.now()
+
+    def get_duration(self) -> float:
+        assert self.start_time is not None
+        end = datetime.now() if self.end_time is None else self.end_time
+        current_paused_time = self.paused_time
+        if self.is_paused and self.pause_start_time is not None:
+            current_paused_time += (datetime.now() - self.pause_start_time).total_seconds()
+        duration = (end - self.start_time).total_seconds() - current_paused_time
+        assert duration >= 0
+        return duration
+
+
+def measure_bytes_per_session(factory: Callable[[str], object]) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions: List[object] = []
+    for i in range(SESSION_COUNT):
+        session = factory("task")
+        session.start()  # type: ignore[attr-defined]
+        session.stop()  # type: ignore[attr-defined]
+        sessions.append(session)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / SESSION_COUNT
+
+
+def measure_duration_calls_per_second(session: object, running: bool) -> float:
+    get_duration = session.get_duration  # type: ignore[attr-defined]
+    session.start()  # type: ignore[attr-defined]
+    if not running:
+        session.stop()  # type: ignore[attr-defined]
+    started = time.perf_counter()
+    for _ in range(DURATION_CALLS):
+        get_duration()
+    return DURATION_CALLS / (time.perf_counter() - started)
+
+
+def main() -> None:
+    for label, factory in (("legacy", LegacySession), ("slotted", Session)):
+        bytes_per_session = measure_bytes_per_session(factory)
+        stopped_rate = measure_duration_calls_per_second(factory("task"), running=False)
+        running_rate = measure_duration_calls_per_second(factory("task"), running=True)
+        print(
+            f"{label:>8}: {bytes_per_session:8.1f} bytes/session, "
+            f"get_duration {stopped_rate:12,.0f} calls/s (stopped), {running_rate:12,.0f} calls/s (running)"
+        )
+
+
+if __name__ == "__main__":
+    main()
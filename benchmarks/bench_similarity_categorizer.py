@@ -0,0 +1,55 @@
+import random
+import time
+from typing import List, Tuple
+
+from src.services.similarity_categorizer import SimilarityCategorizer
+
+LABEL_COUNT = 5_000
+QUERY_COUNT = 1_000
+PROJECTS = [f"案件{chr(ord('A') + i)}{j}" for i in range(26) for j in range(4)]
+ACTIVITIES = ["打ち合わせ", "資料作成", "実装", "レビュー", "見積もり", "テスト", "調査", "定例"]
+VARIANTS = {"打ち合わせ": "打合せ", "資料作成": "資料 作成", "見積もり": "見積り"}
+
+
+def build_labels(rng: random.Random) -> List[Tuple[str, str]]:
+    labels = []
+    for i in range(LABEL_COUNT):
+        project = rng.choice(PROJECTS)
+        labels.append((f"{project} {rng.choice(ACTIVITIES)} {i % 7}", project))
+    return labels
+
+
+def build_queries(rng: random.Random) -> List[Tuple[str, str]]:
+    queries = []
+    for _ in range(QUERY_COUNT):
+        project = rng.choice(PROJECTS)
+        activity = rng.choice(ACTIVITIES)
+        queries.append((f"{project} {VARIANTS.get(activity, activity)}", project))
+    return queries
+
+
+def main() -> None:
+    rng = random.Random(0)
+    labels = build_labels(rng)
+    queries = build_queries(rng)
+
+    index = SimilarityCategorizer()
+    started = time.perf_counter()
+    index.extend(labels)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resolved, unresolved = index.partition(task for task, _ in queries)
+    query_seconds = time.perf_counter() - started
+
+    expected = dict(queries)
+    correct = sum(1 for category, tasks in resolved.items() for task in tasks if expected[task] == category)
+    resolved_count = sum(len(tasks) for tasks in resolved.values())
+    print(f"labels: {LABEL_COUNT:,} indexed in {build_seconds * 1000:.1f} ms")
+    print(f"queries: {len(expected):,} in {query_seconds * 1000:.1f} ms")
+    print(f"resolved locally: {resolved_count / len(expected):.0%}, precision: {correct / max(resolved_count, 1):.1%}")
+    print(f"sent to the model: {len(unresolved):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from src.models.session import Session
+from src.storage.sqlite_store import SqliteSessionStore
+
+SESSION_COUNT = 200_000
+QUERY_REPEATS = 20
+TASK_NAMES = [f"プロジェクト{p} 作業{t}" for p in range(20) for t in range(10)]
+
+
+def build_sessions() -> List[Session]:
+    rng = random.Random(0)
+    start = datetime(2023, 1, 1, 9, 0, 0)
+    sessions: List[Session] = []
+    for _ in range(SESSION_COUNT):
+        minutes = rng.randint(1, 90)
+        session = Session(rng.choice(TASK_NAMES))
+        session.start_time = start
+        session.end_time = start + timedelta(minutes=minutes)
+        sessions.append(session)
+        start += timedelta(minutes=minutes)
+    return sessions
+
+
+def main() -> None:
+    sessions = build_sessions()
+    week_start = sessions[SESSION_COUNT // 2].start_time
+    assert week_start is not None
+    week_end = week_start + timedelta(days=7)
+
+    started = time.perf_counter()
+    in_memory: List[Session] = []
+    for session in sessions:
+        in_memory.append(session)
+    list_insert_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(QUERY_REPEATS):
+        week = [s for s in in_memory if s.start_time is not None and week_start <= s.start_time < week_end]
+    list_query_seconds = (time.perf_counter() - started) / QUERY_REPEATS
+
+    with tempfile.TemporaryDirectory() as directory:
+        with SqliteSessionStore(os.path.join(directory, "sessions.db")) as store:
+            started = time.perf_counter()
+            store.extend(sessions)
+            sqlite_insert_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(QUERY_REPEATS):
+                stored_week = store.sessions_between(week_start, week_end)
+            sqlite_query_seconds = (time.perf_counter() - started) / QUERY_REPEATS
+
+            started = time.perf_counter()
+            for _ in range(QUERY_REPEATS):
+                store.task_totals_between(week_start, week_end)
+            sqlite_totals_seconds = (time.perf_counter() - started) / QUERY_REPEATS
+
+    assert len(week) == len(stored_week)
+    print(f"sessions: {SESSION_COUNT:,}, sessions in queried week: {len(week):,}")
+    print(f"insert  list:   {SESSION_COUNT / list_insert_seconds:14,.0f} sessions/s")
+    print(f"insert  sqlite: {SESSION_COUNT / sqlite_insert_seconds:14,.0f} sessions/s")
+    print(f"week    list:   {list_query_seconds * 1000:10.2f} ms (linear scan)")
+    print(f"week    sqlite: {sqlite_query_seconds * 1000:10.2f} ms (index range scan)")
+    print(f"totals  sqlite: {sqlite_totals_seconds * 1000:10.2f} ms (GROUP BY in SQL)")
+
+
+if __name__ == "__main__":
+    main()
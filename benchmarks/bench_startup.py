@@ -0,0 +1,72 @@
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPEATS = 9
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median budgets for the time spent in this repo's own modules; the standard library and Tk they pull in vary
+# with the machine far more than our code does, so they are reported but not budgeted. Above budget exits non-zero
+OWN_PACKAGE = "src"
+STARTUP_BUDGET_MS: Dict[str, float] = {
+    "src.main": 5.0,
+    "src.ui.main_window": 40.0,
+}
+DEFERRED_MODULES = ("google.generativeai", "src.services.gemini_client", "src.ui.summary_screen")
+
+
+def measure_import(module: str) -> Tuple[float, float, List[str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    own_us = 0
+    cumulative_us = 0
+    imported: List[str] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_part, total_us, name = line.split("|")
+        name = name.strip()
+        imported.append(name)
+        if name == OWN_PACKAGE or name.startswith(OWN_PACKAGE + "."):
+            own_us += int(self_part.rsplit(":", 1)[1])
+        if name == module:
+            cumulative_us = int(total_us)
+    return own_us / 1000, cumulative_us / 1000, imported
+
+
+def main() -> None:
+    failed = False
+    for module, budget_ms in STARTUP_BUDGET_MS.items():
+        timings: List[float] = []
+        totals: List[float] = []
+        imported: List[str] = []
+        for _ in range(REPEATS):
+            own_ms, total_ms, imported = measure_import(module)
+            timings.append(own_ms)
+            totals.append(total_ms)
+
+        median_ms = statistics.median(timings)
+        eager = [name for name in DEFERRED_MODULES if name in imported]
+        status = "ok" if median_ms <= budget_ms and not eager else "REGRESSION"
+        failed = failed or status != "ok"
+        print(
+            f"{module:22s} own median {median_ms:7.2f} ms (min {min(timings):7.2f} ms, budget {budget_ms:5.1f} ms, "
+            f"total {statistics.median(totals):7.2f} ms) {status}"
+        )
+        if eager:
+            print(f"  eagerly imported: {', '.join(eager)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
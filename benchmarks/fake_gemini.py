@@ -0,0 +1,136 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Draws one latency in seconds from the model's random generator
+LatencyDistribution = Callable[[random.Random], float]
+
+_TASK_LIST_HEADINGS = ("タスクリスト:\n", "新しいタスク:\n")
+# Client names are only known to the model, so tasks named after them get past the local rules
+_PROJECT_PATTERN = re.compile(
+    r"(プロジェクト[A-Za-z0-9]+|Project[A-Za-z0-9]+|[A-Z][A-Za-z0-9]+(?:プロジェクト|案件)|顧客[A-Za-z0-9]+)"
+)
+
+
+def fixed(seconds: float) -> LatencyDistribution:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> LatencyDistribution:
+    # Long right tail, like real model latencies; the median is exp(mu)
+    return lambda rng: median * rng.lognormvariate(0.0, sigma)
+
+
+class FakeGeminiError(Exception):
+    pass
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeGeminiModel:
+    def __init__(
+        self,
+        first_token_latency: LatencyDistribution = fixed(0.0),
+        chars_per_second: Optional[float] = None,
+        error_rate: float = 0.0,
+        chunk_chars: int = 64,
+        padding_chars: int = 0,
+        seed: int = 0,
+    ) -> None:
+        assert 0.0 <= error_rate < 1.0, "Error rate must be in [0, 1)"
+        assert chunk_chars > 0, "Chunk size must be positive"
+        assert chars_per_second is None or chars_per_second > 0, "Generation rate must be positive"
+        self.first_token_latency = first_token_latency
+        self.chars_per_second = chars_per_second
+        self.error_rate = error_rate
+        self.chunk_chars = chunk_chars
+        self.padding_chars = padding_chars
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def generate_content(self, prompt: str, stream: bool = False) -> Any:
+        first_token, text = self._plan(prompt)
+        if stream:
+            return self._stream(first_token, text)
+        _sleep(first_token)
+        if text is None:
+            raise _overloaded()
+        _sleep(self._generation_time(text))
+        return FakeResponse(text)
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        # Failures wait on the event loop too, so one error never stalls the other requests in flight
+        first_token, text = self._plan(prompt)
+        await asyncio.sleep(first_token)
+        if text is None:
+            raise _overloaded()
+        await asyncio.sleep(self._generation_time(text))
+        return FakeResponse(text)
+
+    def _stream(self, first_token: float, text: Optional[str]) -> Iterator[FakeResponse]:
+        _sleep(first_token)
+        if text is None:
+            raise _overloaded()
+        for start in range(0, len(text), self.chunk_chars):
+            chunk = text[start : start + self.chunk_chars]
+            _sleep(self._generation_time(chunk))
+            yield FakeResponse(chunk)
+
+    def _plan(self, prompt: str) -> Tuple[float, Optional[str]]:
+        # The reply text, or None for a request that fails once its first-token latency has passed
+        with self._lock:
+            self.calls += 1
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            first_token = max(0.0, self.first_token_latency(self._rng))
+        if failed:
+            return first_token, None
+        return first_token, self._reply(self._requested_tasks(prompt))
+
+    def _generation_time(self, text: str) -> float:
+        return len(text) / self.chars_per_second if self.chars_per_second is not None else 0.0
+
+    def _requested_tasks(self, prompt: str) -> List[str]:
+        for heading in _TASK_LIST_HEADINGS:
+            if heading in prompt:
+                tasks: List[str] = json.loads(prompt.split(heading, 1)[1].split("\n", 1)[0])
+                return tasks
+        raise FakeGeminiError("400 Prompt does not contain a task list")
+
+    def _reply(self, tasks: List[str]) -> str:
+        categories: Dict[str, List[str]] = {}
+        for task in tasks:
+            match = _PROJECT_PATTERN.search(task)
+            categories.setdefault(match.group(1) if match else "その他", []).append(task)
+
+        # Real replies are pretty-printed and fenced; padding stands in for longer answers
+        body = json.dumps(
+            {"categories": [{"name": name, "tasks": names} for name, names in categories.items()]},
+            ensure_ascii=False,
+            indent=4,
+        )
+        return f"```json\n{body}\n```" + " " * self.padding_chars
+
+
+def _sleep(seconds: float) -> None:
+    # sleep(0) still gives up the GIL, which an instant model must not charge to the pipeline
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+def _overloaded() -> FakeGeminiError:
+    return FakeGeminiError("503 The model is overloaded. Please try again later.")
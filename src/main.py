@@ -3,10 +3,11 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.ui.main_window import MainWindow  # noqa: E402
-
 
 def main() -> None:
+    # Tk and the UI modules load only when the window is actually opened
+    from src.ui.main_window import MainWindow
+
     window = MainWindow()
     window.run()
 
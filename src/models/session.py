@@ -1,63 +1,210 @@
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from typing import Optional
 
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+
+def datetime_to_epoch_ns(value: datetime) -> int:
+    whole_seconds = int(value.replace(microsecond=0).timestamp())
+    return whole_seconds * NANOSECONDS_PER_SECOND + value.microsecond * 1000
+
+
+def epoch_ns_to_datetime(epoch_ns: int) -> datetime:
+    # Whole seconds and microseconds are converted apart so the result is exact, the inverse of datetime_to_epoch_ns
+    whole_seconds, remainder_ns = divmod(epoch_ns, NANOSECONDS_PER_SECOND)
+    return datetime.fromtimestamp(whole_seconds) + timedelta(microseconds=remainder_ns // 1000)
+
 
 class Session:
+    # Points are nanoseconds in one frame: monotonic while the session runs (_offset_ns is monotonic minus epoch),
+    # plain epoch once it has stopped or when its times were only assigned, so stopped sessions hold bare ints
+    __slots__ = (
+        "task_name",
+        "is_running",
+        "is_paused",
+        "_offset_ns",
+        "_start_ns",
+        "_end_ns",
+        "_pause_start_ns",
+        "_paused_ns",
+    )
+
     def __init__(self, task_name: str) -> None:
         assert task_name.strip(), "Task name cannot be empty"
         self.task_name = task_name
         self.is_running = False
         self.is_paused = False
-        self.start_time: Optional[datetime] = None
-        self.end_time: Optional[datetime] = None
-        self.pause_start_time: Optional[datetime] = None
-        self.paused_time: float = 0
+        self._offset_ns: Optional[int] = None
+        self._start_ns: Optional[int] = None
+        self._end_ns: Optional[int] = None
+        self._pause_start_ns: Optional[int] = None
+        self._paused_ns = 0
+
+    @classmethod
+    def restore(
+        cls,
+        task_name: str,
+        start_epoch_ns: int,
+        end_epoch_ns: Optional[int],
+        paused_ns: int,
+        pause_start_epoch_ns: Optional[int] = None,
+    ) -> "Session":
+        assert end_epoch_ns is None or end_epoch_ns >= start_epoch_ns, "End must not precede start"
+        assert pause_start_epoch_ns is None or end_epoch_ns is None, "Only running sessions can be paused"
+        assert task_name.strip(), "Task name cannot be empty"
+
+        session = cls.__new__(cls)
+        session.task_name = task_name
+        session._paused_ns = paused_ns
+        session.is_paused = False
+        session._pause_start_ns = None
+
+        if end_epoch_ns is not None:
+            session.is_running = False
+            session._offset_ns = None
+            session._start_ns = start_epoch_ns
+            session._end_ns = end_epoch_ns
+            return session
+
+        offset_ns = time.monotonic_ns() - time.time_ns()
+        session.is_running = True
+        session._offset_ns = offset_ns
+        session._start_ns = start_epoch_ns + offset_ns
+        session._end_ns = None
+        if pause_start_epoch_ns is not None:
+            session.is_paused = True
+            session._pause_start_ns = pause_start_epoch_ns + offset_ns
+        return session
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return self._to_wall(self._start_ns)
+
+    @start_time.setter
+    def start_time(self, value: Optional[datetime]) -> None:
+        # Only the start moves; end and pause points are stored apart and keep their wall-clock times
+        self._start_ns = self._from_wall(value)
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return self._to_wall(self._end_ns)
+
+    @end_time.setter
+    def end_time(self, value: Optional[datetime]) -> None:
+        self._end_ns = self._from_wall(value)
+
+    @property
+    def pause_start_time(self) -> Optional[datetime]:
+        return self._to_wall(self._pause_start_ns)
+
+    @pause_start_time.setter
+    def pause_start_time(self, value: Optional[datetime]) -> None:
+        self._pause_start_ns = self._from_wall(value)
+
+    @property
+    def paused_time(self) -> float:
+        return self._paused_ns / NANOSECONDS_PER_SECOND
+
+    @paused_time.setter
+    def paused_time(self, value: float) -> None:
+        self._paused_ns = round(value * NANOSECONDS_PER_SECOND)
+
+    @property
+    def paused_ns(self) -> int:
+        # Finished pauses only, like paused_time
+        return self._paused_ns
 
     def start(self) -> None:
         assert not self.is_running, "Session is already running"
         self.is_running = True
-        self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
+        # Wall-clock start is kept to the microsecond, as datetime.now() would give it
+        self._offset_ns = self._start_ns - time.time_ns() // 1000 * 1000
 
     def stop(self) -> None:
         assert self.is_running, "Session is not running"
-        assert self.start_time is not None, "Start time must be set"
+        assert self._start_ns is not None, "Start time must be set"
 
         if self.is_paused:
             self.resume()
 
         self.is_running = False
-        self.end_time = datetime.now()
+        self._end_ns = time.monotonic_ns()
+        if self._offset_ns is not None:
+            # Rebased to epoch so finished sessions no longer need the offset
+            self._start_ns -= self._offset_ns
+            self._end_ns -= self._offset_ns
+            self._offset_ns = None
 
     def pause(self) -> None:
         assert self.is_running, "Session is not running"
         assert not self.is_paused, "Session is already paused"
 
         self.is_paused = True
-        self.pause_start_time = datetime.now()
+        self._pause_start_ns = self._now_ns()
 
     def resume(self) -> None:
         assert self.is_running, "Session is not running"
         assert self.is_paused, "Session is not paused"
-        assert self.pause_start_time is not None, "Pause start time must be set"
+        assert self._pause_start_ns is not None, "Pause start time must be set"
 
-        pause_duration = (datetime.now() - self.pause_start_time).total_seconds()
-        self.paused_time += pause_duration
+        self._paused_ns += self._now_ns() - self._pause_start_ns
         self.is_paused = False
-        self.pause_start_time = None
+        self._pause_start_ns = None
 
-    def get_duration(self) -> float:
-        assert self.start_time is not None, "Session has not been started"
+    def get_start_epoch_ns(self) -> int:
+        assert self._start_ns is not None, "Session has not been started"
+        return self._start_ns if self._offset_ns is None else self._start_ns - self._offset_ns
+
+    def get_elapsed_ns(self) -> int:
+        assert self._start_ns is not None, "Session has not been started"
+
+        end_ns = self._end_ns if self._end_ns is not None else self._now_ns()
+        return end_ns - self._start_ns
 
-        if self.end_time is None:
-            end = datetime.now()
-        else:
-            end = self.end_time
+    def get_paused_ns(self) -> int:
+        if self.is_paused and self._pause_start_ns is not None:
+            return self._paused_ns + self._now_ns() - self._pause_start_ns
+        return self._paused_ns
+
+    def get_pause_offset_ns(self) -> Optional[int]:
+        # How far into the session the current pause began; None while not paused
+        if not self.is_paused or self._pause_start_ns is None or self._start_ns is None:
+            return None
+        return self._pause_start_ns - self._start_ns
+
+    def get_duration_ns(self) -> int:
+        assert self._start_ns is not None, "Session has not been started"
+
+        end_ns = self._end_ns
+        paused_ns = self._paused_ns
+        # Finished sessions are pure arithmetic; the clock is only read while running or paused
+        if end_ns is None or self.is_paused:
+            now_ns = self._now_ns()
+            if end_ns is None:
+                end_ns = now_ns
+            if self.is_paused and self._pause_start_ns is not None:
+                paused_ns += now_ns - self._pause_start_ns
+
+        duration_ns = end_ns - self._start_ns - paused_ns
+        assert duration_ns >= 0, "Duration cannot be negative"
+
+        return duration_ns
+
+    def get_duration(self) -> float:
+        return self.get_duration_ns() / NANOSECONDS_PER_SECOND
 
-        current_paused_time = self.paused_time
-        if self.is_paused and self.pause_start_time is not None:
-            current_paused_time += (datetime.now() - self.pause_start_time).total_seconds()
+    def _now_ns(self) -> int:
+        return time.time_ns() if self._offset_ns is None else time.monotonic_ns()
 
-        duration = (end - self.start_time).total_seconds() - current_paused_time
-        assert duration >= 0, "Duration cannot be negative"
+    def _to_wall(self, frame_ns: Optional[int]) -> Optional[datetime]:
+        if frame_ns is None:
+            return None
+        return epoch_ns_to_datetime(frame_ns if self._offset_ns is None else frame_ns - self._offset_ns)
 
-        return duration
+    def _from_wall(self, wall_time: Optional[datetime]) -> Optional[int]:
+        if wall_time is None:
+            return None
+        epoch_ns = datetime_to_epoch_ns(wall_time)
+        return epoch_ns if self._offset_ns is None else epoch_ns + self._offset_ns
@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, List, Protocol, Tuple, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.session import Session
+
+_ScalarT = TypeVar("_ScalarT", bound=np.generic)
+
+
+class SessionColumns(Protocol):
+    @property
+    def task_names(self) -> Tuple[str, ...]: ...
+
+    def task_codes(self) -> npt.NDArray[np.int32]: ...
+
+    def durations_ns(self) -> npt.NDArray[np.int64]: ...
+
+
+class SessionStore:
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        assert capacity > 0, "Capacity must be positive"
+        self._size = 0
+        self._start_ns: npt.NDArray[np.int64] = np.empty(capacity, dtype=np.int64)
+        self._end_ns: npt.NDArray[np.int64] = np.empty(capacity, dtype=np.int64)
+        self._paused_ns: npt.NDArray[np.int64] = np.empty(capacity, dtype=np.int64)
+        self._task_codes: npt.NDArray[np.int32] = np.empty(capacity, dtype=np.int32)
+        self._task_names: List[str] = []
+        self._codes_by_name: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._start_ns)
+
+    @property
+    def task_names(self) -> Tuple[str, ...]:
+        return tuple(self._task_names)
+
+    def encode_task(self, task_name: str) -> int:
+        code = self._codes_by_name.get(task_name)
+        if code is None:
+            code = len(self._task_names)
+            self._task_names.append(task_name)
+            self._codes_by_name[task_name] = code
+        return code
+
+    def get_task_code(self, task_name: str) -> int:
+        assert task_name in self._codes_by_name, "Unknown task name"
+        return self._codes_by_name[task_name]
+
+    def get_task_name(self, code: int) -> str:
+        assert 0 <= code < len(self._task_names), "Unknown task code"
+        return self._task_names[code]
+
+    def append(self, session: Session) -> None:
+        assert not session.is_running, "Only stopped sessions can be stored"
+
+        start_ns = session.get_start_epoch_ns()
+        self.append_row(session.task_name, start_ns, start_ns + session.get_elapsed_ns(), session.get_paused_ns())
+
+    def extend(self, sessions: Iterable[Session]) -> None:
+        for session in sessions:
+            self.append(session)
+
+    def append_row(self, task_name: str, start_ns: int, end_ns: int, paused_ns: int) -> None:
+        assert end_ns >= start_ns, "End must not precede start"
+        assert 0 <= paused_ns <= end_ns - start_ns, "Paused time must fit inside the session"
+
+        if self._size == self.capacity:
+            self._grow(self.capacity * 2)
+
+        index = self._size
+        self._start_ns[index] = start_ns
+        self._end_ns[index] = end_ns
+        self._paused_ns[index] = paused_ns
+        self._task_codes[index] = self.encode_task(task_name)
+        self._size += 1
+
+    def start_ns(self) -> npt.NDArray[np.int64]:
+        return self._read_only(self._start_ns)
+
+    def end_ns(self) -> npt.NDArray[np.int64]:
+        return self._read_only(self._end_ns)
+
+    def paused_ns(self) -> npt.NDArray[np.int64]:
+        return self._read_only(self._paused_ns)
+
+    def task_codes(self) -> npt.NDArray[np.int32]:
+        return self._read_only(self._task_codes)
+
+    def durations_ns(self) -> npt.NDArray[np.int64]:
+        size = self._size
+        return self._end_ns[:size] - self._start_ns[:size] - self._paused_ns[:size]
+
+    def _read_only(self, column: npt.NDArray[_ScalarT]) -> npt.NDArray[_ScalarT]:
+        view = column[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def _grow(self, capacity: int) -> None:
+        assert capacity > self.capacity, "Capacity can only grow"
+        self._start_ns = self._resized(self._start_ns, capacity)
+        self._end_ns = self._resized(self._end_ns, capacity)
+        self._paused_ns = self._resized(self._paused_ns, capacity)
+        self._task_codes = self._resized(self._task_codes, capacity)
+
+    def _resized(self, column: npt.NDArray[_ScalarT], capacity: int) -> npt.NDArray[_ScalarT]:
+        grown = np.empty(capacity, dtype=column.dtype)
+        grown[: self._size] = column[: self._size]
+        return grown
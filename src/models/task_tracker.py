@@ -1,24 +1,54 @@
-from typing import List, Optional
+from typing import Callable, Iterable, List, Literal, Optional, Protocol, TYPE_CHECKING
 
 from src.models.session import Session
+from src.utils.task_names import TaskNameIndex
+
+if TYPE_CHECKING:
+    from src.models.session_store import SessionStore
+
+TaskEvent = Literal["start", "pause", "resume", "stop", "remove"]
+TaskEventListener = Callable[[TaskEvent, Session], None]
+
+
+class SessionBackend(Protocol):
+    def append(self, session: Session) -> None: ...
+
+    def extend(self, sessions: Iterable[Session]) -> None: ...
 
 
 class TaskTracker:
-    def __init__(self) -> None:
+    def __init__(self, store: Optional[SessionBackend] = None) -> None:
         self.current_session: Optional[Session] = None
         self.sessions: List[Session] = []
+        # Optional persistent history of finished sessions; sessions removed from self.sessions stay in it
+        self.store = store
+        self.task_names = TaskNameIndex()
+        # Counts remove_sessions() calls so listeners can handle a batch of "remove" events once
+        self.removal_batches = 0
+        self._listeners: List[TaskEventListener] = []
+        self._columns: Optional["SessionStore"] = None
+
+    def add_listener(self, listener: TaskEventListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: TaskEventListener) -> None:
+        self._listeners.remove(listener)
 
     def start_task(self, task_name: str) -> None:
         assert task_name.strip(), "Task name cannot be empty"
 
+        # Variants of an earlier task name are recorded under its first spelling
+        task_name = self.task_names.canonical(task_name)
+
         if self.current_session is not None:
             assert self.current_session.is_running, "Current session must be running"
-            self.current_session.stop()
+            self._stop_session(self.current_session)
 
         new_session = Session(task_name)
         new_session.start()
         self.current_session = new_session
         self.sessions.append(new_session)
+        self._notify("start", new_session)
 
         assert self.current_session.is_running, "New session must be running"
         assert self.current_session.task_name == task_name, "Task name must match"
@@ -27,7 +57,7 @@ class TaskTracker:
         assert self.current_session is not None, "No active session to stop"
         assert self.current_session.is_running, "Current session must be running"
 
-        self.current_session.stop()
+        self._stop_session(self.current_session)
         self.current_session = None
 
         assert all(not session.is_running for session in self.sessions), "All sessions must be stopped"
@@ -35,10 +65,51 @@ class TaskTracker:
     def get_all_sessions(self) -> List[Session]:
         return self.sessions.copy()
 
+    def get_session_columns(self) -> "SessionStore":
+        # Read-only column views over the stopped sessions, shared without copying; built on first use
+        # so NumPy, an optional dependency, is only imported by callers that ask for columns
+        if self._columns is None:
+            from src.models.session_store import SessionStore
+
+            columns = SessionStore(max(len(self.sessions), SessionStore.INITIAL_CAPACITY))
+            columns.extend(session for session in self.sessions if not session.is_running)
+            self._columns = columns
+        return self._columns
+
+    def remove_sessions(self, sessions: Iterable[Session]) -> None:
+        # Components that index sessions or their positions are told about every session that leaves the list
+        removed_ids = {id(session) for session in sessions}
+        removed = [session for session in self.sessions if id(session) in removed_ids]
+        assert len(removed) == len(removed_ids), "Only tracked sessions can be removed"
+        assert all(not session.is_running for session in removed), "Running sessions cannot be removed"
+        if not removed:
+            return
+
+        self.sessions = [session for session in self.sessions if id(session) not in removed_ids]
+        self.removal_batches += 1
+        # Columns are append-only; they are rebuilt on next use
+        self._columns = None
+        for session in removed:
+            self._notify("remove", session)
+
     def pause_current(self) -> None:
         assert self.current_session is not None, "No active session to pause"
         self.current_session.pause()
+        self._notify("pause", self.current_session)
 
     def resume_current(self) -> None:
         assert self.current_session is not None, "No active session to resume"
         self.current_session.resume()
+        self._notify("resume", self.current_session)
+
+    def _stop_session(self, session: Session) -> None:
+        session.stop()
+        if self.store is not None:
+            self.store.append(session)
+        if self._columns is not None:
+            self._columns.append(session)
+        self._notify("stop", session)
+
+    def _notify(self, event: TaskEvent, session: Session) -> None:
+        for listener in self._listeners:
+            listener(event, session)
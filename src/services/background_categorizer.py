@@ -0,0 +1,128 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from src.utils.task_names import normalize_task_name
+
+if TYPE_CHECKING:
+    from src.models.session import Session
+    from src.models.task_tracker import TaskEvent, TaskTracker
+    from src.services.category_cache import TaskCategorizer
+
+DEFAULT_BATCH_INTERVAL = 30.0
+DEFAULT_MAX_BATCH = 50
+# Below the summary screen's requests so an open summary is never queued behind speculation
+BACKGROUND_PRIORITY = -1
+
+
+class BackgroundCategorizer:
+    def __init__(
+        self,
+        factory: Callable[[], "TaskCategorizer"],
+        interval: float = DEFAULT_BATCH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        assert interval > 0, "Batch interval must be positive"
+        assert max_batch > 0, "Batch size must be positive"
+        self.interval = interval
+        self.max_batch = max_batch
+        self._factory = factory
+        self._categorizer: Optional["TaskCategorizer"] = None
+        self._condition = threading.Condition()
+        # Normalized key -> first spelling waiting for the next batch, and resolved categories by key
+        self._pending: Dict[str, str] = {}
+        self._categories: Dict[str, str] = {}
+        self._busy = False
+        self._flush_requested = False
+        self._closed = False
+
+        self.batches = 0
+        self.failed_batches = 0
+
+        self._worker = threading.Thread(target=self._run, name="background-categorizer", daemon=True)
+        self._worker.start()
+
+    def attach(self, tracker: "TaskTracker") -> None:
+        self.enqueue(session.task_name for session in tracker.get_all_sessions())
+        tracker.add_listener(self.on_task_event)
+
+    def on_task_event(self, event: "TaskEvent", session: "Session") -> None:
+        if event == "start":
+            self.enqueue([session.task_name])
+
+    def enqueue(self, task_names: Iterable[str]) -> None:
+        with self._condition:
+            for task_name in task_names:
+                key = normalize_task_name(task_name)
+                if key not in self._categories and key not in self._pending:
+                    self._pending[key] = task_name
+            if len(self._pending) >= self.max_batch:
+                self._condition.notify_all()
+
+    def partition(self, tasks: Iterable[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        resolved: Dict[str, List[str]] = {}
+        unresolved: List[str] = []
+        with self._condition:
+            for task in dict.fromkeys(tasks):
+                category_name = self._categories.get(normalize_task_name(task))
+                if category_name is None:
+                    unresolved.append(task)
+                else:
+                    resolved.setdefault(category_name, []).append(task)
+        return resolved, unresolved
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Sends whatever is pending now and waits until the worker is idle
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            idle = self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+            self._flush_requested = False
+            return idle
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                if self._categorizer is None:
+                    self._categorizer = self._factory()
+                response = self._categorizer.categorize_tasks(batch)
+            except Exception as e:
+                print(f"Background categorization failed: {e}")
+                with self._condition:
+                    self.failed_batches += 1
+                    self._busy = False
+                    self._condition.notify_all()
+                continue
+
+            with self._condition:
+                for category in response.get("categories", []):
+                    for task in category["tasks"]:
+                        self._categories[normalize_task_name(task)] = category["name"]
+                self.batches += 1
+                self._busy = False
+                self._condition.notify_all()
+
+    def _next_batch(self) -> Optional[List[str]]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self._closed)
+            if not self._closed:
+                # Coalesce names started within one interval into a single call
+                self._condition.wait_for(
+                    lambda: len(self._pending) >= self.max_batch or self._flush_requested or self._closed,
+                    self.interval,
+                )
+            if self._closed:
+                return None
+
+            keys = list(self._pending)[: self.max_batch]
+            self._busy = True
+            return [self._pending.pop(key) for key in keys]
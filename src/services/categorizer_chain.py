@@ -0,0 +1,82 @@
+import os
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from src.services.category_cache import (
+    CachedCategorizer,
+    CategoryCache,
+    CategoryCallback,
+    TaskCategorizer,
+    get_cache,
+    get_similarity_index,
+)
+from src.services.gemini_client import DeltaCategorizer, get_client, get_labels
+from src.services.rule_categorizer import (
+    DEFAULT_RULES,
+    OTHER_CATEGORY,
+    RuleCategorizer,
+    RuleFirstCategorizer,
+    load_rules,
+)
+
+if TYPE_CHECKING:
+    from src.services.request_scheduler import RequestScheduler
+
+
+class CategorizerChain:
+    def __init__(
+        self,
+        api_key: str,
+        scheduler: Optional["RequestScheduler"] = None,
+        on_category: Optional[CategoryCallback] = None,
+        priority: int = 0,
+        fallback: bool = True,
+    ) -> None:
+        self.fallback = fallback
+        # New tasks are sent with the known category names instead of the whole history
+        self.delta = DeltaCategorizer(
+            get_client(api_key), on_category, priority, labels=get_labels(api_key), scheduler=scheduler
+        )
+        categorizer: TaskCategorizer = self.delta
+        self.cache: Optional[CategoryCache] = None
+        cache_path = os.getenv("TASK_TRACKER_CATEGORY_CACHE")
+        if cache_path:
+            self.cache = get_cache(cache_path)
+            self.delta.extend(self.cache.items())
+            categorizer = CachedCategorizer(self.delta, self.cache, on_category)
+
+            # Names close to previously labelled ones are resolved without the model
+            try:
+                from src.services.similarity_categorizer import SimilarityFirstCategorizer
+
+                index = get_similarity_index(self.cache)
+            except ImportError:
+                pass
+            else:
+                categorizer = SimilarityFirstCategorizer(index, categorizer, on_category)
+
+        # User rules take precedence over the built-in project name patterns
+        rules_path = os.getenv("TASK_TRACKER_RULES")
+        rules = (load_rules(rules_path) if rules_path else []) + DEFAULT_RULES
+        self.rules = RuleCategorizer(rules)
+        self.categorizer: TaskCategorizer = RuleFirstCategorizer(self.rules, categorizer, on_category)
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        try:
+            categories = self.categorizer.categorize_tasks(tasks)
+        except Exception as e:
+            if not self.fallback:
+                raise
+            # Answered locally above the cache, so an outage never stores or learns these labels
+            print(f"Error calling Gemini API: {e}")
+            return self._local_categories(tasks)
+        finally:
+            if self.cache is not None:
+                self.cache.save()
+        return categories
+
+    def _local_categories(self, tasks: List[str]) -> Dict[str, Any]:
+        category_tasks, unresolved = self.rules.partition(tasks)
+        for task in unresolved:
+            cached = self.cache.get(task) if self.cache is not None else None
+            category_tasks.setdefault(cached or OTHER_CATEGORY, []).append(task)
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
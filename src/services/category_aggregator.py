@@ -1,8 +1,19 @@
-from typing import Dict, List, Any
-from src.models.session import Session
+from typing import Dict, List, Any, Sequence, TYPE_CHECKING
+from src.models.session import Session, NANOSECONDS_PER_SECOND
+from src.utils.task_names import TaskNameIndex
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from src.models.session_store import SessionColumns
 
 
 class CategoryAggregator:
+    def __init__(self, casefold: bool = True) -> None:
+        # Task names echoed back by the model are matched by normalized key, not exact string
+        self.task_names = TaskNameIndex(casefold=casefold)
+
     def aggregate(self, sessions: List[Session], categories: Dict[str, Any]) -> List[Dict[str, Any]]:
         assert isinstance(sessions, list), "Sessions must be a list"
         assert isinstance(categories, dict), "Categories must be a dict"
@@ -15,13 +26,13 @@ class CategoryAggregator:
         task_to_category: Dict[str, str] = {}
         for category in categories["categories"]:
             for task in category["tasks"]:
-                task_to_category[task] = category["name"]
+                task_to_category[self.task_names.key(task)] = category["name"]
 
         # Aggregate time by category and task
         category_data: Dict[str, Dict[str, Any]] = {}
 
         for session in sessions:
-            category_name = task_to_category.get(session.task_name)
+            category_name = task_to_category.get(self.task_names.key(session.task_name))
             if not category_name:
                 continue  # Skip uncategorized tasks
 
@@ -61,7 +72,90 @@ class CategoryAggregator:
 
         return result
 
-    def _format_duration(self, seconds: int) -> str:
+    def aggregate_store(self, store: "SessionColumns", categories: Dict[str, Any]) -> List[Dict[str, Any]]:
+        import numpy as np
+
+        assert isinstance(categories, dict), "Categories must be a dict"
+        assert "categories" in categories, "Categories dict must have 'categories' key"
+
+        task_names = store.task_names
+        codes_by_task: Dict[str, List[int]] = {}
+        for code, task_name in enumerate(task_names):
+            codes_by_task.setdefault(self.task_names.key(task_name), []).append(code)
+        category_names: List[str] = []
+        category_codes: Dict[str, int] = {}
+        task_category_codes = np.full(len(task_names), -1, dtype=np.int32)
+
+        for category in categories["categories"]:
+            for task in category["tasks"]:
+                task_codes = codes_by_task.get(self.task_names.key(task))
+                if task_codes is None:
+                    continue
+                if category["name"] not in category_codes:
+                    category_codes[category["name"]] = len(category_names)
+                    category_names.append(category["name"])
+                task_category_codes[task_codes] = category_codes[category["name"]]
+
+        return self.aggregate_columns(
+            store.task_codes(), store.durations_ns(), task_names, task_category_codes, category_names
+        )
+
+    def aggregate_columns(
+        self,
+        task_codes: "npt.NDArray[np.int32]",
+        durations_ns: "npt.NDArray[np.int64]",
+        task_names: Sequence[str],
+        task_category_codes: "npt.NDArray[np.int32]",
+        category_names: Sequence[str],
+    ) -> List[Dict[str, Any]]:
+        import numpy as np
+
+        assert task_codes.shape == durations_ns.shape, "Columns must have the same length"
+        assert len(task_category_codes) == len(task_names), "Every task code needs a category code"
+
+        session_category_codes = task_category_codes[task_codes]
+        categorized = session_category_codes >= 0
+        categorized_task_codes = task_codes[categorized]
+        if categorized_task_codes.size == 0:
+            return []
+
+        # Seconds are added per session in session order, as aggregate() does, so float totals match it exactly
+        session_seconds = durations_ns[categorized] / NANOSECONDS_PER_SECOND
+        task_totals = np.bincount(categorized_task_codes, weights=session_seconds, minlength=len(task_names))
+
+        first_positions = np.full(len(task_names), categorized_task_codes.size, dtype=np.int64)
+        np.minimum.at(first_positions, categorized_task_codes, np.arange(categorized_task_codes.size))
+        present_task_codes = np.flatnonzero(first_positions < categorized_task_codes.size)
+        ordered_task_codes = present_task_codes[np.argsort(first_positions[present_task_codes], kind="stable")]
+
+        category_totals = np.bincount(
+            session_category_codes[categorized], weights=session_seconds, minlength=len(category_names)
+        )
+
+        results_by_category: Dict[int, Dict[str, Any]] = {}
+        for task_code in ordered_task_codes.tolist():
+            category_code = int(task_category_codes[task_code])
+            if category_code not in results_by_category:
+                category_seconds = float(category_totals[category_code])
+                results_by_category[category_code] = {
+                    "name": category_names[category_code],
+                    "total_seconds": category_seconds,
+                    "total_time": self._format_duration(category_seconds),
+                    "tasks": [],
+                }
+
+            task_seconds = float(task_totals[task_code])
+            results_by_category[category_code]["tasks"].append(
+                {
+                    "name": task_names[task_code],
+                    "total_seconds": task_seconds,
+                    "total_time": self._format_duration(task_seconds),
+                }
+            )
+
+        return list(results_by_category.values())
+
+    def _format_duration(self, seconds: float) -> str:
         hours = int(seconds // 3600)
         minutes = int((seconds % 3600) // 60)
         remaining_seconds = int(seconds % 60)
@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, TYPE_CHECKING
+
+from src.utils.task_names import normalize_task_name
+
+if TYPE_CHECKING:
+    from src.services.similarity_categorizer import SimilarityCategorizer
+
+CACHE_VERSION = 1
+
+_CacheEntry = Tuple[str, float]
+
+# Receives one {"name": ..., "tasks": [...]} category as soon as it is known
+CategoryCallback = Callable[[Dict[str, Any]], None]
+
+
+class TaskCategorizer(Protocol):
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]: ...
+
+
+class CategoryCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10_000,
+        ttl: float = 30 * 24 * 60 * 60,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        assert max_entries > 0, "Cache size cap must be positive"
+        assert ttl > 0, "Cache TTL must be positive"
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # The background chain and summary chains share one cache per file from different threads
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def items(self) -> List[Tuple[str, str]]:
+        # Only live labels are handed out; expired ones are dropped here as get() does
+        with self._lock:
+            now = self._clock()
+            expired = [key for key, (_, stored_at) in self._entries.items() if now - stored_at >= self.ttl]
+            for key in expired:
+                del self._entries[key]
+            return [(key, category_name) for key, (category_name, _) in self._entries.items()]
+
+    def get(self, task_name: str) -> Optional[str]:
+        key = normalize_task_name(task_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[1] >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, task_name: str, category_name: str) -> None:
+        key = normalize_task_name(task_name)
+        with self._lock:
+            self._entries[key] = (category_name, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self) -> None:
+        assert self.path is not None, "Cache has no file path"
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        assert self.path is not None, "Cache has no file path"
+        self._entries.clear()
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+
+        now = self._clock()
+        for key, category_name, stored_at in data.get("entries", []):
+            if now - stored_at < self.ttl:
+                self._entries[key] = (category_name, stored_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        assert self.path is not None, "Cache has no file path"
+        # Writers are serialized on the shared instance, so a save never replaces entries it has not seen
+        with self._lock:
+            entries = [[key, category_name, stored_at] for key, (category_name, stored_at) in self._entries.items()]
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, cache_file, ensure_ascii=False)
+                cache_file.flush()
+                os.fsync(cache_file.fileno())
+            os.replace(temporary_path, self.path)
+
+
+_caches: Dict[str, CategoryCache] = {}
+_indexes: Dict[str, "SimilarityCategorizer"] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path: str) -> CategoryCache:
+    # Every chain in the process shares one cache per file; separate copies would overwrite each other's saves
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = CategoryCache(path)
+            _caches[path] = cache
+        return cache
+
+
+def get_similarity_index(cache: CategoryCache) -> "SimilarityCategorizer":
+    # One index per cache file lives as long as the process and is brought in line with the cache's live labels,
+    # so chains reuse its vectors and expired labels stop matching; raises ImportError without NumPy
+    from src.services.similarity_categorizer import SimilarityCategorizer
+
+    assert cache.path is not None, "Only file-backed caches have a shared index"
+    with _caches_lock:
+        index = _indexes.get(cache.path)
+        if index is None:
+            index = SimilarityCategorizer()
+            _indexes[cache.path] = index
+    index.sync(cache.items())
+    return index
+
+
+def clear_caches() -> None:
+    with _caches_lock:
+        _caches.clear()
+        _indexes.clear()
+
+
+def report_categories(on_category: Optional[CategoryCallback], category_tasks: Dict[str, List[str]]) -> None:
+    # Local answers are shown before the slower fallback is asked for the rest
+    if on_category is not None:
+        for name, tasks in category_tasks.items():
+            on_category({"name": name, "tasks": list(tasks)})
+
+
+class CachedCategorizer:
+    def __init__(
+        self, categorizer: TaskCategorizer, cache: CategoryCache, on_category: Optional[CategoryCallback] = None
+    ) -> None:
+        self.categorizer = categorizer
+        self.cache = cache
+        self.on_category = on_category
+        self.model_calls = 0
+        self.saved_calls = 0
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        category_tasks: Dict[str, List[str]] = {}
+        misses: List[str] = []
+        for task in dict.fromkeys(tasks):
+            category_name = self.cache.get(task)
+            if category_name is None:
+                misses.append(task)
+            else:
+                category_tasks.setdefault(category_name, []).append(task)
+
+        if not misses:
+            if tasks:
+                self.saved_calls += 1
+            return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
+
+        self.model_calls += 1
+        report_categories(self.on_category, category_tasks)
+        response = self.categorizer.categorize_tasks(misses)
+        for category in response.get("categories", []):
+            for task in category["tasks"]:
+                self.cache.put(task, category["name"])
+                category_tasks.setdefault(category["name"], []).append(task)
+
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
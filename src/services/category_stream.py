@@ -0,0 +1,53 @@
+import json
+from typing import Any, Dict, List, Optional
+
+# Depth of a category object inside {"categories": [ ... ]}
+_CATEGORY_DEPTH = 3
+
+
+class CategoryStreamParser:
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._position = 0
+        self._containers: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._category_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        # Scans only the new text; code fences and prose outside the root object are skipped
+        self._buffer += text
+        completed: List[Dict[str, Any]] = []
+        buffer = self._buffer
+        containers = self._containers
+        position = self._position
+        while position < len(buffer):
+            char = buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if containers:
+                    self._in_string = True
+            elif char in "{[":
+                containers.append(char)
+                if char == "{" and len(containers) == _CATEGORY_DEPTH and containers[1] == "[":
+                    self._category_start = position
+            elif char in "}]" and containers:
+                containers.pop()
+                if char == "}" and len(containers) == _CATEGORY_DEPTH - 1 and self._category_start is not None:
+                    completed.append(json.loads(buffer[self._category_start : position + 1]))
+                    self._category_start = None
+            position += 1
+
+        # Keep only the unfinished category; everything before it has been consumed
+        keep_from = self._category_start if self._category_start is not None else position
+        self._buffer = buffer[keep_from:]
+        self._position = position - keep_from
+        if self._category_start is not None:
+            self._category_start = 0
+        return completed
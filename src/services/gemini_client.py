@@ -1,25 +1,207 @@
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+import asyncio
 import json
-import google.generativeai as genai  # type: ignore
+import threading
+
+from src.services.category_cache import CategoryCallback
+from src.services.category_stream import CategoryStreamParser
+from src.services.rule_categorizer import DEFAULT_RULES, RuleCategorizer
+from src.utils.task_names import normalize_task_name
+
+if TYPE_CHECKING:
+    from src.services.request_scheduler import RequestScheduler
+
+# Rough prompt cost of one task name: about one token per character plus JSON quoting
+_TASK_TOKEN_OVERHEAD = 4
+_PROMPT_TOKEN_OVERHEAD = 300
+DEFAULT_CHUNK_TOKENS = 2000
+DEFAULT_MAX_CONCURRENCY = 4
+
+_MOCK_RULES = RuleCategorizer(DEFAULT_RULES)
+
+_clients: Dict[str, "GeminiClient"] = {}
+_labels: Dict[str, "DeltaLabels"] = {}
+_clients_lock = threading.Lock()
 
 
 class GeminiClient:
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, scheduler: Optional["RequestScheduler"] = None) -> None:
         assert api_key, "API key cannot be empty"
         self.api_key = api_key
+        self.scheduler = scheduler
+
+        # Deferred: importing the SDK costs about a second and only summaries need it
+        import google.generativeai as genai  # type: ignore
+
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel("gemini-1.5-flash")
 
-    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+    def categorize_tasks(
+        self,
+        tasks: List[str],
+        priority: int = 0,
+        category_names: Sequence[str] = (),
+        on_category: Optional[CategoryCallback] = None,
+        scheduler: Optional["RequestScheduler"] = None,
+    ) -> Dict[str, Any]:
+        try:
+            return self.fetch_categories(tasks, priority, category_names, on_category, scheduler)
+        except Exception as e:
+            # Fallback to mock response on error
+            print(f"Error calling Gemini API: {e}")
+            return self._get_mock_response(tasks)
+
+    def fetch_categories(
+        self,
+        tasks: List[str],
+        priority: int = 0,
+        category_names: Sequence[str] = (),
+        on_category: Optional[CategoryCallback] = None,
+        scheduler: Optional["RequestScheduler"] = None,
+    ) -> Dict[str, Any]:
+        # Raises on API errors so callers that cache or learn labels never keep a fallback answer
+        if not tasks:
+            return {"categories": []}
+        scheduler = scheduler if scheduler is not None else self.scheduler
+        if scheduler is not None:
+            future = scheduler.submit(
+                lambda: self.request_categories(tasks, category_names, on_category),
+                tokens=self.estimate_tokens(tasks, category_names),
+                priority=priority,
+            )
+            return future.result()  # type: ignore
+        return self.request_categories(tasks, category_names, on_category)
+
+    def request_categories(
+        self, tasks: List[str], category_names: Sequence[str] = (), on_category: Optional[CategoryCallback] = None
+    ) -> Dict[str, Any]:
+        if on_category is not None:
+            return self._request_streaming(tasks, category_names, on_category)
+        if not category_names:
+            response = self.model.generate_content(self._build_prompt(tasks))
+            return self._parse_response(response.text)
+
+        # Only the new tasks are listed, so anything the model adds or drops is ignored or sent to その他
+        response = self.model.generate_content(self._build_delta_prompt(tasks, category_names))
+        return self._merge_categories(tasks, [self._parse_response(response.text)])
+
+    def stream_categories(self, tasks: List[str], category_names: Sequence[str] = ()) -> Iterator[Dict[str, Any]]:
+        prompt = self._build_delta_prompt(tasks, category_names) if category_names else self._build_prompt(tasks)
+        parser = CategoryStreamParser()
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield from parser.feed(chunk.text)
+
+    def _request_streaming(
+        self, tasks: List[str], category_names: Sequence[str], on_category: CategoryCallback
+    ) -> Dict[str, Any]:
+        # Each category is reported as soon as its object closes in the stream
+        requested = self._requested_by_key(tasks)
+        results: List[Dict[str, Any]] = []
+        for category in self.stream_categories(tasks, category_names):
+            results.append(category)
+            echoed = [task for name in category["tasks"] for task in requested.get(normalize_task_name(name), [])]
+            if echoed:
+                on_category({"name": category["name"], "tasks": echoed})
+        return self._merge_categories(tasks, [{"categories": results}])
+
+    def estimate_tokens(self, tasks: List[str], category_names: Sequence[str] = ()) -> int:
+        task_tokens = sum(len(task) + _TASK_TOKEN_OVERHEAD for task in tasks)
+        category_tokens = sum(len(name) + _TASK_TOKEN_OVERHEAD for name in category_names)
+        return _PROMPT_TOKEN_OVERHEAD + task_tokens + category_tokens
+
+    async def categorize_tasks_batched(
+        self,
+        tasks: List[str],
+        max_chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        priority: int = 0,
+        scheduler: Optional["RequestScheduler"] = None,
+    ) -> Dict[str, Any]:
+        assert max_concurrency > 0, "Concurrency limit must be positive"
+
+        tasks = list(dict.fromkeys(tasks))
         if not tasks:
             return {"categories": []}
 
-        prompt = f"""以下のタスクリストをプロジェクト別にカテゴリ分類してください。
+        semaphore = asyncio.Semaphore(max_concurrency)
+        scheduler = scheduler if scheduler is not None else self.scheduler
+
+        async def categorize_chunk(chunk: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    prompt = self._build_prompt(chunk)
+                    if scheduler is not None:
+                        # Chunks share the rate limits, retries and circuit breaker of every other request
+                        future = scheduler.submit(
+                            lambda: self.model.generate_content(prompt),
+                            tokens=self.estimate_tokens(chunk),
+                            priority=priority,
+                        )
+                        response = await asyncio.wrap_future(future)
+                    else:
+                        response = await self.model.generate_content_async(prompt)
+                    return self._parse_response(response.text)
+                except Exception as e:
+                    print(f"Error calling Gemini API: {e}")
+                    return self._get_mock_response(chunk)
+
+        chunks = self._chunk_tasks(tasks, max_chunk_tokens)
+        results = await asyncio.gather(*(categorize_chunk(chunk) for chunk in chunks))
+        return self._merge_categories(tasks, results)
+
+    def _chunk_tasks(self, tasks: List[str], max_chunk_tokens: int) -> List[List[str]]:
+        assert max_chunk_tokens > 0, "Chunk token budget must be positive"
+
+        chunks: List[List[str]] = []
+        chunk: List[str] = []
+        chunk_tokens = 0
+        for task in tasks:
+            task_tokens = len(task) + _TASK_TOKEN_OVERHEAD
+            if chunk and chunk_tokens + task_tokens > max_chunk_tokens:
+                chunks.append(chunk)
+                chunk = []
+                chunk_tokens = 0
+            chunk.append(task)
+            chunk_tokens += task_tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _merge_categories(self, tasks: List[str], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Chunks may spell the same category differently; the first spelling wins
+        category_names: Dict[str, str] = {}
+        category_tasks: Dict[str, List[str]] = {}
+        # The model may echo a task in another width or case; map it back to the requested spelling
+        requested = self._requested_by_key(tasks)
+        assigned: Set[str] = set()
+        for result in results:
+            for category in result.get("categories", []):
+                name = category_names.setdefault(normalize_task_name(category["name"]), category["name"])
+                for echoed in category["tasks"]:
+                    for task in requested.get(normalize_task_name(echoed), []):
+                        if task not in assigned:
+                            assigned.add(task)
+                            category_tasks.setdefault(name, []).append(task)
+
+        unassigned = [task for task in tasks if task not in assigned]
+        if unassigned:
+            category_tasks.setdefault(category_names.get("その他", "その他"), []).extend(unassigned)
+
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items() if names]}
+
+    def _requested_by_key(self, tasks: List[str]) -> Dict[str, List[str]]:
+        requested: Dict[str, List[str]] = {}
+        for task in tasks:
+            requested.setdefault(normalize_task_name(task), []).append(task)
+        return requested
+
+    def _build_prompt(self, tasks: List[str]) -> str:
+        return f"""以下のタスクリストをプロジェクト別にカテゴリ分類してください。
 タスク名からプロジェクト名を識別し、同じプロジェクトのタスクをまとめてください。
 各タスクは必ず1つのカテゴリに属するようにしてください。
 
 タスクリスト:
-{json.dumps(tasks, ensure_ascii=False, indent=2)}
+{json.dumps(tasks, ensure_ascii=False)}
 
 分類のルール:
 - タスク名にプロジェクト名が含まれている場合は、そのプロジェクト名をカテゴリとする
@@ -38,64 +220,151 @@ class GeminiClient:
 
 JSONのみを返してください。説明文は不要です。"""
 
-        try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-
-            # Extract JSON from response
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-
-            return json.loads(response_text)  # type: ignore
-        except Exception as e:
-            # Fallback to mock response on error
-            print(f"Error calling Gemini API: {e}")
-            return self._get_mock_response(tasks)
+    def _build_delta_prompt(self, tasks: List[str], category_names: Sequence[str]) -> str:
+        return f"""以下の新しいタスクをプロジェクト別にカテゴリ分類してください。
+既存のカテゴリに当てはまるタスクは既存のカテゴリ名をそのまま使い、当てはまらない場合のみ新しいカテゴリを作成してください。
+各タスクは必ず1つのカテゴリに属するようにしてください。
+
+既存のカテゴリ:
+{json.dumps(list(category_names), ensure_ascii=False, separators=(",", ":"))}
+
+新しいタスク:
+{json.dumps(tasks, ensure_ascii=False, separators=(",", ":"))}
+
+分類のルール:
+- タスク名にプロジェクト名が含まれている場合は、そのプロジェクト名をカテゴリとする
+- プロジェクト名が不明確な場合は "その他" カテゴリに分類
+
+新しいタスクだけを以下のJSON形式で回答してください:
+{{"categories":[{{"name":"カテゴリ名","tasks":["タスク1"]}}]}}
+
+JSONのみを返してください。説明文は不要です。"""
+
+    def _parse_response(self, response_text: str) -> Dict[str, Any]:
+        response_text = response_text.strip()
+
+        # Extract JSON from response
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+
+        return json.loads(response_text)  # type: ignore
 
     def _get_mock_response(self, tasks: List[str]) -> Dict[str, Any]:
-        # Extract project names from tasks
-        project_categories: Dict[str, List[str]] = {}
+        # Extract project names from tasks with the default local rules
+        return _MOCK_RULES.categorize_tasks(tasks)
 
-        for task in tasks:
-            # Try to extract project name from task
-            project_found = False
-
-            # Pattern: Extract project names from task
-            import re
-
-            project_patterns = [
-                r"(プロジェクト[A-Za-z0-9]+)",
-                r"(Project[A-Za-z0-9]+)",
-                r"([A-Z][A-Za-z0-9]+プロジェクト)",
-                r"([A-Z][A-Za-z0-9]+案件)",
-            ]
-
-            for pattern in project_patterns:
-                match = re.search(pattern, task)
-                if match:
-                    project_name = match.group(1)
-                    if project_name not in project_categories:
-                        project_categories[project_name] = []
-                    project_categories[project_name].append(task)
-                    project_found = True
-                    break
-
-            if not project_found:
-                if "その他" not in project_categories:
-                    project_categories["その他"] = []
-                project_categories["その他"].append(task)
-
-        # Convert to expected format
-        mock_categories = {
-            "categories": [
-                {"name": name, "tasks": task_list}
-                for name, task_list in project_categories.items()
-                if task_list  # Only include non-empty categories
-            ]
-        }
-
-        return mock_categories
+
+class DeltaLabels:
+    def __init__(self) -> None:
+        # Normalized key -> first spelling, for both category and task names
+        self.category_names: Dict[str, str] = {}
+        self.task_categories: Dict[str, Tuple[str, str]] = {}
+        # The background and summary chains learn into one instance from different threads
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.task_categories)
+
+    def learn(self, task_name: str, category_name: str) -> None:
+        with self.lock:
+            category_name = self.category_names.setdefault(normalize_task_name(category_name), category_name)
+            self.task_categories[normalize_task_name(task_name)] = (task_name, category_name)
+
+
+class DeltaCategorizer:
+    def __init__(
+        self,
+        client: GeminiClient,
+        on_category: Optional[CategoryCallback] = None,
+        priority: int = 0,
+        labels: Optional[DeltaLabels] = None,
+        scheduler: Optional["RequestScheduler"] = None,
+    ) -> None:
+        self.client = client
+        self.on_category = on_category
+        self.priority = priority
+        self.scheduler = scheduler
+        self.labels = labels if labels is not None else DeltaLabels()
+        self.sent_tasks = 0
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def categories(self) -> Dict[str, Any]:
+        category_tasks: Dict[str, List[str]] = {}
+        with self.labels.lock:
+            assignments = list(self.labels.task_categories.values())
+        for task, category_name in assignments:
+            category_tasks.setdefault(category_name, []).append(task)
+        return {"categories": [{"name": name, "tasks": tasks} for name, tasks in category_tasks.items()]}
+
+    def learn(self, task_name: str, category_name: str) -> None:
+        self.labels.learn(task_name, category_name)
+
+    def extend(self, labels: Iterable[Tuple[str, str]]) -> None:
+        for task_name, category_name in labels:
+            self.labels.learn(task_name, category_name)
+
+    def _report(self, category: Dict[str, Any]) -> None:
+        assert self.on_category is not None, "No category callback to report to"
+        name = self.labels.category_names.get(normalize_task_name(category["name"]), category["name"])
+        self.on_category({"name": name, "tasks": category["tasks"]})
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        task_categories = self.labels.task_categories
+        with self.labels.lock:
+            new_tasks = [task for task in dict.fromkeys(tasks) if normalize_task_name(task) not in task_categories]
+            category_names = list(self.labels.category_names.values())
+        if new_tasks:
+            self.sent_tasks += len(new_tasks)
+            response = self.client.fetch_categories(
+                new_tasks,
+                priority=self.priority,
+                category_names=category_names,
+                on_category=self._report if self.on_category is not None else None,
+                scheduler=self.scheduler,
+            )
+            for category in response.get("categories", []):
+                for task in category["tasks"]:
+                    self.learn(task, category["name"])
+
+        category_tasks: Dict[str, List[str]] = {}
+        with self.labels.lock:
+            for task in dict.fromkeys(tasks):
+                assignment = task_categories.get(normalize_task_name(task))
+                if assignment is not None:
+                    category_tasks.setdefault(assignment[1], []).append(task)
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
+
+
+def get_client(api_key: str) -> GeminiClient:
+    # genai.configure resets the shared transport, so build each client once per process; schedulers are
+    # passed per call so the registry never holds one alive
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = GeminiClient(api_key=api_key)
+            _clients[api_key] = client
+        return client
+
+
+def get_labels(api_key: str) -> DeltaLabels:
+    # Every chain for one key shares what the model has labelled, so later summaries send only new tasks
+    # along with every category name seen so far
+    with _clients_lock:
+        labels = _labels.get(api_key)
+        if labels is None:
+            labels = DeltaLabels()
+            _labels[api_key] = labels
+        return labels
+
+
+def clear_clients() -> None:
+    with _clients_lock:
+        _clients.clear()
+        _labels.clear()
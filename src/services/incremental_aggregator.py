@@ -0,0 +1,159 @@
+from typing import Any, Dict, List, Optional
+
+from src.models.session import NANOSECONDS_PER_SECOND, Session
+from src.models.task_tracker import TaskEvent, TaskTracker
+from src.services.category_aggregator import CategoryAggregator
+
+
+class IncrementalAggregator(CategoryAggregator):
+    def __init__(self, categories: Optional[Dict[str, Any]] = None, casefold: bool = True) -> None:
+        super().__init__(casefold=casefold)
+        self._task_totals_ns: Dict[str, int] = {}
+        self._task_order: Dict[str, int] = {}
+        self._next_order = 0
+        self._session_counts: Dict[str, int] = {}
+        # Categories are assigned per normalized key; a key may cover several tracked spellings
+        self._key_to_category: Dict[str, str] = {}
+        self._tasks_by_key: Dict[str, List[str]] = {}
+        self._category_totals_ns: Dict[str, int] = {}
+        self._category_tasks: Dict[str, Dict[str, None]] = {}
+        self._running_sessions: Dict[int, Session] = {}
+        if categories is not None:
+            self.set_categories(categories)
+
+    def attach(self, tracker: TaskTracker) -> None:
+        for session in tracker.sessions:
+            self._track_task(session.task_name)
+            self._session_counts[session.task_name] = self._session_counts.get(session.task_name, 0) + 1
+            if session.is_running:
+                self._running_sessions[id(session)] = session
+            else:
+                self._add_duration(session.task_name, session.get_duration_ns())
+        tracker.add_listener(self.on_task_event)
+
+    def on_task_event(self, event: TaskEvent, session: Session) -> None:
+        if event == "start":
+            self._track_task(session.task_name)
+            self._session_counts[session.task_name] = self._session_counts.get(session.task_name, 0) + 1
+            self._running_sessions[id(session)] = session
+        elif event == "stop":
+            self._running_sessions.pop(id(session), None)
+            self._track_task(session.task_name)
+            self._add_duration(session.task_name, session.get_duration_ns())
+        elif event == "remove":
+            self._remove_session(session)
+
+    def set_categories(self, categories: Dict[str, Any]) -> None:
+        assert isinstance(categories, dict), "Categories must be a dict"
+        assert "categories" in categories, "Categories dict must have 'categories' key"
+
+        key_to_category: Dict[str, str] = {}
+        for category in categories["categories"]:
+            for task in category["tasks"]:
+                key_to_category[self.task_names.key(task)] = category["name"]
+
+        changed_keys = [
+            key
+            for key in key_to_category.keys() | self._key_to_category.keys()
+            if key_to_category.get(key) != self._key_to_category.get(key)
+        ]
+        for key in changed_keys:
+            self._move_key(key, key_to_category.get(key))
+
+    def summarize(self) -> List[Dict[str, Any]]:
+        category_totals_ns = dict(self._category_totals_ns)
+        task_totals_ns = dict(self._task_totals_ns)
+        for session in self._running_sessions.values():
+            duration_ns = session.get_duration_ns()
+            task_totals_ns[session.task_name] += duration_ns
+            category_name = self._category_of(session.task_name)
+            if category_name is not None:
+                category_totals_ns[category_name] += duration_ns
+
+        ordered_categories = sorted(
+            (name for name, tasks in self._category_tasks.items() if tasks),
+            key=lambda name: min(self._task_order[task] for task in self._category_tasks[name]),
+        )
+
+        result = []
+        for category_name in ordered_categories:
+            category_seconds = category_totals_ns[category_name] / NANOSECONDS_PER_SECOND
+            category_result: Dict[str, Any] = {
+                "name": category_name,
+                "total_seconds": category_seconds,
+                "total_time": self._format_duration(category_seconds),
+                "tasks": [],
+            }
+            for task_name in sorted(self._category_tasks[category_name], key=self._task_order.__getitem__):
+                task_seconds = task_totals_ns[task_name] / NANOSECONDS_PER_SECOND
+                category_result["tasks"].append(
+                    {
+                        "name": task_name,
+                        "total_seconds": task_seconds,
+                        "total_time": self._format_duration(task_seconds),
+                    }
+                )
+            result.append(category_result)
+
+        return result
+
+    def _track_task(self, task_name: str) -> None:
+        if task_name in self._task_order:
+            return
+
+        self._task_order[task_name] = self._next_order
+        self._next_order += 1
+        self._task_totals_ns[task_name] = 0
+        self._tasks_by_key.setdefault(self.task_names.key(task_name), []).append(task_name)
+        category_name = self._category_of(task_name)
+        if category_name is not None:
+            self._category_tasks.setdefault(category_name, {})[task_name] = None
+            self._category_totals_ns.setdefault(category_name, 0)
+
+    def _remove_session(self, session: Session) -> None:
+        task_name = session.task_name
+        if task_name not in self._task_order:
+            return
+        self._add_duration(task_name, -session.get_duration_ns())
+        self._session_counts[task_name] -= 1
+        if self._session_counts[task_name] > 0:
+            return
+
+        # A task whose sessions have all left the tracker disappears from the summary
+        category_name = self._category_of(task_name)
+        if category_name is not None:
+            self._category_totals_ns[category_name] -= self._task_totals_ns[task_name]
+            del self._category_tasks[category_name][task_name]
+        del self._session_counts[task_name]
+        del self._task_order[task_name]
+        del self._task_totals_ns[task_name]
+        key = self.task_names.key(task_name)
+        self._tasks_by_key[key].remove(task_name)
+        if not self._tasks_by_key[key]:
+            del self._tasks_by_key[key]
+
+    def _add_duration(self, task_name: str, duration_ns: int) -> None:
+        self._task_totals_ns[task_name] += duration_ns
+        category_name = self._category_of(task_name)
+        if category_name is not None:
+            self._category_totals_ns[category_name] += duration_ns
+
+    def _category_of(self, task_name: str) -> Optional[str]:
+        return self._key_to_category.get(self.task_names.key(task_name))
+
+    def _move_key(self, key: str, new_category: Optional[str]) -> None:
+        old_category = self._key_to_category.pop(key, None)
+        if new_category is not None:
+            self._key_to_category[key] = new_category
+
+        for task_name in self._tasks_by_key.get(key, []):
+            self._move_task(task_name, old_category, new_category)
+
+    def _move_task(self, task_name: str, old_category: Optional[str], new_category: Optional[str]) -> None:
+        task_total_ns = self._task_totals_ns[task_name]
+        if old_category is not None:
+            self._category_totals_ns[old_category] -= task_total_ns
+            del self._category_tasks[old_category][task_name]
+        if new_category is not None:
+            self._category_tasks.setdefault(new_category, {})[task_name] = None
+            self._category_totals_ns[new_category] = self._category_totals_ns.get(new_category, 0) + task_total_ns
@@ -0,0 +1,271 @@
+import functools
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+SECONDS_PER_MINUTE = 60.0
+
+# Gemini 1.5 Flash free-tier quota
+DEFAULT_REQUESTS_PER_MINUTE = 15
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class SchedulerMetrics(NamedTuple):
+    queue_depth: int
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    retries: int
+    average_wait: float
+    max_wait: float
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        assert rate_per_minute > 0, "Bucket rate must be positive"
+        self.rate = rate_per_minute / SECONDS_PER_MINUTE
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        assert self.capacity > 0, "Bucket capacity must be positive"
+        self._tokens = self.capacity
+        self._updated: Optional[float] = None
+
+    def reserve(self, amount: float, now: float) -> float:
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Requests larger than the bucket may still run once it is full
+        amount = min(amount, self.capacity)
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self.rate)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def reserve(self, tokens: int, now: float) -> float:
+        return max(self.requests.reserve(1, now), self.tokens.reserve(tokens, now))
+
+
+class CircuitBreaker:
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        assert failure_threshold > 0, "Failure threshold must be positive"
+        assert reset_timeout > 0, "Reset timeout must be positive"
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random) -> float:
+    # Full jitter: spread retries uniformly below the exponential ceiling
+    return rng.uniform(0.0, min(cap, base * 2**attempt))
+
+
+class _Request:
+    __slots__ = ("call", "tokens", "priority", "future", "submitted_at", "attempt")
+
+    def __init__(
+        self, call: Callable[[], Any], tokens: int, priority: int, future: "Future[Any]", submitted_at: float
+    ) -> None:
+        self.call = call
+        self.tokens = tokens
+        self.priority = priority
+        self.future = future
+        self.submitted_at = submitted_at
+        self.attempt = 0
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        assert max_workers > 0, "Worker count must be positive"
+        assert max_retries >= 0, "Retry count cannot be negative"
+        self.limiter = limiter
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rng = rng if rng is not None else random.Random()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-request")
+        self._condition = threading.Condition()
+        self._queue: List[Tuple[int, int, float, _Request]] = []
+        self._sequence = itertools.count()
+        self._closed = False
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._retries = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        self._dispatcher = threading.Thread(target=self._dispatch, name="llm-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, call: Callable[[], Any], tokens: int = 0, priority: int = 0) -> "Future[Any]":
+        future: "Future[Any]" = Future()
+        with self._condition:
+            assert not self._closed, "Scheduler is closed"
+            now = time.monotonic()
+            self._push(_Request(call, tokens, priority, future, now), now)
+            self._submitted += 1
+        return future
+
+    def metrics(self) -> SchedulerMetrics:
+        with self._condition:
+            return SchedulerMetrics(
+                queue_depth=len(self._queue),
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                rejected=self._rejected,
+                retries=self._retries,
+                average_wait=self._total_wait / self._waited if self._waited else 0.0,
+                max_wait=self._max_wait,
+            )
+
+    def close(self) -> None:
+        # Returns without waiting for backoffs, rate limits or calls in flight; queued requests fail
+        with self._condition:
+            self._closed = True
+            queued = [entry[3] for entry in self._queue]
+            self._queue.clear()
+            self._rejected += len(queued)
+            self._condition.notify_all()
+        for request in queued:
+            self._fail_closed(request)
+        self._dispatcher.join(timeout=1.0)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fail_closed(self, request: _Request) -> None:
+        if not request.future.done():
+            request.future.set_exception(CircuitOpenError("LLM requests were cancelled because the scheduler closed"))
+
+    def _on_executed(self, request: _Request, execution: "Future[None]") -> None:
+        # Executions cancelled by close() never run, so their callers are told here
+        if execution.cancelled():
+            self._fail_closed(request)
+
+    def _push(self, request: _Request, not_before: float) -> None:
+        # Higher priorities sort first; the sequence keeps FIFO order within a priority
+        self._queue.append((-request.priority, next(self._sequence), not_before, request))
+        self._condition.notify()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._condition:
+                request = self._next_request()
+                if request is None:
+                    return
+
+                now = time.monotonic()
+                if not self.breaker.allow():
+                    self._rejected += 1
+                    self._record_wait(request, now)
+                    request.future.set_exception(CircuitOpenError("LLM requests are suspended after repeated failures"))
+                    continue
+                delay = self.limiter.reserve(request.tokens, now) if self.limiter is not None else 0.0
+
+            with self._condition:
+                # Rate-limit waits end early when the scheduler closes
+                if delay > 0:
+                    self._condition.wait_for(lambda: self._closed, delay)
+                if self._closed:
+                    self._rejected += 1
+                    closed = True
+                else:
+                    self._record_wait(request, time.monotonic())
+                    closed = False
+            if closed:
+                self._fail_closed(request)
+                continue
+            self._executor.submit(self._run, request).add_done_callback(functools.partial(self._on_executed, request))
+
+    def _next_request(self) -> Optional[_Request]:
+        while True:
+            if self._closed:
+                return None
+            if not self._queue:
+                self._condition.wait()
+                continue
+
+            # Take the most urgent request whose backoff has elapsed
+            now = time.monotonic()
+            ready = [entry for entry in self._queue if entry[2] <= now]
+            if ready:
+                entry = min(ready)
+                self._queue.remove(entry)
+                return entry[3]
+            self._condition.wait(min(entry[2] for entry in self._queue) - now)
+
+    def _record_wait(self, request: _Request, now: float) -> None:
+        if request.attempt == 0:
+            wait = now - request.submitted_at
+            self._waited += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def _run(self, request: _Request) -> None:
+        try:
+            result = request.call()
+        except Exception as e:
+            with self._condition:
+                self.breaker.record_failure()
+                if request.attempt < self.max_retries and not self._closed:
+                    delay = backoff_delay(request.attempt, self.backoff_base, self.backoff_cap, self._rng)
+                    request.attempt += 1
+                    self._retries += 1
+                    self._push(request, time.monotonic() + delay)
+                    return
+                self._failed += 1
+            request.future.set_exception(e)
+            return
+
+        with self._condition:
+            self.breaker.record_success()
+            self._completed += 1
+        request.future.set_result(result)
@@ -0,0 +1,263 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Literal, NamedTuple, Optional, Tuple
+
+from src.services.category_cache import CategoryCallback, TaskCategorizer, report_categories
+from src.utils.task_names import normalize_task_name
+
+RuleKind = Literal["keyword", "prefix", "regex"]
+
+OTHER_CATEGORY = "その他"
+
+_NO_RULE = 2**31
+# Backreferences and conditionals count groups from the start of the pattern, so they break inside an alternation
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+class CategoryRule(NamedTuple):
+    kind: RuleKind
+    pattern: str
+    # None takes the category from the first capture group of a regex rule
+    category: Optional[str] = None
+
+
+DEFAULT_RULES = [
+    CategoryRule("regex", r"(プロジェクト[A-Za-z0-9]+)"),
+    CategoryRule("regex", r"(Project[A-Za-z0-9]+)"),
+    CategoryRule("regex", r"([A-Z][A-Za-z0-9]+プロジェクト)"),
+    CategoryRule("regex", r"([A-Z][A-Za-z0-9]+案件)"),
+]
+
+
+def load_rules(path: str) -> List[CategoryRule]:
+    with open(path, "r", encoding="utf-8") as rules_file:
+        data = json.load(rules_file)
+    assert isinstance(data, dict) and "rules" in data, "Rules file must have a 'rules' list"
+
+    rules: List[CategoryRule] = []
+    for entry in data["rules"]:
+        category = entry.get("category")
+        for keyword in entry.get("keywords", []):
+            rules.append(CategoryRule("keyword", keyword, category))
+        for prefix in entry.get("prefixes", []):
+            rules.append(CategoryRule("prefix", prefix, category))
+        for pattern in entry.get("patterns", []):
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern {pattern!r} in rules file {path}: {e}") from e
+            if category is None and compiled.groups == 0:
+                raise ValueError(f"Pattern {pattern!r} in rules file {path} needs a category or a capture group")
+            rules.append(CategoryRule("regex", pattern, category))
+    return rules
+
+
+def _combinable(compiled: "re.Pattern[str]") -> bool:
+    # Inline global flags, named groups and group references only work in a pattern of their own
+    return (
+        compiled.flags == _DEFAULT_FLAGS
+        and not compiled.groupindex
+        and _GROUP_REFERENCE.search(compiled.pattern) is None
+    )
+
+
+class _RegexStage(NamedTuple):
+    first_index: int
+    # Finds the leftmost match of any rule in the stage; a lone pattern is only searched with this
+    screen: "re.Pattern[str]"
+    # Finds the first rule in order that matches anywhere; None for a lone pattern
+    ordered: Optional["re.Pattern[str]"]
+    # Alternative group name -> (rule index, number of the rule's first capture group or 0)
+    rules: Dict[str, Tuple[int, int]]
+
+
+class _KeywordAutomaton:
+    def __init__(self, keywords: Iterable[Tuple[str, int]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [_NO_RULE]
+
+        for keyword, rule_index in keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(_NO_RULE)
+                state = next_state
+            self._output[state] = min(self._output[state], rule_index)
+
+        # Breadth-first fail links; each state also inherits the best output of its fail state
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_state = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail_state if fail_state != next_state else 0
+                self._output[next_state] = min(self._output[next_state], self._output[self._fail[next_state]])
+                queue.append(next_state)
+
+    def best_match(self, text: str) -> int:
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        best = _NO_RULE
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] < best:
+                best = output[state]
+        return best
+
+
+class RuleCategorizer:
+    def __init__(self, rules: Iterable[CategoryRule]) -> None:
+        self.rules = list(rules)
+
+        keywords: List[Tuple[str, int]] = []
+        self._prefixes: Dict[str, int] = {}
+        self._regexes: List[Tuple[int, "re.Pattern[str]"]] = []
+        for index, rule in enumerate(self.rules):
+            assert rule.pattern, "Rule pattern cannot be empty"
+            if rule.kind == "keyword":
+                assert rule.category is not None, "Keyword rules need a category"
+                keywords.append((normalize_task_name(rule.pattern), index))
+            elif rule.kind == "prefix":
+                assert rule.category is not None, "Prefix rules need a category"
+                self._prefixes.setdefault(normalize_task_name(rule.pattern), index)
+            else:
+                compiled = re.compile(rule.pattern)
+                assert rule.category is not None or compiled.groups > 0, "Regex rules need a category or a group"
+                self._regexes.append((index, compiled))
+
+        self._automaton = _KeywordAutomaton(keywords) if keywords else None
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes})
+
+        # Each alternative scans the whole name before the next is tried, so matching from the start returns the
+        # first rule in order that matches anywhere. Patterns that cannot share an alternation are searched alone
+        self._stages: List[_RegexStage] = []
+        run: List[Tuple[int, "re.Pattern[str]"]] = []
+        for index, compiled in self._regexes:
+            if _combinable(compiled):
+                run.append((index, compiled))
+                continue
+            self._add_combined_stage(run)
+            run = []
+            self._stages.append(_RegexStage(index, compiled, None, {}))
+        self._add_combined_stage(run)
+
+    def _add_combined_stage(self, run: List[Tuple[int, "re.Pattern[str]"]]) -> None:
+        if not run:
+            return
+        alternatives = []
+        rules: Dict[str, Tuple[int, int]] = {}
+        group_number = 1
+        for index, compiled in run:
+            group_name = f"r{index}"
+            alternatives.append(f"(?P<{group_name}>{compiled.pattern})")
+            rules[group_name] = (index, group_number + 1 if compiled.groups else 0)
+            group_number += 1 + compiled.groups
+        screen = re.compile("|".join(alternatives))
+        ordered = re.compile("|".join(f"(?s:.*?){alternative}" for alternative in alternatives))
+        self._stages.append(_RegexStage(run[0][0], screen, ordered, rules))
+
+    def categorize(self, task_name: str) -> Optional[str]:
+        best = _NO_RULE
+        folded: Optional[str] = None
+        # Regexes see width- and whitespace-normalized text but keep the original case
+        task_name = normalize_task_name(task_name, casefold=False)
+
+        if self._prefixes:
+            folded = task_name.casefold()
+            for length in self._prefix_lengths:
+                if length > len(folded):
+                    break
+                index = self._prefixes.get(folded[:length])
+                if index is not None and index < best:
+                    best = index
+
+        if self._automaton is not None:
+            if folded is None:
+                folded = task_name.casefold()
+            index = self._automaton.best_match(folded)
+            if index < best:
+                best = index
+
+        captured: Optional[str] = None
+        for first_index, screen, ordered, rules in self._stages:
+            if first_index >= best:
+                break
+            # Stages follow rule order, so the first one that matches decides between the regex rules
+            match = screen.search(task_name)
+            if match is None:
+                continue
+            if ordered is None:
+                index, capture_group = first_index, 1 if screen.groups else 0
+            else:
+                index, capture_group = rules[str(match.lastgroup)]
+                if index != first_index:
+                    # A rule earlier in the stage may still match further right than the leftmost hit
+                    match = ordered.match(task_name)
+                    assert match is not None, "Ordered alternation must match where the screen did"
+                    index, capture_group = rules[str(match.lastgroup)]
+            if index < best:
+                best = index
+                captured = match.group(capture_group) if capture_group else None
+            break
+
+        if best == _NO_RULE:
+            return None
+        rule = self.rules[best]
+        if rule.category is not None:
+            return rule.category
+        assert captured is not None, "Regex rule without a category must capture one"
+        return captured
+
+    def partition(self, tasks: Iterable[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        resolved: Dict[str, List[str]] = {}
+        unresolved: List[str] = []
+        for task in dict.fromkeys(tasks):
+            category_name = self.categorize(task)
+            if category_name is None:
+                unresolved.append(task)
+            else:
+                resolved.setdefault(category_name, []).append(task)
+        return resolved, unresolved
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        category_tasks: Dict[str, List[str]] = {}
+        for task in tasks:
+            category_tasks.setdefault(self.categorize(task) or OTHER_CATEGORY, []).append(task)
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
+
+
+class RuleFirstCategorizer:
+    def __init__(
+        self, rules: RuleCategorizer, fallback: TaskCategorizer, on_category: Optional[CategoryCallback] = None
+    ) -> None:
+        self.rules = rules
+        self.fallback = fallback
+        self.on_category = on_category
+        self.resolved_locally = 0
+        self.sent_to_fallback = 0
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        category_tasks, unresolved = self.rules.partition(tasks)
+        self.resolved_locally += sum(len(names) for names in category_tasks.values())
+        self.sent_to_fallback += len(unresolved)
+
+        if unresolved:
+            report_categories(self.on_category, category_tasks)
+            response = self.fallback.categorize_tasks(unresolved)
+            for category in response.get("categories", []):
+                category_tasks.setdefault(category["name"], []).extend(category["tasks"])
+
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
@@ -0,0 +1,177 @@
+import bisect
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.models.session import NANOSECONDS_PER_SECOND, Session, datetime_to_epoch_ns, epoch_ns_to_datetime
+from src.models.task_tracker import TaskEvent, TaskTracker
+
+
+class SessionSlice(NamedTuple):
+    session: Session
+    start_time: datetime
+    end_time: datetime
+    duration: float
+
+
+class _DurationClass(NamedTuple):
+    # Finished sessions sorted by start, all shorter than 2**bits ns, so one bound covers every end
+    starts: List[int]
+    ends: List[int]
+    sessions: List[Session]
+
+
+class SessionIndex:
+    def __init__(self, sessions: Iterable[Session] = ()) -> None:
+        self._classes: Dict[int, _DurationClass] = {}
+        self._running: List[Session] = []
+        self._size = 0
+        # Pause layouts live here, not on Session, and only for sessions seen pausing through the tracker
+        self._pauses: Dict[int, List[Tuple[int, int]]] = {}
+        self._open_pauses: Dict[int, Tuple[int, int]] = {}
+        for session in sessions:
+            self.add(session)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def attach(self, tracker: TaskTracker) -> None:
+        for session in tracker.sessions:
+            self.add(session)
+        if tracker.current_session is not None and tracker.current_session.is_paused:
+            self._pause_started(tracker.current_session)
+        tracker.add_listener(self.on_task_event)
+
+    def on_task_event(self, event: TaskEvent, session: Session) -> None:
+        if event == "start":
+            self.add(session)
+        elif event == "pause":
+            self._pause_started(session)
+        elif event == "resume":
+            self._pause_ended(session)
+        elif event == "stop":
+            # Stopping a paused session resumes it without a separate event
+            self._pause_ended(session)
+            self.update(session)
+        elif event == "remove":
+            self.remove(session)
+
+    def add(self, session: Session) -> None:
+        self._size += 1
+        if session.is_running:
+            self._running.append(session)
+        else:
+            self._insert(session)
+
+    def update(self, session: Session) -> None:
+        for position, running in enumerate(self._running):
+            if running is session:
+                del self._running[position]
+                self._insert(session)
+                return
+        self._delete(session)
+        self._insert(session)
+
+    def remove(self, session: Session) -> None:
+        self._size -= 1
+        self._pauses.pop(id(session), None)
+        self._open_pauses.pop(id(session), None)
+        for position, running in enumerate(self._running):
+            if running is session:
+                del self._running[position]
+                return
+        self._delete(session)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[SessionSlice]:
+        assert start <= end, "Range start must not be after its end"
+
+        window_start = datetime_to_epoch_ns(start)
+        window_end = datetime_to_epoch_ns(end)
+        found: List[Tuple[int, Session]] = []
+        for bits, duration_class in self._classes.items():
+            # A session can only reach the window if it starts less than its class bound before it
+            first = bisect.bisect_right(duration_class.starts, window_start - (1 << bits))
+            last = bisect.bisect_left(duration_class.starts, window_end, lo=first)
+            for position in range(first, last):
+                if duration_class.ends[position] > window_start:
+                    found.append((duration_class.starts[position], duration_class.sessions[position]))
+        for session in self._running:
+            found.append((session.get_start_epoch_ns(), session))
+        found.sort(key=lambda item: item[0])
+
+        slices = []
+        for start_ns, session in found:
+            clipped = self._clip(session, start_ns, window_start, window_end)
+            if clipped is not None:
+                slices.append(clipped)
+        return slices
+
+    def _insert(self, session: Session) -> None:
+        start_ns = session.get_start_epoch_ns()
+        elapsed_ns = session.get_elapsed_ns()
+        duration_class = self._classes.setdefault(elapsed_ns.bit_length(), _DurationClass([], [], []))
+        position = bisect.bisect_right(duration_class.starts, start_ns)
+        duration_class.starts.insert(position, start_ns)
+        duration_class.ends.insert(position, start_ns + elapsed_ns)
+        duration_class.sessions.insert(position, session)
+
+    def _delete(self, session: Session) -> None:
+        start_ns = session.get_start_epoch_ns()
+        for duration_class in self._classes.values():
+            position = bisect.bisect_left(duration_class.starts, start_ns)
+            while position < len(duration_class.starts) and duration_class.starts[position] == start_ns:
+                if duration_class.sessions[position] is session:
+                    del duration_class.starts[position]
+                    del duration_class.ends[position]
+                    del duration_class.sessions[position]
+                    return
+                position += 1
+        raise AssertionError("Session is not indexed")
+
+    def _pause_started(self, session: Session) -> None:
+        pause_offset = session.get_pause_offset_ns()
+        if pause_offset is not None:
+            self._open_pauses[id(session)] = (pause_offset, session.paused_ns)
+
+    def _pause_ended(self, session: Session) -> None:
+        open_pause = self._open_pauses.pop(id(session), None)
+        if open_pause is not None:
+            pause_offset, paused_before = open_pause
+            pause_end = pause_offset + session.paused_ns - paused_before
+            self._pauses.setdefault(id(session), []).append((pause_offset, pause_end))
+
+    def _pause_offsets(self, session: Session) -> Optional[List[Tuple[int, int]]]:
+        # Exact only when every finished pause was seen; otherwise callers fall back to spreading pauses evenly
+        pauses = list(self._pauses.get(id(session), ()))
+        if sum(pause_end - pause_start for pause_start, pause_end in pauses) != session.paused_ns:
+            return None
+        open_pause = self._open_pauses.get(id(session))
+        if session.is_paused:
+            if open_pause is None:
+                return None
+            pauses.append((open_pause[0], session.get_elapsed_ns()))
+        return pauses
+
+    def _clip(self, session: Session, start_ns: int, window_start: int, window_end: int) -> Optional[SessionSlice]:
+        session_end = start_ns + session.get_elapsed_ns()
+        clipped_start = max(start_ns, window_start)
+        clipped_end = min(session_end, window_end)
+        if clipped_end <= clipped_start:
+            return None
+
+        overlap_ns = clipped_end - clipped_start
+        pause_offsets = self._pause_offsets(session)
+        if pause_offsets is None:
+            session_length = session_end - start_ns
+            paused_ns = session.get_paused_ns() * overlap_ns // session_length if session_length else 0
+        else:
+            paused_ns = sum(
+                max(0, min(start_ns + pause_end, clipped_end) - max(start_ns + pause_start, clipped_start))
+                for pause_start, pause_end in pause_offsets
+            )
+
+        return SessionSlice(
+            session,
+            epoch_ns_to_datetime(clipped_start),
+            epoch_ns_to_datetime(clipped_end),
+            max(0, overlap_ns - paused_ns) / NANOSECONDS_PER_SECOND,
+        )
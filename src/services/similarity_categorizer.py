@@ -0,0 +1,194 @@
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from src.services.category_cache import CategoryCallback, TaskCategorizer, report_categories
+from src.utils.task_names import normalize_task_name
+
+DEFAULT_DIMENSIONS = 1024
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_MARGIN = 0.05
+NGRAM_SIZES = (2, 3)
+# Rows checked per query when looking for the best competing category
+_RUNNER_UP_CANDIDATES = 16
+
+# Category, cosine similarity and lead over the best row of any other category
+SimilarityMatch = Tuple[str, float, float]
+
+
+class SimilarityCategorizer:
+    INITIAL_CAPACITY = 256
+
+    def __init__(
+        self, dimensions: int = DEFAULT_DIMENSIONS, threshold: float = DEFAULT_THRESHOLD, margin: float = DEFAULT_MARGIN
+    ) -> None:
+        assert dimensions > 0, "Vector dimensions must be positive"
+        assert 0.0 < threshold <= 1.0, "Threshold must be in (0, 1]"
+        assert margin >= 0.0, "Margin cannot be negative"
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self.margin = margin
+        self._size = 0
+        self._vectors: npt.NDArray[np.float32] = np.zeros((self.INITIAL_CAPACITY, dimensions), dtype=np.float32)
+        self._row_categories: List[int] = []
+        self._row_keys: List[str] = []
+        self._rows_by_name: Dict[str, int] = {}
+        self._category_names: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        # A shared index is queried and taught by the background and summary chains from different threads
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, task_name: str, category_name: str) -> None:
+        with self._lock:
+            self._add(normalize_task_name(task_name), category_name)
+
+    def _add(self, key: str, category_name: str) -> None:
+        category_code = self._category_codes.get(category_name)
+        if category_code is None:
+            category_code = len(self._category_names)
+            self._category_names.append(category_name)
+            self._category_codes[category_name] = category_code
+
+        # A relabelled name keeps its row and only changes category
+        row = self._rows_by_name.get(key)
+        if row is not None:
+            self._row_categories[row] = category_code
+            return
+
+        if self._size == len(self._vectors):
+            grown = np.zeros((len(self._vectors) * 2, self.dimensions), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+        self._vectors[self._size] = self._vectorize(key)
+        self._rows_by_name[key] = self._size
+        self._row_categories.append(category_code)
+        self._row_keys.append(key)
+        self._size += 1
+
+    def extend(self, labels: Iterable[Tuple[str, str]]) -> None:
+        with self._lock:
+            for task_name, category_name in labels:
+                self._add(normalize_task_name(task_name), category_name)
+
+    def remove(self, task_name: str) -> None:
+        with self._lock:
+            self._remove(normalize_task_name(task_name))
+
+    def sync(self, labels: Iterable[Tuple[str, str]]) -> None:
+        # Keeps exactly these labels; only names not indexed yet are vectorized
+        with self._lock:
+            live: Dict[str, None] = {}
+            for task_name, category_name in labels:
+                key = normalize_task_name(task_name)
+                live[key] = None
+                self._add(key, category_name)
+            for key in [key for key in self._row_keys if key not in live]:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        # The last row fills the gap so the matrix stays dense
+        row = self._rows_by_name.pop(key, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            moved_key = self._row_keys[last]
+            self._vectors[row] = self._vectors[last]
+            self._row_categories[row] = self._row_categories[last]
+            self._row_keys[row] = moved_key
+            self._rows_by_name[moved_key] = row
+        self._vectors[last] = 0.0
+        self._row_categories.pop()
+        self._row_keys.pop()
+        self._size = last
+
+    def nearest(self, tasks: List[str]) -> List[Optional[SimilarityMatch]]:
+        if not tasks:
+            return []
+        queries = np.stack([self._vectorize(normalize_task_name(task)) for task in tasks])
+        with self._lock:
+            return self._nearest(queries)
+
+    def _nearest(self, queries: npt.NDArray[np.float32]) -> List[Optional[SimilarityMatch]]:
+        if self._size == 0:
+            return [None] * len(queries)
+
+        similarities = queries @ self._vectors[: self._size].T
+        candidate_count = min(_RUNNER_UP_CANDIDATES, self._size)
+        candidates = np.argpartition(-similarities, candidate_count - 1, axis=1)[:, :candidate_count]
+
+        results: List[Optional[SimilarityMatch]] = []
+        for query_similarities, query_candidates in zip(similarities, candidates):
+            rows = sorted(query_candidates.tolist(), key=lambda row: -query_similarities[row])
+            best_score = float(query_similarities[rows[0]])
+            if best_score <= 0.0:
+                results.append(None)
+                continue
+
+            best_category = self._row_categories[rows[0]]
+            runner_up = next(
+                (float(query_similarities[row]) for row in rows if self._row_categories[row] != best_category), 0.0
+            )
+            results.append((self._category_names[best_category], best_score, best_score - runner_up))
+        return results
+
+    def categorize(self, task_name: str) -> Optional[str]:
+        (match,) = self.nearest([task_name])
+        return match[0] if match is not None and self._is_confident(match) else None
+
+    def partition(self, tasks: Iterable[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        unique_tasks = list(dict.fromkeys(tasks))
+        resolved: Dict[str, List[str]] = {}
+        unresolved: List[str] = []
+        for task, match in zip(unique_tasks, self.nearest(unique_tasks)):
+            if match is not None and self._is_confident(match):
+                resolved.setdefault(match[0], []).append(task)
+            else:
+                unresolved.append(task)
+        return resolved, unresolved
+
+    def _is_confident(self, match: Optional[SimilarityMatch]) -> bool:
+        return match is not None and match[1] >= self.threshold and match[2] >= self.margin
+
+    def _vectorize(self, key: str) -> npt.NDArray[np.float32]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        padded = f" {key} "
+        for size in NGRAM_SIZES:
+            for start in range(len(padded) - size + 1):
+                vector[zlib.crc32(padded[start : start + size].encode("utf-8")) % self.dimensions] += 1.0
+        norm = float(np.linalg.norm(vector))
+        if norm > 0.0:
+            vector /= norm
+        return vector
+
+
+class SimilarityFirstCategorizer:
+    def __init__(
+        self, index: SimilarityCategorizer, fallback: TaskCategorizer, on_category: Optional[CategoryCallback] = None
+    ) -> None:
+        self.index = index
+        self.fallback = fallback
+        self.on_category = on_category
+        self.resolved_locally = 0
+        self.sent_to_fallback = 0
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        category_tasks, unresolved = self.index.partition(tasks)
+        self.resolved_locally += sum(len(names) for names in category_tasks.values())
+        self.sent_to_fallback += len(unresolved)
+
+        if unresolved:
+            report_categories(self.on_category, category_tasks)
+            response = self.fallback.categorize_tasks(unresolved)
+            for category in response.get("categories", []):
+                for task in category["tasks"]:
+                    self.index.add(task, category["name"])
+                category_tasks.setdefault(category["name"], []).extend(category["tasks"])
+
+        return {"categories": [{"name": name, "tasks": names} for name, names in category_tasks.items()]}
@@ -0,0 +1,236 @@
+import mmap
+import os
+import struct
+from datetime import datetime
+from types import TracebackType
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.session import Session, datetime_to_epoch_ns
+from src.models.task_tracker import TaskTracker
+
+ARCHIVE_MAGIC = b"TTA2"
+ARCHIVE_VERSION = 2
+
+ROW_DTYPE = np.dtype(
+    [("start_ns", "<i8"), ("end_ns", "<i8"), ("paused_ns", "<i8"), ("task_code", "<i4"), ("reserved", "<i4")]
+)
+
+# Magic, version, row count and the longest session, which bounds how far before a window an overlap can start
+_HEADER = struct.Struct("<4sIQQ")
+_NAME_LENGTH = struct.Struct("<I")
+
+
+class ArchiveFormatError(Exception):
+    pass
+
+
+class ArchivedSessions:
+    def __init__(self, rows: npt.NDArray[np.void], task_names: Tuple[str, ...]) -> None:
+        self.rows = rows
+        self.task_names = task_names
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def start_ns(self) -> npt.NDArray[np.int64]:
+        return self.rows["start_ns"]
+
+    def end_ns(self) -> npt.NDArray[np.int64]:
+        return self.rows["end_ns"]
+
+    def paused_ns(self) -> npt.NDArray[np.int64]:
+        return self.rows["paused_ns"]
+
+    def task_codes(self) -> npt.NDArray[np.int32]:
+        return self.rows["task_code"]
+
+    def durations_ns(self) -> npt.NDArray[np.int64]:
+        durations: npt.NDArray[np.int64] = self.rows["end_ns"] - self.rows["start_ns"] - self.rows["paused_ns"]
+        return durations
+
+
+class SessionArchive:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            # An empty file cannot be mapped, so the size is checked before mmap sees it
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                raise ArchiveFormatError(f"Archive file is too short: {path}")
+            self._map: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            row_count, self.max_length_ns = _unpack_header(self._map, path)
+            if _HEADER.size + row_count * ROW_DTYPE.itemsize > len(self._map):
+                raise ArchiveFormatError(f"Archive file is truncated: {path}")
+        except BaseException:
+            self._file.close()
+            raise
+
+        rows: npt.NDArray[np.void] = np.frombuffer(self._map, dtype=ROW_DTYPE, count=row_count, offset=_HEADER.size)
+        self.task_names = tuple(_read_task_names(_names_path(path))[0])
+        self.sessions = ArchivedSessions(rows, self.task_names)
+
+    def __enter__(self) -> "SessionArchive":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def between(self, start: datetime, end: datetime) -> ArchivedSessions:
+        assert start <= end, "Range start must not be after its end"
+
+        window_start = datetime_to_epoch_ns(start)
+        window_end = datetime_to_epoch_ns(end)
+        start_column = self.sessions.start_ns()
+        # Sessions starting before the window overlap it only if they began within the longest session length
+        first = int(np.searchsorted(start_column, window_start - self.max_length_ns, side="right"))
+        inside = int(np.searchsorted(start_column, window_start, side="left"))
+        last = int(np.searchsorted(start_column, window_end, side="left"))
+        rows = self.sessions.rows[first:last]
+        if first < inside:
+            overlapping = np.ones(len(rows), dtype=bool)
+            overlapping[: inside - first] = rows["end_ns"][: inside - first] > window_start
+            rows = rows[overlapping]
+        return ArchivedSessions(rows, self.task_names)
+
+    def close(self) -> None:
+        # Views handed out by between() keep the mapping alive; it is unmapped once the last one is released
+        self.sessions = ArchivedSessions(np.empty(0, dtype=ROW_DTYPE), ())
+        self._map = None
+        self._file.close()
+
+
+def write_archive(path: str, rows: npt.NDArray[np.void], task_names: Sequence[str]) -> None:
+    assert rows.dtype == ROW_DTYPE, "Rows must use the archive row layout"
+
+    # Names are replaced first; they only ever grow, so an older archive still decodes against them
+    _replace_file(_names_path(path), b"".join(_encode_name(task_name) for task_name in task_names))
+    lengths = rows["end_ns"] - rows["start_ns"]
+    max_length_ns = int(lengths.max()) if len(rows) else 0
+    _replace_file(path, _HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(rows), max_length_ns) + rows.tobytes())
+
+
+def seal_sessions(tracker: TaskTracker, path: str, before: datetime) -> int:
+    before_ns = datetime_to_epoch_ns(before)
+    sealed: List[Session] = []
+    for session in tracker.sessions:
+        if not session.is_running and session.get_start_epoch_ns() + session.get_elapsed_ns() < before_ns:
+            sealed.append(session)
+    if not sealed:
+        return 0
+
+    names_path = _names_path(path)
+    task_names, names_size = _read_task_names(names_path) if os.path.exists(path) else ([], 0)
+    known_names = len(task_names)
+    codes_by_name: Dict[str, int] = {task_name: code for code, task_name in enumerate(task_names)}
+
+    new_rows = np.zeros(len(sealed), dtype=ROW_DTYPE)
+    for index, session in enumerate(sealed):
+        code = codes_by_name.get(session.task_name)
+        if code is None:
+            code = len(task_names)
+            task_names.append(session.task_name)
+            codes_by_name[session.task_name] = code
+        start_ns = session.get_start_epoch_ns()
+        new_rows[index] = (start_ns, start_ns + session.get_elapsed_ns(), session.get_paused_ns(), code, 0)
+    new_rows = new_rows[np.argsort(new_rows["start_ns"], kind="stable")]
+
+    if os.path.exists(path) and len(task_names) > known_names:
+        # New names are on disk before any row that refers to them
+        with open(names_path, "ab") as names_file:
+            names_file.truncate(names_size)
+            names_file.write(b"".join(_encode_name(task_name) for task_name in task_names[known_names:]))
+            names_file.flush()
+            os.fsync(names_file.fileno())
+    if not os.path.exists(path) or not _append_rows(path, new_rows):
+        # A first seal, or one reaching back before the newest archived start, writes the archive whole
+        existing_rows = np.empty(0, dtype=ROW_DTYPE)
+        if os.path.exists(path):
+            with SessionArchive(path) as archive:
+                existing_rows = archive.sessions.rows.copy()
+        rows = np.concatenate([existing_rows, new_rows])
+        write_archive(path, rows[np.argsort(rows["start_ns"], kind="stable")], task_names)
+
+    tracker.remove_sessions(sealed)
+    return len(sealed)
+
+
+def _append_rows(path: str, rows: npt.NDArray[np.void]) -> bool:
+    with open(path, "r+b") as archive_file:
+        row_count, max_length_ns = _unpack_header(archive_file.read(_HEADER.size), path)
+        rows_end = _HEADER.size + row_count * ROW_DTYPE.itemsize
+        if row_count:
+            archive_file.seek(rows_end - ROW_DTYPE.itemsize)
+            last_start = int(np.frombuffer(archive_file.read(ROW_DTYPE.itemsize), dtype=ROW_DTYPE)["start_ns"][0])
+            if int(rows["start_ns"][0]) < last_start:
+                return False
+
+        # Rows land past the counted ones first; the header only counts them once they are on disk
+        archive_file.seek(rows_end)
+        archive_file.write(rows.tobytes())
+        archive_file.truncate()
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+        max_length_ns = max(max_length_ns, int((rows["end_ns"] - rows["start_ns"]).max()))
+        archive_file.seek(0)
+        archive_file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, row_count + len(rows), max_length_ns))
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+    return True
+
+
+def _unpack_header(data: Union[bytes, mmap.mmap], path: str) -> Tuple[int, int]:
+    if len(data) < _HEADER.size:
+        raise ArchiveFormatError(f"Archive file is too short: {path}")
+    magic, version, row_count, max_length_ns = _HEADER.unpack_from(data, 0)
+    if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+        raise ArchiveFormatError(f"Unsupported archive file: {path}")
+    return row_count, max_length_ns
+
+
+def _names_path(path: str) -> str:
+    return f"{path}.names"
+
+
+def _encode_name(task_name: str) -> bytes:
+    encoded = task_name.encode("utf-8")
+    return _NAME_LENGTH.pack(len(encoded)) + encoded
+
+
+def _read_task_names(names_path: str) -> Tuple[List[str], int]:
+    # Returns the names and how many bytes they span; a name cut short by a crash is left out
+    if not os.path.exists(names_path):
+        return [], 0
+
+    with open(names_path, "rb") as names_file:
+        data = names_file.read()
+
+    task_names: List[str] = []
+    offset = 0
+    while offset + _NAME_LENGTH.size <= len(data):
+        (length,) = _NAME_LENGTH.unpack_from(data, offset)
+        if offset + _NAME_LENGTH.size + length > len(data):
+            break
+        offset += _NAME_LENGTH.size
+        task_names.append(data[offset : offset + length].decode("utf-8"))
+        offset += length
+    return task_names, offset
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as temporary_file:
+        temporary_file.write(data)
+        temporary_file.flush()
+        os.fsync(temporary_file.fileno())
+    os.replace(temporary_path, path)
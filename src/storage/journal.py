@@ -0,0 +1,365 @@
+import gc
+import os
+import struct
+import threading
+import time
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from src.models.session import Session
+from src.models.task_tracker import SessionBackend, TaskEvent, TaskTracker
+
+JOURNAL_MAGIC = b"TTJ1"
+SNAPSHOT_MAGIC = b"TTS1"
+
+_HEADER = struct.Struct("<4sq")
+_RECORD = struct.Struct("<BxxxIq")
+_NAME_LENGTH = struct.Struct("<I")
+_SNAPSHOT_COUNT = struct.Struct("<Q")
+_SNAPSHOT_ROW = struct.Struct("<Iqqqq")
+
+_START = 1
+_PAUSE = 2
+_RESUME = 3
+_STOP = 4
+
+_EVENT_KINDS: Dict[TaskEvent, int] = {"start": _START, "pause": _PAUSE, "resume": _RESUME, "stop": _STOP}
+_NO_TIME = -1
+
+_FinishedRow = Tuple[int, int, int, int]
+_RunningRow = Tuple[int, int, int, int]
+
+
+class JournalCorruptedError(Exception):
+    pass
+
+
+class SessionJournal:
+    def __init__(self, path: str, fsync_interval: float = 1.0, compact_every: int = 100_000) -> None:
+        assert fsync_interval >= 0, "Fsync interval cannot be negative"
+        assert compact_every > 0, "Compaction threshold must be positive"
+        self.path = path
+        self.names_path = f"{path}.names"
+        self.snapshot_path = f"{path}.snapshot"
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self._file: Optional[BinaryIO] = None
+        self._names_file: Optional[BinaryIO] = None
+        self._tracker: Optional[TaskTracker] = None
+        self._generation = 0
+        self._codes_by_name: Dict[str, int] = {}
+        self._task_names: List[str] = []
+        self._events_since_compaction = 0
+        self._compacted_removals = 0
+        self._last_sync = time.monotonic()
+        # Appends and the deferred fsync run on different threads
+        self._lock = threading.RLock()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._loaded = False
+        # Offset and finished pause total of the current pause, so its resume is recorded at the real instant
+        self._open_pause: Optional[Tuple[int, int]] = None
+
+    def load(self, store: Optional[SessionBackend] = None) -> TaskTracker:
+        self._task_names = self._read_names()
+        self._codes_by_name = {name: code for code, name in enumerate(self._task_names)}
+        tracker = TaskTracker(store=store)
+        for task_name in self._task_names:
+            tracker.task_names.canonical(task_name)
+
+        # Replay builds a row and a Session per finished session and no cycles; collections while they pile up
+        # would only rescan them, about half the cost of rebuilding a large history
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            finished: List[_FinishedRow] = []
+            self._generation, running = self._read_snapshot(finished)
+            running = self._replay_journal(finished, running)
+            task_names = self._task_names
+            restore = Session.restore
+            tracker.sessions = [
+                restore(task_names[task_code], start_ns, end_ns, paused_ns)
+                for task_code, start_ns, end_ns, paused_ns in finished
+            ]
+        finally:
+            if collecting:
+                gc.enable()
+        self._loaded = True
+
+        if store is not None:
+            # Persistent stores skip the sessions an earlier run already wrote
+            store.extend(tracker.sessions)
+        if running is not None:
+            task_code, start_ns, paused_ns, pause_start_ns = running
+            pause_start = None if pause_start_ns == _NO_TIME else pause_start_ns
+            session = restore(task_names[task_code], start_ns, None, paused_ns, pause_start)
+            tracker.sessions.append(session)
+            tracker.current_session = session
+        return tracker
+
+    def attach(self, tracker: TaskTracker) -> None:
+        assert self._tracker is None, "Journal is already attached"
+        assert self._loaded or not os.path.exists(self.path), "Existing journal must be loaded before attaching"
+        self._tracker = tracker
+        if tracker.current_session is not None:
+            self._open_pause = self._pause_of(tracker.current_session)
+        self._open()
+        tracker.add_listener(self.on_task_event)
+
+    def detach(self) -> None:
+        if self._tracker is not None:
+            self._tracker.remove_listener(self.on_task_event)
+            self._tracker = None
+        self.close()
+
+    def on_task_event(self, event: TaskEvent, session: Session) -> None:
+        start_ns = session.get_start_epoch_ns()
+        with self._lock:
+            if event == "remove":
+                # Removed sessions must not come back on replay; one compaction covers the whole batch
+                if self._tracker is not None and self._compacted_removals != self._tracker.removal_batches:
+                    self._compacted_removals = self._tracker.removal_batches
+                    self.compact(self._tracker)
+                return
+            if event == "start":
+                self._append(_START, self._encode_task(session.task_name), start_ns)
+            else:
+                self._append(_EVENT_KINDS[event], 0, start_ns + self._event_offset_ns(event, session))
+
+            if self._events_since_compaction >= self.compact_every and self._tracker is not None:
+                self.compact(self._tracker)
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            for file in (self._names_file, self._file):
+                if file is not None:
+                    file.flush()
+                    os.fsync(file.fileno())
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self.sync()
+            for file in (self._names_file, self._file):
+                if file is not None:
+                    file.close()
+            self._names_file = None
+            self._file = None
+
+    def quarantine(self) -> List[str]:
+        # Moves unreadable journal files aside so tracking can start fresh without losing them
+        assert self._file is None, "Journal must not be open"
+        suffix = time.strftime("%Y%m%d-%H%M%S")
+        moved: List[str] = []
+        for path in (self.path, self.names_path, self.snapshot_path):
+            if os.path.exists(path):
+                target = f"{path}.corrupt-{suffix}"
+                os.replace(path, target)
+                moved.append(target)
+        self._generation = 0
+        self._task_names = []
+        self._codes_by_name = {}
+        self._events_since_compaction = 0
+        self._loaded = False
+        return moved
+
+    def compact(self, tracker: TaskTracker) -> None:
+        if self._names_file is None:
+            self._names_file = open(self.names_path, "ab")
+
+        rows = bytearray()
+        for session in tracker.sessions:
+            start_ns = session.get_start_epoch_ns()
+            end_ns = _NO_TIME if session.is_running else start_ns + session.get_elapsed_ns()
+            paused_ns = session.get_paused_ns()
+            pause_start_ns = _NO_TIME
+            pause_offset_ns = session.get_pause_offset_ns()
+            if pause_offset_ns is not None:
+                paused_ns = session.paused_ns
+                pause_start_ns = start_ns + pause_offset_ns
+            task_code = self._encode_task(session.task_name)
+            rows += _SNAPSHOT_ROW.pack(task_code, start_ns, end_ns, paused_ns, pause_start_ns)
+
+        if self._names_file is not None:
+            self._names_file.flush()
+            os.fsync(self._names_file.fileno())
+
+        generation = self._generation + 1
+        temporary_path = f"{self.snapshot_path}.tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(_HEADER.pack(SNAPSHOT_MAGIC, generation))
+            snapshot_file.write(_SNAPSHOT_COUNT.pack(len(tracker.sessions)))
+            snapshot_file.write(rows)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+        self._generation = generation
+
+        self._reset_journal()
+        self._events_since_compaction = 0
+
+    def _open(self) -> None:
+        if self._file is None:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) < _HEADER.size:
+                self._reset_journal()
+            self._file = open(self.path, "ab")
+        if self._names_file is None:
+            self._names_file = open(self.names_path, "ab")
+
+    def _reset_journal(self) -> None:
+        with open(self.path, "wb") as journal_file:
+            journal_file.write(_HEADER.pack(JOURNAL_MAGIC, self._generation))
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        if self._file is not None:
+            self._file.close()
+            self._file = open(self.path, "ab")
+
+    def _encode_task(self, task_name: str) -> int:
+        code = self._codes_by_name.get(task_name)
+        if code is None:
+            code = len(self._task_names)
+            self._task_names.append(task_name)
+            self._codes_by_name[task_name] = code
+            if self._names_file is not None:
+                encoded = task_name.encode("utf-8")
+                self._names_file.write(_NAME_LENGTH.pack(len(encoded)) + encoded)
+                self._names_file.flush()
+        return code
+
+    def _event_offset_ns(self, event: TaskEvent, session: Session) -> int:
+        # Pauses are recorded at the session's own instants, not whenever the listener happens to run
+        open_pause, self._open_pause = self._open_pause, None
+        if event == "pause":
+            self._open_pause = self._pause_of(session)
+            if self._open_pause is not None:
+                return self._open_pause[0]
+        elif event == "resume" and open_pause is not None:
+            pause_offset, paused_before = open_pause
+            return pause_offset + session.paused_ns - paused_before
+        return session.get_elapsed_ns()
+
+    def _pause_of(self, session: Session) -> Optional[Tuple[int, int]]:
+        pause_offset = session.get_pause_offset_ns()
+        return None if pause_offset is None else (pause_offset, session.paused_ns)
+
+    def _append(self, kind: int, task_code: int, timestamp_ns: int) -> None:
+        if self._file is None:
+            return
+        self._file.write(_RECORD.pack(kind, task_code, timestamp_ns))
+        self._file.flush()
+        self._events_since_compaction += 1
+        remaining = self._last_sync + self.fsync_interval - time.monotonic()
+        if remaining <= 0:
+            self.sync()
+        elif self._sync_timer is None:
+            # The last event of a burst is synced once the interval has passed, not at the next event
+            self._sync_timer = threading.Timer(remaining, self._sync_if_open)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _sync_if_open(self) -> None:
+        with self._lock:
+            self._sync_timer = None
+            if self._file is not None:
+                self.sync()
+
+    def _read_names(self) -> List[str]:
+        if not os.path.exists(self.names_path):
+            return []
+
+        with open(self.names_path, "rb") as names_file:
+            data = names_file.read()
+
+        task_names: List[str] = []
+        offset = 0
+        while offset + _NAME_LENGTH.size <= len(data):
+            (length,) = _NAME_LENGTH.unpack_from(data, offset)
+            if offset + _NAME_LENGTH.size + length > len(data):
+                break
+            offset += _NAME_LENGTH.size
+            task_names.append(data[offset : offset + length].decode("utf-8"))
+            offset += length
+
+        if offset < len(data):
+            with open(self.names_path, "r+b") as names_file:
+                names_file.truncate(offset)
+        return task_names
+
+    def _read_snapshot(self, finished: List[_FinishedRow]) -> Tuple[int, Optional[_RunningRow]]:
+        if not os.path.exists(self.snapshot_path):
+            return 0, None
+
+        with open(self.snapshot_path, "rb") as snapshot_file:
+            data = snapshot_file.read()
+
+        magic, generation = _HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise JournalCorruptedError(f"Invalid snapshot file: {self.snapshot_path}")
+        (row_count,) = _SNAPSHOT_COUNT.unpack_from(data, _HEADER.size)
+        rows_start = _HEADER.size + _SNAPSHOT_COUNT.size
+        rows = memoryview(data)[rows_start : rows_start + row_count * _SNAPSHOT_ROW.size]
+
+        running: Optional[_RunningRow] = None
+        for task_code, start_ns, end_ns, paused_ns, pause_start_ns in _SNAPSHOT_ROW.iter_unpack(rows):
+            if task_code >= len(self._task_names):
+                raise JournalCorruptedError(f"Unknown task code {task_code} in snapshot")
+            if end_ns == _NO_TIME:
+                running = (task_code, start_ns, paused_ns, pause_start_ns)
+            else:
+                finished.append((task_code, start_ns, end_ns, paused_ns))
+        return int(generation), running
+
+    def _replay_journal(self, finished: List[_FinishedRow], running: Optional[_RunningRow]) -> Optional[_RunningRow]:
+        if not os.path.exists(self.path):
+            return running
+
+        with open(self.path, "rb") as journal_file:
+            data = journal_file.read()
+        if len(data) < _HEADER.size:
+            return running
+
+        magic, generation = _HEADER.unpack_from(data, 0)
+        if magic != JOURNAL_MAGIC:
+            raise JournalCorruptedError(f"Invalid journal file: {self.path}")
+        if generation < self._generation:
+            self._reset_journal()
+            return running
+
+        is_running = running is not None
+        task_code, start_ns, paused_ns, pause_start_ns = running if running is not None else (0, 0, 0, _NO_TIME)
+        name_count = len(self._task_names)
+        append = finished.append
+        record_count = (len(data) - _HEADER.size) // _RECORD.size
+        records = memoryview(data)[_HEADER.size : _HEADER.size + record_count * _RECORD.size]
+        valid_records = 0
+
+        for kind, code, timestamp_ns in _RECORD.iter_unpack(records):
+            if kind == _STOP and is_running:
+                if pause_start_ns != _NO_TIME:
+                    paused_ns += timestamp_ns - pause_start_ns
+                    pause_start_ns = _NO_TIME
+                append((task_code, start_ns, timestamp_ns, paused_ns))
+                is_running = False
+            elif kind == _START and not is_running:
+                if code >= name_count:
+                    break
+                task_code, start_ns, paused_ns, pause_start_ns = code, timestamp_ns, 0, _NO_TIME
+                is_running = True
+            elif kind == _PAUSE and is_running and pause_start_ns == _NO_TIME:
+                pause_start_ns = timestamp_ns
+            elif kind == _RESUME and is_running and pause_start_ns != _NO_TIME:
+                paused_ns += timestamp_ns - pause_start_ns
+                pause_start_ns = _NO_TIME
+            else:
+                raise JournalCorruptedError(f"Unexpected journal record kind {kind} at index {valid_records}")
+            valid_records += 1
+
+        valid_size = _HEADER.size + valid_records * _RECORD.size
+        if valid_size < len(data):
+            with open(self.path, "r+b") as journal_file:
+                journal_file.truncate(valid_size)
+
+        self._events_since_compaction = valid_records
+        return (task_code, start_ns, paused_ns, pause_start_ns) if is_running else None
@@ -0,0 +1,102 @@
+import sqlite3
+from datetime import datetime
+from types import TracebackType
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from src.models.session import NANOSECONDS_PER_SECOND, Session, datetime_to_epoch_ns
+
+_SessionRow = Tuple[str, int, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    task_name TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL,
+    paused_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions (start_time);
+"""
+# A session is identified by its task and start; the index also serves the per-task queries
+_UNIQUE_INDEX = "CREATE UNIQUE INDEX idx_sessions_task_start ON sessions (task_name, start_time)"
+_HAS_UNIQUE_INDEX = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_sessions_task_start'"
+# Databases written before the unique index may hold sessions re-inserted on every restart
+_DEDUPLICATE = "DELETE FROM sessions WHERE id NOT IN (SELECT MIN(id) FROM sessions GROUP BY task_name, start_time)"
+
+_INSERT = "INSERT OR IGNORE INTO sessions (task_name, start_time, end_time, paused_ns) VALUES (?, ?, ?, ?)"
+_SELECT_BETWEEN = (
+    "SELECT task_name, start_time, end_time, paused_ns FROM sessions "
+    "WHERE start_time >= ? AND start_time < ? ORDER BY start_time"
+)
+_SELECT_TASK = "SELECT task_name, start_time, end_time, paused_ns FROM sessions WHERE task_name = ? ORDER BY start_time"
+_TOTALS_BETWEEN = (
+    "SELECT task_name, SUM(end_time - start_time - paused_ns) FROM sessions "
+    "WHERE start_time >= ? AND start_time < ? GROUP BY task_name ORDER BY MIN(start_time)"
+)
+_COUNT = "SELECT COUNT(*) FROM sessions"
+
+
+class SqliteSessionStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path, cached_statements=32)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        if self._connection.execute(_HAS_UNIQUE_INDEX).fetchone() is None:
+            with self._connection:
+                self._connection.execute("DROP INDEX IF EXISTS idx_sessions_task_name")
+                self._connection.execute(_DEDUPLICATE)
+                self._connection.execute(_UNIQUE_INDEX)
+
+    def __enter__(self) -> "SqliteSessionStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(_COUNT).fetchone()
+        return int(count)
+
+    def append(self, session: Session) -> None:
+        # Each stopped session is committed at once so a crash loses nothing already tracked
+        with self._connection:
+            self._connection.execute(_INSERT, self._to_row(session))
+
+    def extend(self, sessions: Iterable[Session]) -> None:
+        # Bulk loads share one transaction; sessions already stored are skipped, so reloads are idempotent
+        with self._connection:
+            self._connection.executemany(_INSERT, (self._to_row(session) for session in sessions))
+
+    def sessions_between(self, start: datetime, end: datetime) -> List[Session]:
+        rows = self._connection.execute(_SELECT_BETWEEN, self._range(start, end))
+        return [
+            Session.restore(task_name, start_ns, end_ns, paused_ns) for task_name, start_ns, end_ns, paused_ns in rows
+        ]
+
+    def sessions_for_task(self, task_name: str) -> List[Session]:
+        rows = self._connection.execute(_SELECT_TASK, (task_name,))
+        return [Session.restore(name, start_ns, end_ns, paused_ns) for name, start_ns, end_ns, paused_ns in rows]
+
+    def task_totals_between(self, start: datetime, end: datetime) -> Dict[str, float]:
+        rows = self._connection.execute(_TOTALS_BETWEEN, self._range(start, end))
+        return {task_name: total_ns / NANOSECONDS_PER_SECOND for task_name, total_ns in rows}
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _range(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        assert start <= end, "Range start must not be after its end"
+        return datetime_to_epoch_ns(start), datetime_to_epoch_ns(end)
+
+    def _to_row(self, session: Session) -> _SessionRow:
+        assert not session.is_running, "Only stopped sessions can be stored"
+
+        start_ns = session.get_start_epoch_ns()
+        return session.task_name, start_ns, start_ns + session.get_elapsed_ns(), session.get_paused_ns()
@@ -0,0 +1,212 @@
+import bisect
+import sys
+import threading
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+# One frame at 60 Hz; a handler running longer than this is a visible stutter
+DEFAULT_FRAME_BUDGET_MS = 16.0
+# Upper bounds of the histogram buckets; the last bucket holds everything slower
+BUCKET_BOUNDS_MS = (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0, 256.0, 512.0, 1024.0)
+
+_active: Optional["CallbackProfiler"] = None
+
+
+def callback_name(func: Any) -> str:
+    name = getattr(func, "__qualname__", None)
+    if name is None:
+        return str(type(func).__qualname__)
+    # Tk's after() wraps the callback in a closure that only borrows its __name__
+    if name.endswith("<locals>.callit") and func.__name__ != "callit":
+        for cell in func.__closure__ or ():
+            contents = cell.cell_contents
+            if callable(contents) and getattr(contents, "__name__", None) == func.__name__:
+                return callback_name(contents)
+    return str(name)
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    # Times a section that runs inside a callback, such as building a whole screen; free when profiling is off
+    if _active is None:
+        yield
+        return
+    with _active.measure(name):
+        yield
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def add(self, elapsed_ms: float, budget_ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if elapsed_ms > budget_ms:
+            self.slow += 1
+
+    def percentile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the percentile, never above the slowest call seen
+        assert 0.0 <= fraction <= 1.0, "Percentile must be a fraction"
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(fraction * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKET_BOUNDS_MS[index], self.max_ms) if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+
+class CallbackProfiler:
+    def __init__(self, log: Optional[TextIO] = None, budget_ms: float = DEFAULT_FRAME_BUDGET_MS) -> None:
+        assert budget_ms > 0, "Frame budget must be positive"
+        self.log = log if log is not None else sys.stderr
+        self.budget_ms = budget_ms
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.slow_calls = 0
+
+        self._owns_log = False
+        self._depth = 0
+        self._call_id = 0
+        self._thread_id = threading.get_ident()
+        self._condition = threading.Condition()
+        # (call id, start) of the outermost callback blocking the event loop, and its stack once over budget
+        self._in_flight: Optional[Tuple[int, float]] = None
+        self._samples: Dict[int, List[str]] = {}
+        self._closed = False
+        self._original_wrapper: Optional[type] = None
+        self._watchdog = threading.Thread(target=self._watch, name="ui-callback-watchdog", daemon=True)
+        self._watchdog.start()
+
+    @classmethod
+    def to_file(cls, path: str, budget_ms: float = DEFAULT_FRAME_BUDGET_MS) -> "CallbackProfiler":
+        profiler = cls(open(path, "a", encoding="utf-8", buffering=1), budget_ms)
+        profiler._owns_log = True
+        return profiler
+
+    def install(self) -> None:
+        # Must run before widgets are created: Tk wraps every command, binding and after callback
+        # in tkinter.CallWrapper when it is registered
+        global _active
+        assert _active is None, "Another callback profiler is already installed"
+        profiler = self
+        original: Any = tk.CallWrapper
+
+        class ProfiledCallWrapper(original):  # type: ignore[misc]
+            def __call__(self, *args: Any) -> Any:
+                with profiler.measure(callback_name(self.func)):
+                    return super().__call__(*args)
+
+        self._original_wrapper = original
+        setattr(tk, "CallWrapper", ProfiledCallWrapper)
+        _active = self
+
+    def uninstall(self) -> None:
+        global _active
+        if self._original_wrapper is not None:
+            setattr(tk, "CallWrapper", self._original_wrapper)
+            self._original_wrapper = None
+        if _active is self:
+            _active = None
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        outermost = self._depth == 0
+        self._depth += 1
+        start = time.perf_counter()
+        call_id = 0
+        if outermost:
+            with self._condition:
+                self._call_id += 1
+                call_id = self._call_id
+                self._in_flight = (call_id, start)
+                self._condition.notify_all()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self._depth -= 1
+            stack: Optional[List[str]] = None
+            if outermost:
+                with self._condition:
+                    self._in_flight = None
+                    stack = self._samples.pop(call_id, None)
+                    self._condition.notify_all()
+            self._record(name, elapsed_ms, stack, outermost)
+
+    def report(self) -> str:
+        lines = [
+            f"UI callback latency in ms (budget {self.budget_ms:g} ms, {self.slow_calls} slow calls)",
+            f"{'callback':<48} {'calls':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'slow':>6}",
+        ]
+        for name, histogram in sorted(self.histograms.items(), key=lambda item: -item[1].total_ms):
+            lines.append(
+                f"{name:<48} {histogram.count:>7} {histogram.mean_ms:>8.1f} {histogram.percentile(0.5):>8.1f} "
+                f"{histogram.percentile(0.95):>8.1f} {histogram.percentile(0.99):>8.1f} "
+                f"{histogram.max_ms:>8.1f} {histogram.slow:>6}"
+            )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        self.uninstall()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._watchdog.join(1.0)
+        print(self.report(), file=self.log)
+        if self._owns_log:
+            self.log.close()
+
+    def _record(self, name: str, elapsed_ms: float, stack: Optional[List[str]], outermost: bool) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.add(elapsed_ms, self.budget_ms)
+        if elapsed_ms <= self.budget_ms:
+            return
+
+        # Sections inside a slow callback are logged too, but counted once through the callback itself
+        if outermost:
+            self.slow_calls += 1
+        print(f"Slow UI callback {name}: {elapsed_ms:.1f} ms (budget {self.budget_ms:g} ms)", file=self.log)
+        if stack is not None:
+            print("Stack sampled once over budget:", file=self.log)
+            self.log.write("".join(stack))
+
+    def _watch(self) -> None:
+        # Samples the UI thread's stack while a callback is still running past the budget,
+        # which shows where it is stuck rather than only that it was slow
+        import traceback
+
+        sampled = 0
+        with self._condition:
+            while True:
+                self._condition.wait_for(
+                    lambda: self._closed or (self._in_flight is not None and self._in_flight[0] != sampled)
+                )
+                if self._closed or self._in_flight is None:
+                    return
+                call_id, start = self._in_flight
+                remaining = start + self.budget_ms / 1000.0 - time.perf_counter()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                frame = sys._current_frames().get(self._thread_id)
+                if frame is not None:
+                    self._samples[call_id] = traceback.format_stack(frame)
+                sampled = call_id
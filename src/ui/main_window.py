@@ -1,23 +1,135 @@
+import os
+import threading
 import tkinter as tk
+from datetime import datetime, timedelta
 from tkinter import messagebox
-from typing import Any
+from typing import Any, Optional, TYPE_CHECKING
 
-from src.models.task_tracker import TaskTracker
-from src.ui.summary_screen import SummaryScreen
+from src.models.task_tracker import TaskEvent, TaskTracker
+from src.services.incremental_aggregator import IncrementalAggregator
+from src.services.session_index import SessionIndex
+from src.ui import callback_profiler
+from src.ui.tick_scheduler import TickScheduler
+from src.ui.virtual_list import VirtualListView
+
+if TYPE_CHECKING:
+    from src.models.session import Session
+    from src.models.session_store import SessionColumns
+    from src.services.background_categorizer import BackgroundCategorizer
+    from src.services.category_cache import TaskCategorizer
+    from src.services.request_scheduler import RequestScheduler
+    from src.storage.journal import SessionJournal
+
+# Finished sessions older than this leave the tracker for the archive at startup
+_ARCHIVE_AFTER = timedelta(days=30)
 
 
 class MainWindow:
     def __init__(self) -> None:
+        # Opt-in: logs callbacks that block the event loop past a frame and dumps latency stats on exit
+        self.profiler: Optional[callback_profiler.CallbackProfiler] = None
+        profile_path = os.getenv("TASK_TRACKER_UI_PROFILE")
+        if profile_path:
+            self.profiler = callback_profiler.CallbackProfiler.to_file(profile_path)
+            self.profiler.install()
+
         self.root = tk.Tk()
         self.root.title("Task Tracker")
         self.root.minsize(600, 400)
 
-        self.task_tracker = TaskTracker()
+        self.aggregator = IncrementalAggregator()
+        self._scheduler: Optional["RequestScheduler"] = None
+        self._scheduler_lock = threading.Lock()
+        self.journal: Optional["SessionJournal"] = None
+        journal_path = os.getenv("TASK_TRACKER_JOURNAL")
+        if journal_path:
+            from src.storage import journal
+
+            self.journal = journal.SessionJournal(journal_path)
+            try:
+                self.task_tracker = self.journal.load()
+            except journal.JournalCorruptedError as e:
+                # A damaged journal must not keep the tracker from starting; its files are kept for recovery
+                moved = self.journal.quarantine()
+                messagebox.showwarning(
+                    "ジャーナル",
+                    f"記録ファイルを読み込めなかったため、新しい記録を開始します: {e}\n"
+                    f"元のファイルは次の場所に移動しました:\n" + "\n".join(moved),
+                )
+                self.task_tracker = self.journal.load()
+            self.aggregator.attach(self.task_tracker)
+            self.journal.attach(self.task_tracker)
+        else:
+            self.task_tracker = TaskTracker()
+            self.task_tracker.add_listener(self.aggregator.on_task_event)
+
+        archive_path = os.getenv("TASK_TRACKER_ARCHIVE")
+        if archive_path:
+            self._seal_archive(archive_path)
+
+        # Interval queries for the summary; attached before any pause so pause layouts are kept exactly
+        self.session_index = SessionIndex()
+        self.session_index.attach(self.task_tracker)
+
+        # Task names are categorized while tracking so the summary opens with categories resolved
+        self.background: Optional["BackgroundCategorizer"] = None
+        if os.getenv("GEMINI_API_KEY"):
+            from src.services import background_categorizer
+
+            self.background = background_categorizer.BackgroundCategorizer(self._create_background_chain)
+            self.background.attach(self.task_tracker)
+
+        self._live_row: Optional[int] = None
+        self.task_tracker.add_listener(self._on_task_event)
 
         self._create_widgets()
         self._setup_bindings()
+        self._restore_button_states()
         self._update_task_list()
 
+        # Time-dependent displays share one wall-clock aligned tick that stops while nothing changes
+        self.ticks = TickScheduler(self.root)
+        self.ticks.register(self._update_task_list, self._task_list_is_live)
+
+    def _seal_archive(self, path: str) -> None:
+        try:
+            from src.storage import archive
+        except ImportError:
+            # NumPy is optional; without it every session stays in the tracker
+            return
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            # Listeners drop the sealed sessions and the journal compacts them away
+            archive.seal_sessions(self.task_tracker, path, before=midnight - _ARCHIVE_AFTER)
+        except archive.ArchiveFormatError as e:
+            messagebox.showwarning("アーカイブ", f"アーカイブに書き込めなかったため、古い記録を保持します: {e}")
+
+    @property
+    def scheduler(self) -> "RequestScheduler":
+        # Created on first use so startup does not pay for the executor and its threads;
+        # the background categorizer may ask for it from its own thread
+        with self._scheduler_lock:
+            if self._scheduler is None:
+                from src.services.request_scheduler import (
+                    DEFAULT_REQUESTS_PER_MINUTE,
+                    DEFAULT_TOKENS_PER_MINUTE,
+                    RateLimiter,
+                    RequestScheduler,
+                )
+
+                self._scheduler = RequestScheduler(RateLimiter(DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE))
+            return self._scheduler
+
+    def _create_background_chain(self) -> "TaskCategorizer":
+        # Runs on the background worker, so the Gemini SDK import stays off the UI thread
+        from src.services.background_categorizer import BACKGROUND_PRIORITY
+        from src.services.categorizer_chain import CategorizerChain
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        assert api_key, "Background categorization needs an API key"
+        # Failed batches are left for the summary to categorize rather than remembered as fallback labels
+        return CategorizerChain(api_key, scheduler=self.scheduler, priority=BACKGROUND_PRIORITY, fallback=False)
+
     def _create_widgets(self) -> None:
         input_frame = tk.Frame(self.root, padx=10, pady=10)
         input_frame.pack(side=tk.TOP, fill=tk.X)
@@ -34,16 +146,13 @@ class MainWindow:
         self.stop_button = tk.Button(input_frame, text="⏹ 停止", state="disabled", command=self._on_stop_click)
         self.stop_button.pack(side=tk.LEFT, padx=(5, 0))
 
-        # Task list with scrollbar
+        # Task list with scrollbar; only the visible rows exist as Listbox items
         list_frame = tk.Frame(self.root, padx=10, pady=5)
         list_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
-        scrollbar = tk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.task_list = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, height=10)
-        self.task_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.task_list.yview)
+        self.task_view = VirtualListView(list_frame, self._format_task_row, height=10, follow_tail=True)
+        self.task_view.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.task_list = self.task_view.listbox
 
     def _setup_bindings(self) -> None:
         self.task_input.bind("<KeyRelease>", self._on_input_change)
@@ -51,6 +160,13 @@ class MainWindow:
             "<Return>", lambda e: self._on_start_click() if self.start_button["state"] == "normal" else None
         )
 
+    def _restore_button_states(self) -> None:
+        current_session = self.task_tracker.current_session
+        if current_session is None or not current_session.is_running:
+            return
+        self.pause_button.config(state="normal", text="▶ 再開" if current_session.is_paused else "⏸ 一時停止")
+        self.stop_button.config(state="normal")
+
     def _on_input_change(self, event: Any) -> None:
         if self.task_input.get().strip():
             self.start_button.config(state="normal")
@@ -66,7 +182,7 @@ class MainWindow:
                 self.start_button.config(state="disabled")
                 self.pause_button.config(state="normal")
                 self.stop_button.config(state="normal")
-                self._update_task_list()
+                self._refresh_task_list()
             except Exception as e:
                 messagebox.showerror("エラー", f"タスクの開始に失敗しました: {str(e)}")
 
@@ -78,6 +194,8 @@ class MainWindow:
             else:
                 self.task_tracker.pause_current()
                 self.pause_button.config(text="▶ 再開")
+            # Shows the new status icon now and starts or stops the tick
+            self._refresh_task_list()
         except Exception as e:
             messagebox.showerror("エラー", f"一時停止/再開の操作に失敗しました: {str(e)}")
 
@@ -87,39 +205,88 @@ class MainWindow:
                 self.task_tracker.stop_all()
                 self.pause_button.config(state="disabled")
                 self.stop_button.config(state="disabled")
-                self._update_task_list()
+                self._refresh_task_list()
 
                 # Show summary screen
                 sessions = self.task_tracker.get_all_sessions()
                 if sessions:
-                    SummaryScreen(sessions)
+                    from src.ui.summary_screen import SummaryScreen
+
+                    with callback_profiler.measure("SummaryScreen.__init__"):
+                        SummaryScreen(
+                            sessions,
+                            aggregator=self.aggregator,
+                            scheduler=self.scheduler,
+                            background=self.background,
+                            columns=self._session_columns(),
+                            index=self.session_index,
+                        )
         except Exception as e:
             messagebox.showerror("エラー", f"セッションの終了に失敗しました: {str(e)}")
 
+    def _session_columns(self) -> Optional["SessionColumns"]:
+        # NumPy is optional; without it the summary reads the session objects
+        try:
+            return self.task_tracker.get_session_columns()
+        except ImportError:
+            return None
+
+    def _on_task_event(self, event: TaskEvent, session: "Session") -> None:
+        if event == "remove":
+            # Row indexes shift when sessions leave the list, so the visible slice is rebuilt
+            self._live_row = None
+            self.task_view.window.set_total(len(self.task_tracker.sessions))
+            self.task_view.render()
+            self._update_task_list()
+
     def _update_task_list(self) -> None:
-        self.task_list.delete(0, tk.END)
-
-        sessions = self.task_tracker.get_all_sessions()
-        for i, session in enumerate(sessions):
-            duration = session.get_duration()
-            hours = int(duration // 3600)
-            minutes = int((duration % 3600) // 60)
-            seconds = int(duration % 60)
-            time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-            status = ""
-            if session.is_running:
-                if session.is_paused:
-                    status = " ⏸"
-                else:
-                    status = " ▶"
-
-            task_str = f"{session.task_name} - {time_str}{status}"
-            self.task_list.insert(tk.END, task_str)
-
-        # Schedule next update if there's a running session
-        if self.task_tracker.current_session and self.task_tracker.current_session.is_running:
-            self.root.after(1000, self._update_task_list)
+        # Only the previously running row and rows for new sessions can change, so each tick is O(1)
+        sessions = self.task_tracker.sessions
+        if self._live_row is not None:
+            self.task_view.refresh_row(self._live_row)
+        self.task_view.set_row_count(len(sessions))
+
+        current_session = self.task_tracker.current_session
+        self._live_row = len(sessions) - 1 if current_session is not None and current_session.is_running else None
+
+    def _refresh_task_list(self) -> None:
+        self._update_task_list()
+        self.ticks.wake()
+
+    def _task_list_is_live(self) -> bool:
+        # A paused session's time is frozen, so the list only needs ticks while one is counting
+        current_session = self.task_tracker.current_session
+        return current_session is not None and current_session.is_running and not current_session.is_paused
+
+    def _format_task_row(self, index: int) -> str:
+        return self._format_row(self.task_tracker.sessions[index])
+
+    def _format_row(self, session: "Session") -> str:
+        duration = session.get_duration()
+        hours = int(duration // 3600)
+        minutes = int((duration % 3600) // 60)
+        seconds = int(duration % 60)
+        time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+        status = ""
+        if session.is_running:
+            if session.is_paused:
+                status = " ⏸"
+            else:
+                status = " ▶"
+
+        return f"{session.task_name} - {time_str}{status}"
 
     def run(self) -> None:
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.ticks.close()
+            if self.background is not None:
+                self.background.close(timeout=1.0)
+            if self._scheduler is not None:
+                self._scheduler.close()
+            if self.journal is not None:
+                self.journal.close()
+            if self.profiler is not None:
+                self.profiler.close()
@@ -1,34 +1,76 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 import os
-from typing import List, TYPE_CHECKING
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.models.session import Session
+    from src.models.session_store import SessionColumns
+    from src.services.background_categorizer import BackgroundCategorizer
+    from src.services.incremental_aggregator import IncrementalAggregator
+    from src.services.request_scheduler import RequestScheduler
+    from src.services.session_index import SessionIndex
+
+_POLL_INTERVAL_MS = 50
+# Task rows inserted per category at a time; summaries up to this size open fully expanded
+_CHILD_PAGE_SIZE = 200
 
 
 class SummaryScreen:
-    def __init__(self, sessions: List["Session"]) -> None:
+    def __init__(
+        self,
+        sessions: List["Session"],
+        aggregator: Optional["IncrementalAggregator"] = None,
+        scheduler: Optional["RequestScheduler"] = None,
+        background: Optional["BackgroundCategorizer"] = None,
+        columns: Optional["SessionColumns"] = None,
+        index: Optional["SessionIndex"] = None,
+    ) -> None:
         self.sessions = sessions
+        self.columns = columns
+        self.index = index
+        self.aggregator = aggregator
+        self.scheduler = scheduler
+        self.background = background
         self.root = tk.Toplevel()
         self.root.title("Task Summary")
         self.root.minsize(600, 400)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        self._results: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._poll_id: Optional[str] = None
+        self._loading_item: Optional[str] = None
+        self._task_to_category: Dict[str, str] = {}
+        self._category_items: Dict[str, str] = {}
+        self._aggregated: List[Dict[str, Any]] = []
+        # Per category item: all task rows, how many are inserted, and the trailing "more" row if any
+        self._category_tasks: Dict[str, List[Dict[str, Any]]] = {}
+        self._loaded_children: Dict[str, int] = {}
+        self._more_items: Dict[str, str] = {}
 
         self._create_widgets()
         self._display_summary()
         self._categorize_tasks()
 
     def _create_widgets(self) -> None:
-        # Summary text area with scrollbar
+        from src.ui.virtual_list import VirtualListView
+        from src.utils.markdown import SessionMarkdownLines
+
+        # Today's total from the interval index, so sessions crossing midnight only count their part of today
+        if self.index is not None:
+            self.today_label = tk.Label(self.root, text=self._today_text(), anchor="w", padx=10)
+            self.today_label.pack(side=tk.TOP, fill=tk.X)
+
+        # Summary lines with scrollbar; only the visible lines are built and inserted
         text_frame = tk.Frame(self.root, padx=10, pady=10)
         text_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
-        scrollbar = tk.Scrollbar(text_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.summary_text = tk.Text(text_frame, wrap=tk.WORD, yscrollcommand=scrollbar.set, height=10)
-        self.summary_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.summary_text.yview)
+        self._summary_lines = SessionMarkdownLines(self.sessions)
+        self.summary_view = VirtualListView(text_frame, self._summary_lines.line, height=10)
+        self.summary_view.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
         # Category table
         category_frame = tk.LabelFrame(self.root, text="カテゴリ別集計", padx=10, pady=10)
@@ -53,6 +95,8 @@ class SummaryScreen:
         self.category_tree.configure(yscrollcommand=tree_scrollbar.set)
 
         self.category_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.category_tree.bind("<<TreeviewOpen>>", self._on_tree_open)
+        self.category_tree.bind("<<TreeviewSelect>>", self._on_tree_select)
         tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         # Button frame
@@ -62,44 +106,52 @@ class SummaryScreen:
         self.copy_button = tk.Button(button_frame, text="Copy Markdown", command=self._on_copy_click)
         self.copy_button.pack(side=tk.LEFT)
 
-        self.close_button = tk.Button(button_frame, text="閉じる", command=self.root.destroy)
+        self.close_button = tk.Button(button_frame, text="閉じる", command=self._on_close)
         self.close_button.pack(side=tk.RIGHT)
 
-    def _display_summary(self) -> None:
-        from src.utils.markdown import format_sessions_to_markdown
+    def _today_text(self, now: Optional[datetime] = None) -> str:
+        assert self.index is not None, "Summary has no session index"
+
+        now = now if now is not None else datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        total_seconds = sum(s.duration for s in self.index.overlapping(midnight, now))
+        hours = int(total_seconds // 3600)
+        minutes = int((total_seconds % 3600) // 60)
+        seconds = int(total_seconds % 60)
+        return f"本日の作業時間: {hours}:{minutes:02d}:{seconds:02d}"
 
-        markdown_text = format_sessions_to_markdown(self.sessions)
-        self.summary_text.insert(tk.END, markdown_text)
-        self.summary_text.config(state="disabled")
+    def _display_summary(self) -> None:
+        self.summary_view.set_row_count(len(self._summary_lines))
 
     def _on_copy_click(self) -> None:
         from src.utils.clipboard import copy_to_clipboard
+        from src.utils.markdown import format_sessions_to_markdown
 
-        markdown_text = self.summary_text.get("1.0", tk.END).strip()
+        markdown_text = format_sessions_to_markdown(self.sessions).strip()
 
-        # Add category summary to markdown
+        # Add category summary to markdown; built from the aggregate since collapsed categories have no rows
         markdown_text += "\n\n## カテゴリ別集計\n\n"
 
-        for item in self.category_tree.get_children():
-            category = self.category_tree.item(item)
-            category_name = category["text"]
-            values = category["values"]
-
-            markdown_text += f"### {category_name}\n"
-            markdown_text += f"- {values[0]}\n"
-            markdown_text += f"- 合計時間: {values[1]}\n\n"
+        for category in self._aggregated:
+            markdown_text += f"### {category['name']}\n"
+            markdown_text += f"- {len(category['tasks'])}個のタスク\n"
+            markdown_text += f"- 合計時間: {category['total_time']}\n\n"
 
             # Add task details
-            for child in self.category_tree.get_children(item):
-                task = self.category_tree.item(child)
-                task_values = task["values"]
-                markdown_text += f"  - {task_values[0]}: {task_values[1]}\n"
+            for task in category["tasks"]:
+                markdown_text += f"  - {task['name']}: {task['total_time']}\n"
 
             markdown_text += "\n"
 
         copy_to_clipboard(markdown_text)
         messagebox.showinfo("コピー完了", "Markdownをクリップボードにコピーしました。")
 
+    def _on_close(self) -> None:
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.root.destroy()
+
     def _categorize_tasks(self) -> None:
         if not self.sessions:
             return
@@ -110,37 +162,168 @@ class SummaryScreen:
             self.category_tree.insert("", "end", text="エラー", values=("APIキーが設定されていません", ""))
             return
 
+        # Get unique task names; spelling variants of one task are sent only once
+        from src.utils.task_names import TaskNameIndex
+
+        # Column views already hold each distinct name once, so large histories are not scanned
+        names = self.columns.task_names if self.columns is not None else [s.task_name for s in self.sessions]
+        task_names = TaskNameIndex().canonicalize(names)
+
+        # Tasks already categorized in the background are shown without waiting for the API
+        if self.background is not None:
+            resolved, task_names = self.background.partition(task_names)
+            if resolved:
+                self._apply_categories({"categories": [{"name": n, "tasks": t} for n, t in resolved.items()]})
+            if not task_names:
+                return
+
+        # Show loading state while the worker thread waits for the API
+        self._loading_item = self.category_tree.insert(
+            "", "end", text="分類中...", values=(f"{len(task_names)}個のタスク", "")
+        )
+        worker = threading.Thread(target=self._run_categorization, args=(api_key, task_names), daemon=True)
+        worker.start()
+        self._poll_id = self.root.after(_POLL_INTERVAL_MS, self._poll_results)
+
+    def _run_categorization(self, api_key: str, task_names: List[str]) -> None:
+        # Runs on the worker thread: never touch Tk widgets here
         try:
-            from src.services.gemini_client import GeminiClient
-            from src.services.category_aggregator import CategoryAggregator
+            from src.services.categorizer_chain import CategorizerChain
 
-            # Get unique task names
-            task_names = list(set(session.task_name for session in self.sessions))
+            # Categories are streamed to the tree as soon as the model closes each one
+            chain = CategorizerChain(api_key, scheduler=self.scheduler, on_category=self._post_category)
+            self._results.put(("categories", chain.categorize_tasks(task_names)))
+        except Exception as e:
+            self._results.put(("error", str(e)))
+        finally:
+            self._results.put(("done", None))
+
+    def _post_category(self, category: Dict[str, Any]) -> None:
+        self._results.put(("categories", {"categories": [category]}))
+
+    def _poll_results(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "categories":
+                self._apply_categories(payload)
+            elif kind == "error":
+                self.category_tree.insert("", "end", text="エラー", values=(payload, ""))
+            else:
+                self._finish_loading()
+                return
+
+        self._poll_id = self.root.after(_POLL_INTERVAL_MS, self._poll_results)
+
+    def _finish_loading(self) -> None:
+        if self._loading_item is not None:
+            self.category_tree.delete(self._loading_item)
+            self._loading_item = None
+
+    def _apply_categories(self, categories: Dict[str, Any]) -> None:
+        try:
+            from src.services.category_aggregator import CategoryAggregator
 
-            # Categorize tasks
-            client = GeminiClient(api_key=api_key)
-            categories = client.categorize_tasks(task_names)
+            # Merge with categories received so far
+            for category in categories["categories"]:
+                for task in category["tasks"]:
+                    self._task_to_category[task] = category["name"]
+            category_tasks: Dict[str, List[str]] = {}
+            for task, category_name in self._task_to_category.items():
+                category_tasks.setdefault(category_name, []).append(task)
+            merged = {"categories": [{"name": name, "tasks": tasks} for name, tasks in category_tasks.items()]}
 
             # Aggregate by category
-            aggregator = CategoryAggregator()
-            aggregated_data = aggregator.aggregate(self.sessions, categories)
-
-            # Display in tree
-            for category in aggregated_data:
-                # Insert category
-                category_item = self.category_tree.insert(
-                    "",
-                    "end",
-                    text=category["name"],
-                    values=(f"{len(category['tasks'])}個のタスク", category["total_time"]),
-                )
-
-                # Insert tasks under category
-                for task in category["tasks"]:
-                    self.category_tree.insert(category_item, "end", text="", values=(task["name"], task["total_time"]))
+            if self.aggregator is not None:
+                self.aggregator.set_categories(merged)
+                aggregated_data = self.aggregator.summarize()
+            elif self.columns is not None:
+                aggregated_data = CategoryAggregator().aggregate_store(self.columns, merged)
+            else:
+                aggregated_data = CategoryAggregator().aggregate(self.sessions, merged)
 
-                # Expand category by default
-                self.category_tree.item(category_item, open=True)
+            self._render_categories(aggregated_data)
 
         except Exception as e:
             self.category_tree.insert("", "end", text="エラー", values=(str(e), ""))
+
+    def _render_categories(self, aggregated_data: List[Dict[str, Any]]) -> None:
+        self._aggregated = aggregated_data
+
+        # Drop categories that lost all of their tasks to a later result
+        category_names = {category["name"] for category in aggregated_data}
+        for category_name in list(self._category_items.keys() - category_names):
+            removed_item = self._category_items.pop(category_name)
+            self._forget_children(removed_item)
+            self.category_tree.delete(removed_item)
+
+        # Small summaries open fully expanded; large ones load task rows when a category is opened
+        expand = sum(len(category["tasks"]) for category in aggregated_data) <= _CHILD_PAGE_SIZE
+        for category in aggregated_data:
+            values = (f"{len(category['tasks'])}個のタスク", category["total_time"])
+            category_item = self._category_items.get(category["name"])
+            if category_item is None:
+                # Insert category above the loading row
+                position = (
+                    self.category_tree.index(self._loading_item)
+                    if self._loading_item is not None
+                    else len(self.category_tree.get_children())
+                )
+                category_item = self.category_tree.insert(
+                    "", position, text=category["name"], values=values, open=expand
+                )
+                self._category_items[category["name"]] = category_item
+            else:
+                self.category_tree.item(category_item, values=values)
+                self._forget_children(category_item)
+                self.category_tree.delete(*self.category_tree.get_children(category_item))
+
+            self._category_tasks[category_item] = category["tasks"]
+            self._loaded_children[category_item] = 0
+            if self.category_tree.tk.getboolean(self.category_tree.item(category_item, "open")):
+                self._load_children(category_item)
+            elif category["tasks"]:
+                # Placeholder row so the category can be expanded
+                self._more_items[category_item] = self.category_tree.insert(
+                    category_item, "end", text="", values=("読み込み中...", "")
+                )
+
+    def _load_children(self, category_item: str) -> None:
+        more_item = self._more_items.pop(category_item, None)
+        if more_item is not None:
+            self.category_tree.delete(more_item)
+
+        tasks = self._category_tasks[category_item]
+        loaded = self._loaded_children[category_item]
+        for task in tasks[loaded : loaded + _CHILD_PAGE_SIZE]:
+            self.category_tree.insert(category_item, "end", text="", values=(task["name"], task["total_time"]))
+        loaded = min(len(tasks), loaded + _CHILD_PAGE_SIZE)
+        self._loaded_children[category_item] = loaded
+
+        if loaded < len(tasks):
+            self._more_items[category_item] = self.category_tree.insert(
+                category_item, "end", text="", values=(f"さらに表示 (残り{len(tasks) - loaded}件)", "")
+            )
+
+    def _forget_children(self, category_item: str) -> None:
+        self._more_items.pop(category_item, None)
+        self._category_tasks.pop(category_item, None)
+        self._loaded_children.pop(category_item, None)
+
+    def _on_tree_open(self, event: Any) -> None:
+        # Fired for the focus item just before it opens; its first page of task rows is inserted then
+        category_item = self.category_tree.focus()
+        if self._loaded_children.get(category_item) == 0:
+            self._load_children(category_item)
+
+    def _on_tree_select(self, event: Any) -> None:
+        # Selecting a "more" row inserts the next page
+        more_rows = {more_item: category_item for category_item, more_item in self._more_items.items()}
+        for item in self.category_tree.selection():
+            category_item = more_rows.get(item)
+            if category_item is not None and self._loaded_children[category_item] > 0:
+                self._load_children(category_item)
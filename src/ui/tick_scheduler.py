@@ -0,0 +1,84 @@
+import time
+import tkinter as tk
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.ui.callback_profiler import callback_name, measure
+
+MILLISECONDS_PER_SECOND = 1000
+# A timer firing this close before a boundary waits for the following one instead of ticking twice
+_EARLY_SLACK_MS = 5
+
+TickCallback = Callable[[], None]
+TickCondition = Callable[[], bool]
+
+
+def delay_to_next_boundary(now: float, interval_ms: int) -> int:
+    # Milliseconds until the next multiple of the interval on the wall clock, so ticks never drift
+    assert interval_ms > 0, "Tick interval must be positive"
+    remainder = (now * MILLISECONDS_PER_SECOND) % interval_ms
+    delay = int(interval_ms - remainder) + 1
+    if delay <= _EARLY_SLACK_MS:
+        delay += interval_ms
+    return delay
+
+
+class TickScheduler:
+    def __init__(
+        self, root: tk.Tk, interval_ms: int = MILLISECONDS_PER_SECOND, clock: Callable[[], float] = time.time
+    ) -> None:
+        assert interval_ms > 0, "Tick interval must be positive"
+        self.root = root
+        self.interval_ms = interval_ms
+        self._clock = clock
+        self._subscribers: Dict[int, Tuple[TickCallback, TickCondition]] = {}
+        self._next_handle = 0
+        self._after_id: Optional[str] = None
+        self._iconified = False
+        self.ticks = 0
+
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+
+    def register(self, callback: TickCallback, is_active: TickCondition = lambda: True) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        self._subscribers[handle] = (callback, is_active)
+        self.wake()
+        return handle
+
+    def unregister(self, handle: int) -> None:
+        self._subscribers.pop(handle, None)
+        self.wake()
+
+    def wake(self) -> None:
+        # Call after anything that may change whether a display is live; one timer is pending at most
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if not self._iconified and any(is_active() for _, is_active in self._subscribers.values()):
+            self._after_id = self.root.after(delay_to_next_boundary(self._clock(), self.interval_ms), self._tick)
+
+    def close(self) -> None:
+        self._subscribers.clear()
+        self.wake()
+
+    def _tick(self) -> None:
+        self._after_id = None
+        self.ticks += 1
+        for callback, is_active in list(self._subscribers.values()):
+            if is_active():
+                # One after() callback serves every display, so each is timed on its own
+                with measure(callback_name(callback)):
+                    callback()
+        self.wake()
+
+    def _on_unmap(self, event: Any) -> None:
+        # Nothing on screen changes while the window is minimized
+        if event.widget is self.root:
+            self._iconified = True
+            self.wake()
+
+    def _on_map(self, event: Any) -> None:
+        if event.widget is self.root and self._iconified:
+            self._iconified = False
+            self._tick()
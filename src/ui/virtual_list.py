@@ -0,0 +1,134 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Any, Callable, Tuple
+
+
+class RowWindow:
+    def __init__(self, visible: int = 10, follow_tail: bool = False) -> None:
+        assert visible > 0, "At least one row must be visible"
+        self.visible = visible
+        self.follow_tail = follow_tail
+        self.top = 0
+        self.total = 0
+
+    @property
+    def bottom(self) -> int:
+        return min(self.total, self.top + self.visible)
+
+    @property
+    def at_end(self) -> bool:
+        return self.top + self.visible >= self.total
+
+    def rows(self) -> range:
+        return range(self.top, self.bottom)
+
+    def contains(self, index: int) -> bool:
+        return self.top <= index < self.bottom
+
+    def fractions(self) -> Tuple[float, float]:
+        if self.total == 0:
+            return 0.0, 1.0
+        return self.top / self.total, self.bottom / self.total
+
+    def set_total(self, total: int) -> None:
+        assert total >= 0, "Row count cannot be negative"
+        # A view that was showing the last row keeps following new rows
+        follow = self.follow_tail and self.at_end
+        self.total = total
+        if follow:
+            self.top = max(0, total - self.visible)
+        else:
+            self._clamp()
+
+    def set_visible(self, visible: int) -> None:
+        self.visible = max(1, visible)
+        self._clamp()
+
+    def scroll_to(self, fraction: float) -> None:
+        self.top = int(fraction * self.total)
+        self._clamp()
+
+    def scroll_by(self, rows: int) -> None:
+        self.top += rows
+        self._clamp()
+
+    def _clamp(self) -> None:
+        self.top = max(0, min(self.top, self.total - self.visible))
+
+
+class VirtualListView:
+    def __init__(
+        self, parent: tk.Misc, row_text: Callable[[int], str], height: int = 10, follow_tail: bool = False
+    ) -> None:
+        self.row_text = row_text
+        self.window = RowWindow(height, follow_tail)
+
+        self.frame = tk.Frame(parent)
+        self.scrollbar = tk.Scrollbar(self.frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox = tk.Listbox(self.frame, height=height)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._line_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        self.listbox.bind("<Configure>", self._on_configure)
+        self.listbox.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.listbox.bind("<Button-4>", lambda event: self._scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self._scroll(3))
+        self._update_scrollbar()
+
+    @property
+    def row_count(self) -> int:
+        return self.window.total
+
+    def pack(self, **options: Any) -> None:
+        self.frame.pack(**options)
+
+    def set_row_count(self, total: int) -> None:
+        if total != self.window.total:
+            self.window.set_total(total)
+            self.render()
+
+    def refresh_row(self, index: int) -> None:
+        if not self.window.contains(index):
+            return
+        text = self.row_text(index)
+        position = index - self.window.top
+        if self.listbox.get(position) != text:
+            self.listbox.delete(position)
+            self.listbox.insert(position, text)
+
+    def render(self) -> None:
+        # Only the visible slice exists as Listbox items
+        self.listbox.delete(0, tk.END)
+        texts = [self.row_text(index) for index in self.window.rows()]
+        if texts:
+            self.listbox.insert(0, *texts)
+        self.listbox.yview_moveto(0)
+        self._update_scrollbar()
+
+    def _scroll(self, rows: int) -> None:
+        top = self.window.top
+        self.window.scroll_by(rows)
+        if self.window.top != top:
+            self.render()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            top = self.window.top
+            self.window.scroll_to(float(amount))
+            if self.window.top != top:
+                self.render()
+        else:
+            self._scroll(int(amount) * (self.window.visible if unit == "pages" else 1))
+
+    def _on_configure(self, event: Any) -> None:
+        visible = max(1, event.height // self._line_height)
+        if visible != self.window.visible:
+            self.window.set_visible(visible)
+            self.render()
+
+    def _on_mouse_wheel(self, event: Any) -> None:
+        self._scroll(-3 if event.delta > 0 else 3)
+
+    def _update_scrollbar(self) -> None:
+        self.scrollbar.set(*self.window.fractions())
@@ -1,43 +1,59 @@
-from typing import List
+from typing import List, Optional
 
 from src.models.session import Session
 
+_HEADER_LINES = ["# Task Summary", "", "## Tasks", ""]
+_EMPTY_LINES = ["# Task Summary", "", "No tasks recorded."]
+_LINES_PER_SESSION = 4
+
+
+def _format_duration(total_seconds: float) -> str:
+    hours = int(total_seconds // 3600)
+    minutes = int((total_seconds % 3600) // 60)
+    seconds = int(total_seconds % 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class SessionMarkdownLines:
+    # Builds any single line of the summary on demand, so views can show a window of a huge history
+    def __init__(self, sessions: List[Session]) -> None:
+        self.sessions = sessions
+        self._total_line: Optional[str] = None
+
+    def __len__(self) -> int:
+        if not self.sessions:
+            return len(_EMPTY_LINES)
+        return len(_HEADER_LINES) + _LINES_PER_SESSION * len(self.sessions) + 1
+
+    def line(self, index: int) -> str:
+        assert 0 <= index < len(self), "Line index out of range"
+        if not self.sessions:
+            return _EMPTY_LINES[index]
+        if index < len(_HEADER_LINES):
+            return _HEADER_LINES[index]
+        if index == len(self) - 1:
+            return self.total_line()
+
+        session_index, offset = divmod(index - len(_HEADER_LINES), _LINES_PER_SESSION)
+        session = self.sessions[session_index]
+        if offset == 0:
+            return f"- **{session.task_name}**: {_format_duration(session.get_duration())}"
+        if offset == 1:
+            start_time = session.start_time.strftime("%Y-%m-%d %H:%M:%S") if session.start_time else "N/A"
+            return f"  - Start: {start_time}"
+        if offset == 2:
+            end_time = session.end_time.strftime("%Y-%m-%d %H:%M:%S") if session.end_time else "進行中"
+            return f"  - End: {end_time}"
+        return ""
+
+    def total_line(self) -> str:
+        # Summing every session is only paid when the last line is actually shown
+        if self._total_line is None:
+            total_seconds: float = sum(session.get_duration() for session in self.sessions)
+            self._total_line = f"## Total Time: {_format_duration(total_seconds)}"
+        return self._total_line
 
-def format_sessions_to_markdown(sessions: List[Session]) -> str:
-    if not sessions:
-        return "# Task Summary\n\nNo tasks recorded."
-
-    markdown_lines = ["# Task Summary", ""]
-
-    # Task list with durations
-    markdown_lines.append("## Tasks")
-    markdown_lines.append("")
-
-    total_seconds: float = 0
-
-    for session in sessions:
-        duration = session.get_duration()
-        total_seconds += duration
-
-        hours = int(duration // 3600)
-        minutes = int((duration % 3600) // 60)
-        seconds = int(duration % 60)
-        time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
-        start_time = session.start_time.strftime("%Y-%m-%d %H:%M:%S") if session.start_time else "N/A"
-        end_time = session.end_time.strftime("%Y-%m-%d %H:%M:%S") if session.end_time else "進行中"
-
-        markdown_lines.append(f"- **{session.task_name}**: {time_str}")
-        markdown_lines.append(f"  - Start: {start_time}")
-        markdown_lines.append(f"  - End: {end_time}")
-        markdown_lines.append("")
-
-    # Total time
-    total_hours = int(total_seconds // 3600)
-    total_minutes = int((total_seconds % 3600) // 60)
-    total_secs = int(total_seconds % 60)
-    total_time_str = f"{total_hours:02d}:{total_minutes:02d}:{total_secs:02d}"
-
-    markdown_lines.append(f"## Total Time: {total_time_str}")
-
-    return "\n".join(markdown_lines)
+def format_sessions_to_markdown(sessions: List[Session]) -> str:
+    lines = SessionMarkdownLines(sessions)
+    return "\n".join(lines.line(index) for index in range(len(lines)))
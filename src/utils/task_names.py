@@ -0,0 +1,39 @@
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+
+def normalize_task_name(task_name: str, casefold: bool = True) -> str:
+    normalized = " ".join(unicodedata.normalize("NFKC", task_name).split())
+    return normalized.casefold() if casefold else normalized
+
+
+class TaskNameIndex:
+    def __init__(self, casefold: bool = True) -> None:
+        self.casefold = casefold
+        self._canonical_names: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._canonical_names)
+
+    def key(self, task_name: str) -> str:
+        key = self._keys.get(task_name)
+        if key is None:
+            key = normalize_task_name(task_name, self.casefold)
+            self._keys[task_name] = key
+        return key
+
+    def canonical(self, task_name: str) -> str:
+        # The first spelling seen for a key becomes its display name
+        key = self.key(task_name)
+        canonical_name = self._canonical_names.get(key)
+        if canonical_name is None:
+            canonical_name = normalize_task_name(task_name, casefold=False)
+            self._canonical_names[key] = canonical_name
+        return canonical_name
+
+    def lookup(self, task_name: str) -> Optional[str]:
+        return self._canonical_names.get(self.key(task_name))
+
+    def canonicalize(self, task_names: Iterable[str]) -> List[str]:
+        return list(dict.fromkeys(self.canonical(task_name) for task_name in task_names))
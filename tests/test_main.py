@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+
+def imported_modules(module: str) -> List[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.splitlines()
+
+
+class TestStartupImports:
+    def test_entry_point_does_not_load_ui(self) -> None:
+        modules = imported_modules("src.main")
+
+        assert "tkinter" not in modules
+        assert "src.ui.main_window" not in modules
+
+    @pytest.mark.parametrize("module", ["src.main", "src.ui.main_window", "src.services.gemini_client"])
+    def test_gemini_sdk_is_not_loaded_on_import(self, module: str) -> None:
+        assert "google.generativeai" not in imported_modules(module)
+
+    def test_main_window_defers_summary_and_storage(self) -> None:
+        modules = imported_modules("src.ui.main_window")
+
+        assert "src.ui.summary_screen" not in modules
+        assert "src.storage.journal" not in modules
+        assert "src.services.request_scheduler" not in modules
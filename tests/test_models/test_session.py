@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
 import pytest
 
 from src.models.session import Session
@@ -117,3 +118,125 @@ class TestSession:
 
         duration = session.get_duration()
         assert 0.15 < duration < 0.25
+
+    def test_session_has_no_instance_dict(self) -> None:
+        session = Session("Test Task")
+
+        assert not hasattr(session, "__dict__")
+        with pytest.raises(AttributeError):
+            session.unknown_attribute = 1  # type: ignore[attr-defined]
+
+    def test_duration_ns_is_integer(self) -> None:
+        session = Session("Test Task")
+        session.start()
+        session.stop()
+
+        duration_ns = session.get_duration_ns()
+
+        assert isinstance(duration_ns, int)
+        assert duration_ns == round(session.get_duration() * 1_000_000_000)
+
+    def test_wall_clock_times_follow_monotonic_offsets(self) -> None:
+        session = Session("Test Task")
+        session.start_time = datetime(2024, 1, 1, 10, 0, 0)
+        session.end_time = datetime(2024, 1, 1, 10, 30, 0, 500)
+
+        assert session.end_time == datetime(2024, 1, 1, 10, 30, 0, 500)
+        assert session.get_elapsed_ns() == (30 * 60 * 1_000_000 + 500) * 1000
+
+    def test_moving_start_of_running_session_changes_duration(self) -> None:
+        session = Session("Test Task")
+        session.start()
+
+        session.start_time = datetime.now() - timedelta(hours=1)
+
+        assert 3599.9 < session.get_duration() < 3600.1
+
+    def test_reassigning_start_keeps_end_wall_time(self) -> None:
+        session = Session("Test Task")
+        session.start_time = datetime(2024, 1, 1, 10, 0, 0)
+        session.end_time = datetime(2024, 1, 1, 11, 0, 0)
+
+        session.start_time = datetime(2024, 1, 1, 9, 0, 0)
+
+        assert session.end_time == datetime(2024, 1, 1, 11, 0, 0)
+        assert session.get_duration() == 7200
+
+    def test_end_can_be_set_before_start(self) -> None:
+        session = Session("Test Task")
+        session.end_time = datetime(2024, 1, 1, 12, 0, 0)
+        session.start_time = datetime(2024, 1, 1, 10, 0, 0)
+
+        assert session.end_time == datetime(2024, 1, 1, 12, 0, 0)
+        assert session.get_duration() == 7200
+
+    def test_reassigning_start_keeps_pause_wall_time(self) -> None:
+        session = Session("Test Task")
+        session.start()
+        session.pause()
+        pause_start = session.pause_start_time
+
+        session.start_time = datetime.now() - timedelta(minutes=10)
+
+        assert session.pause_start_time == pause_start
+        assert 599.9 < session.get_duration() < 600.1
+
+    def test_paused_ns_includes_current_pause(self) -> None:
+        import time
+
+        session = Session("Test Task")
+        session.start()
+        session.pause()
+        time.sleep(0.05)
+
+        assert session.get_paused_ns() >= 50_000_000
+        assert session.paused_time == 0
+
+    def test_stopped_session_duration_does_not_read_the_clock(self) -> None:
+        session = Session("Test Task")
+        session.start()
+        session.stop()
+        duration_ns = session.get_duration_ns()
+
+        with (
+            patch("time.monotonic_ns", side_effect=AssertionError("clock read")),
+            patch("time.time_ns", side_effect=AssertionError("clock read")),
+        ):
+            assert session.get_duration_ns() == duration_ns
+
+    def test_stopping_keeps_wall_clock_times(self) -> None:
+        session = Session("Test Task")
+        before = datetime.now()
+        session.start()
+        start_time = session.start_time
+        session.stop()
+
+        assert session.start_time == start_time
+        assert start_time is not None and before <= start_time <= datetime.now()
+        assert session.get_start_epoch_ns() % 1000 == 0
+
+    def test_restore_finished_session(self) -> None:
+        from src.models.session import datetime_to_epoch_ns
+
+        start_ns = datetime_to_epoch_ns(datetime(2024, 1, 1, 10, 0, 0))
+        session = Session.restore("Test Task", start_ns, start_ns + 3600 * 1_000_000_000, 600 * 1_000_000_000)
+
+        assert session.is_running is False
+        assert session.start_time == datetime(2024, 1, 1, 10, 0, 0)
+        assert session.end_time == datetime(2024, 1, 1, 11, 0, 0)
+        assert session.get_duration() == 3000
+
+    def test_restore_running_paused_session(self) -> None:
+        import time
+
+        start_ns = time.time_ns() - 60 * 1_000_000_000
+        session = Session.restore("Test Task", start_ns, None, 0, pause_start_epoch_ns=start_ns + 50 * 1_000_000_000)
+
+        assert session.is_running is True
+        assert session.is_paused is True
+        assert 49.9 < session.get_duration() < 50.1
+
+        session.resume()
+        session.stop()
+
+        assert session.is_running is False
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.session import Session, datetime_to_epoch_ns
+from src.models.task_tracker import TaskTracker
+
+np = pytest.importorskip("numpy")
+
+from src.models.session_store import SessionStore  # noqa: E402
+
+
+class TestSessionStore:
+    def test_store_starts_empty(self) -> None:
+        store = SessionStore()
+
+        assert len(store) == 0
+        assert store.start_ns().shape == (0,)
+        assert store.task_names == ()
+
+    def test_append_stopped_session(self) -> None:
+        store = SessionStore()
+        session = self._create_session("Task 1", datetime(2024, 1, 1, 10, 0, 0), minutes=30, paused_minutes=5)
+
+        store.append(session)
+
+        start_ns = datetime_to_epoch_ns(datetime(2024, 1, 1, 10, 0, 0))
+        assert len(store) == 1
+        assert store.start_ns().tolist() == [start_ns]
+        assert store.end_ns().tolist() == [start_ns + 30 * 60 * 1_000_000_000]
+        assert store.paused_ns().tolist() == [5 * 60 * 1_000_000_000]
+        assert store.durations_ns().tolist() == [25 * 60 * 1_000_000_000]
+
+    def test_task_names_are_dictionary_encoded(self) -> None:
+        store = SessionStore()
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        for name in ["Task A", "Task B", "Task A"]:
+            store.append(self._create_session(name, start, minutes=1))
+
+        assert store.task_codes().dtype == np.int32
+        assert store.task_codes().tolist() == [0, 1, 0]
+        assert store.task_names == ("Task A", "Task B")
+        assert store.get_task_name(1) == "Task B"
+        assert store.get_task_code("Task A") == 0
+
+    def test_store_grows_past_initial_capacity(self) -> None:
+        store = SessionStore(capacity=2)
+        start = datetime(2024, 1, 1, 10, 0, 0)
+        for i in range(5):
+            store.append(self._create_session(f"Task {i}", start + timedelta(minutes=i), minutes=1))
+
+        assert len(store) == 5
+        assert store.capacity >= 5
+        assert store.task_codes().tolist() == [0, 1, 2, 3, 4]
+
+    def test_columns_are_read_only_views(self) -> None:
+        store = SessionStore()
+        store.append(self._create_session("Task 1", datetime(2024, 1, 1, 10, 0, 0), minutes=1))
+
+        start_ns = store.start_ns()
+
+        assert not start_ns.flags.writeable
+        assert not start_ns.flags.owndata
+        with pytest.raises(ValueError):
+            start_ns[0] = 0
+
+    def test_running_session_cannot_be_stored(self) -> None:
+        store = SessionStore()
+        session = Session("Task 1")
+        session.start()
+
+        with pytest.raises(AssertionError, match="Only stopped sessions can be stored"):
+            store.append(session)
+
+    def test_task_tracker_appends_stopped_sessions(self) -> None:
+        store = SessionStore()
+        tracker = TaskTracker(store=store)
+
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        assert len(store) == 1
+
+        tracker.stop_all()
+
+        assert len(store) == 2
+        assert [store.get_task_name(code) for code in store.task_codes().tolist()] == ["Task 1", "Task 2"]
+
+    def test_task_tracker_columns_follow_stopped_sessions(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+
+        columns = tracker.get_session_columns()
+        assert len(columns) == 1
+        tracker.start_task("Task 1")
+        tracker.stop_all()
+
+        assert tracker.get_session_columns() is columns
+        assert [columns.get_task_name(code) for code in columns.task_codes().tolist()] == ["Task 1", "Task 2", "Task 1"]
+        assert columns.task_names == ("Task 1", "Task 2")
+        assert not columns.start_ns().flags.writeable
+
+    def test_task_tracker_columns_are_rebuilt_after_removal(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        tracker.stop_all()
+        columns = tracker.get_session_columns()
+
+        tracker.remove_sessions(tracker.sessions[:1])
+
+        assert tracker.get_session_columns() is not columns
+        assert tracker.get_session_columns().task_names == ("Task 2",)
+
+    def _create_session(self, task_name: str, start: datetime, minutes: int, paused_minutes: int = 0) -> Session:
+        session = Session(task_name)
+        session.start_time = start
+        session.end_time = start + timedelta(minutes=minutes)
+        session.paused_time = paused_minutes * 60
+        session.is_running = False
+        return session
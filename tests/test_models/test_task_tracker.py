@@ -1,5 +1,8 @@
+from typing import List, Tuple
+
 import pytest
 
+from src.models.session import Session
 from src.models.task_tracker import TaskTracker
 
 
@@ -34,6 +37,13 @@ class TestTaskTracker:
         assert tracker.current_session.is_running is True
         assert len(tracker.sessions) == 2
 
+    def test_name_variants_share_the_first_spelling(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("Task  1")
+        tracker.start_task("ｔａｓｋ 1")
+
+        assert [session.task_name for session in tracker.sessions] == ["Task 1", "Task 1"]
+
     def test_cannot_start_empty_task(self) -> None:
         tracker = TaskTracker()
 
@@ -108,3 +118,59 @@ class TestTaskTracker:
 
         with pytest.raises(AssertionError, match="No active session to resume"):
             tracker.resume_current()
+
+    def test_listeners_receive_session_events(self) -> None:
+        tracker = TaskTracker()
+        events: List[Tuple[str, str]] = []
+        tracker.add_listener(lambda event, session: events.append((event, session.task_name)))
+
+        tracker.start_task("Task 1")
+        tracker.pause_current()
+        tracker.resume_current()
+        tracker.start_task("Task 2")
+        tracker.stop_all()
+
+        assert events == [
+            ("start", "Task 1"),
+            ("pause", "Task 1"),
+            ("resume", "Task 1"),
+            ("stop", "Task 1"),
+            ("start", "Task 2"),
+            ("stop", "Task 2"),
+        ]
+
+    def test_remove_sessions_notifies_listeners(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        tracker.start_task("Task 3")
+        tracker.stop_all()
+        first, second, third = tracker.sessions
+        events: List[Tuple[str, str]] = []
+        tracker.add_listener(lambda event, session: events.append((event, session.task_name)))
+
+        tracker.remove_sessions([third, first])
+
+        assert tracker.sessions == [second]
+        assert events == [("remove", "Task 1"), ("remove", "Task 3")]
+        assert tracker.removal_batches == 1
+
+    def test_cannot_remove_running_session(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("Task 1")
+
+        with pytest.raises(AssertionError):
+            tracker.remove_sessions(tracker.sessions)
+
+    def test_removed_listener_is_not_notified(self) -> None:
+        tracker = TaskTracker()
+        events: List[str] = []
+
+        def listener(event: str, session: Session) -> None:
+            events.append(event)
+
+        tracker.add_listener(listener)
+        tracker.remove_listener(listener)
+        tracker.start_task("Task 1")
+
+        assert events == []
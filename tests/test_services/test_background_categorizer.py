@@ -0,0 +1,95 @@
+import threading
+from typing import Any, Dict, List
+
+from src.models.task_tracker import TaskTracker
+from src.services.background_categorizer import BackgroundCategorizer
+
+
+class FakeCategorizer:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        self.calls.append(list(tasks))
+        categories: Dict[str, List[str]] = {}
+        for task in tasks:
+            categories.setdefault(task.split()[0], []).append(task)
+        return {"categories": [{"name": name, "tasks": names} for name, names in categories.items()]}
+
+
+class FailingCategorizer:
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        raise RuntimeError("API down")
+
+
+class TestBackgroundCategorizer:
+    def test_started_tasks_are_coalesced_into_one_batch(self) -> None:
+        fake = FakeCategorizer()
+        background = BackgroundCategorizer(lambda: fake, interval=60.0)
+        tracker = TaskTracker()
+        background.attach(tracker)
+
+        tracker.start_task("ProjectA Review")
+        tracker.start_task("ProjectB Design")
+        tracker.start_task("ProjectA Review")
+        assert background.flush(timeout=5.0)
+        background.close()
+
+        assert fake.calls == [["ProjectA Review", "ProjectB Design"]]
+        assert background.partition(["ProjectA Review", "ProjectB Design", "Lunch"]) == (
+            {"ProjectA": ["ProjectA Review"], "ProjectB": ["ProjectB Design"]},
+            ["Lunch"],
+        )
+
+    def test_full_batch_is_sent_without_waiting_for_the_interval(self) -> None:
+        fake = FakeCategorizer()
+        sent = threading.Event()
+
+        def factory() -> FakeCategorizer:
+            sent.set()
+            return fake
+
+        background = BackgroundCategorizer(factory, interval=60.0, max_batch=2)
+        background.enqueue(["ProjectA Review", "ProjectB Design", "ProjectC Plan"])
+
+        assert sent.wait(timeout=5.0)
+        assert background.flush(timeout=5.0)
+        background.close()
+
+        assert fake.calls == [["ProjectA Review", "ProjectB Design"], ["ProjectC Plan"]]
+
+    def test_known_names_are_not_sent_again(self) -> None:
+        fake = FakeCategorizer()
+        background = BackgroundCategorizer(lambda: fake, interval=60.0)
+
+        background.enqueue(["ProjectA Review"])
+        assert background.flush(timeout=5.0)
+        background.enqueue(["ｐｒｏｊｅｃｔａ review", "ProjectB Design"])
+        assert background.flush(timeout=5.0)
+        background.close()
+
+        assert fake.calls == [["ProjectA Review"], ["ProjectB Design"]]
+        assert background.batches == 2
+
+    def test_attach_enqueues_existing_sessions(self) -> None:
+        fake = FakeCategorizer()
+        tracker = TaskTracker()
+        tracker.start_task("ProjectA Review")
+        tracker.stop_all()
+
+        background = BackgroundCategorizer(lambda: fake, interval=60.0)
+        background.attach(tracker)
+        assert background.flush(timeout=5.0)
+        background.close()
+
+        assert fake.calls == [["ProjectA Review"]]
+
+    def test_failed_batch_leaves_tasks_unresolved(self) -> None:
+        background = BackgroundCategorizer(FailingCategorizer, interval=60.0)
+
+        background.enqueue(["ProjectA Review"])
+        assert background.flush(timeout=5.0)
+        background.close()
+
+        assert background.failed_batches == 1
+        assert background.partition(["ProjectA Review"]) == ({}, ["ProjectA Review"])
@@ -0,0 +1,182 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.categorizer_chain import CategorizerChain
+from src.services.category_cache import CategoryCache, clear_caches
+from src.services.gemini_client import clear_clients
+from src.services.rule_categorizer import RuleFirstCategorizer
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class RecordingModel:
+    def __init__(self, replies: List[Dict[str, Any]]) -> None:
+        self.replies = replies
+        self.prompts: List[str] = []
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        self.prompts.append(prompt)
+        return FakeResponse(json.dumps(self.replies.pop(0), ensure_ascii=False))
+
+
+class FailingModel:
+    def generate_content(self, prompt: str) -> None:
+        raise RuntimeError("503 The model is overloaded")
+
+
+@pytest.fixture
+def failing_model() -> Iterator[None]:
+    clear_clients()
+    clear_caches()
+    with patch("google.generativeai.configure"), patch("google.generativeai.GenerativeModel") as model_class:
+        model_class.return_value = FailingModel()
+        yield
+    clear_clients()
+    clear_caches()
+
+
+class TestCategorizerChainFallback:
+    def test_outage_answers_locally_without_caching(
+        self, failing_model: None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache_path = tmp_path / "cache.json"
+        monkeypatch.setenv("TASK_TRACKER_CATEGORY_CACHE", str(cache_path))
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+        chain = CategorizerChain("test_key")
+
+        result = chain.categorize_tasks(["ProjectA Review", "週次定例", "メール対応"])
+
+        assert result == {
+            "categories": [
+                {"name": "ProjectA", "tasks": ["ProjectA Review"]},
+                {"name": "その他", "tasks": ["週次定例", "メール対応"]},
+            ]
+        }
+        assert json.loads(cache_path.read_text(encoding="utf-8"))["entries"] == []
+        assert len(chain.delta) == 0
+
+    def test_outage_keeps_cached_labels(
+        self, failing_model: None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache_path = tmp_path / "cache.json"
+        cache = CategoryCache(str(cache_path))
+        cache.put("週次定例", "社内")
+        cache.save()
+        monkeypatch.setenv("TASK_TRACKER_CATEGORY_CACHE", str(cache_path))
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+
+        result = CategorizerChain("test_key").categorize_tasks(["週次定例 ", "メール対応"])
+
+        assert {"name": "社内", "tasks": ["週次定例 "]} in result["categories"]
+        assert {"name": "その他", "tasks": ["メール対応"]} in result["categories"]
+
+    def test_background_chain_reports_outage(self, failing_model: None, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("TASK_TRACKER_CATEGORY_CACHE", raising=False)
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+        chain = CategorizerChain("test_key", fallback=False)
+
+        with pytest.raises(RuntimeError):
+            chain.categorize_tasks(["週次定例"])
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_rules_resolve_without_the_model(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clear_clients()
+        monkeypatch.delenv("TASK_TRACKER_CATEGORY_CACHE", raising=False)
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+
+        result = CategorizerChain("test_key").categorize_tasks(["ProjectA Review"])
+
+        assert result == {"categories": [{"name": "ProjectA", "tasks": ["ProjectA Review"]}]}
+        mock_model_class.return_value.generate_content.assert_not_called()
+        clear_clients()
+
+
+class TestCategorizerChainCache:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_chains_share_one_cache_per_file(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clear_clients()
+        clear_caches()
+        cache_path = tmp_path / "cache.json"
+        monkeypatch.setenv("TASK_TRACKER_CATEGORY_CACHE", str(cache_path))
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+        background = CategorizerChain("test_key")
+        summary = CategorizerChain("test_key")
+        assert summary.cache is not None
+
+        summary.cache.put("週次定例", "社内")
+        summary.cache.save()
+        background.categorize_tasks(["ProjectA Review"])
+
+        assert background.cache is summary.cache
+        assert CategoryCache(str(cache_path)).get("週次定例") == "社内"
+        clear_clients()
+        clear_caches()
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_chains_share_one_similarity_index(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        pytest.importorskip("numpy")
+        from src.services.similarity_categorizer import SimilarityFirstCategorizer
+
+        clear_clients()
+        clear_caches()
+        monkeypatch.setenv("TASK_TRACKER_CATEGORY_CACHE", str(tmp_path / "cache.json"))
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+        first = CategorizerChain("test_key")
+        assert first.cache is not None
+        first.cache.put("週次定例", "社内")
+
+        second = CategorizerChain("test_key")
+
+        assert isinstance(first.categorizer, RuleFirstCategorizer)
+        assert isinstance(second.categorizer, RuleFirstCategorizer)
+        first_stage = first.categorizer.fallback
+        second_stage = second.categorizer.fallback
+        assert isinstance(first_stage, SimilarityFirstCategorizer)
+        assert isinstance(second_stage, SimilarityFirstCategorizer)
+        assert first_stage.index is second_stage.index
+        assert second_stage.index.categorize("週次定例") == "社内"
+        clear_clients()
+        clear_caches()
+
+
+class TestCategorizerChainDelta:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_later_chains_send_only_new_tasks_with_known_categories(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clear_clients()
+        monkeypatch.delenv("TASK_TRACKER_CATEGORY_CACHE", raising=False)
+        monkeypatch.delenv("TASK_TRACKER_RULES", raising=False)
+        model = RecordingModel(
+            [
+                {"categories": [{"name": "社内", "tasks": ["経費精算"]}]},
+                {"categories": [{"name": "社内", "tasks": ["週次定例"]}]},
+            ]
+        )
+        mock_model_class.return_value = model
+
+        CategorizerChain("test_key").categorize_tasks(["経費精算"])
+        result = CategorizerChain("test_key").categorize_tasks(["経費精算", "週次定例"])
+
+        assert result == {"categories": [{"name": "社内", "tasks": ["経費精算", "週次定例"]}]}
+        assert len(model.prompts) == 2
+        assert "経費精算" not in model.prompts[1]
+        assert '["社内"]' in model.prompts[1]
+        clear_clients()
@@ -0,0 +1,99 @@
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from src.models.session import Session
+from src.services.category_aggregator import CategoryAggregator
+
+np = pytest.importorskip("numpy")
+
+from src.models.session_store import SessionStore  # noqa: E402
+
+
+class TestCategoryAggregatorColumnar:
+    def test_store_aggregation_matches_session_aggregation(self) -> None:
+        sessions = [
+            self._create_session("プロジェクトB会議", minutes=20),
+            self._create_session("プロジェクトA開発", minutes=30),
+            self._create_session("雑務", minutes=10),
+            self._create_session("プロジェクトA設計", minutes=40),
+            self._create_session("プロジェクトB会議", minutes=5),
+        ]
+        categories = {
+            "categories": [
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA開発", "プロジェクトA設計"]},
+                {"name": "プロジェクトB", "tasks": ["プロジェクトB会議"]},
+            ]
+        }
+
+        aggregator = CategoryAggregator()
+
+        assert aggregator.aggregate_store(self._create_store(sessions), categories) == aggregator.aggregate(
+            sessions, categories
+        )
+
+    def test_fractional_durations_match_session_aggregation(self) -> None:
+        rng = random.Random(7)
+        task_names = ["プロジェクトA開発", "プロジェクトA設計", "プロジェクトB会議", "雑務"]
+        sessions = []
+        for _ in range(2000):
+            session = Session(rng.choice(task_names))
+            session.start_time = datetime.now()
+            session.end_time = session.start_time + timedelta(seconds=rng.uniform(0.1, 3600.0))
+            session.is_running = False
+            sessions.append(session)
+        categories = {
+            "categories": [
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA開発", "プロジェクトA設計"]},
+                {"name": "プロジェクトB", "tasks": ["プロジェクトB会議"]},
+            ]
+        }
+
+        aggregator = CategoryAggregator()
+
+        assert aggregator.aggregate_store(self._create_store(sessions), categories) == aggregator.aggregate(
+            sessions, categories
+        )
+
+    def test_store_aggregation_without_categorized_sessions(self) -> None:
+        sessions = [self._create_session("雑務", minutes=10)]
+        categories = {"categories": [{"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]}]}
+
+        result = CategoryAggregator().aggregate_store(self._create_store(sessions), categories)
+
+        assert result == []
+
+    def test_store_aggregation_of_empty_store(self) -> None:
+        result = CategoryAggregator().aggregate_store(SessionStore(), {"categories": []})
+
+        assert result == []
+
+    def test_aggregate_columns_with_explicit_codes(self) -> None:
+        task_codes = np.array([0, 1, 2, 0], dtype=np.int32)
+        durations_ns = np.array([60, 120, 30, 60], dtype=np.int64) * 1_000_000_000
+        task_category_codes = np.array([1, 0, -1], dtype=np.int32)
+
+        result = CategoryAggregator().aggregate_columns(
+            task_codes, durations_ns, ["開発", "会議", "雑務"], task_category_codes, ["会議系", "開発系"]
+        )
+
+        assert [category["name"] for category in result] == ["開発系", "会議系"]
+        assert result[0]["total_seconds"] == 120
+        assert result[0]["total_time"] == "0:02:00"
+        assert result[0]["tasks"] == [{"name": "開発", "total_seconds": 120, "total_time": "0:02:00"}]
+        assert result[1]["total_seconds"] == 120
+
+    def _create_store(self, sessions: List[Session]) -> SessionStore:
+        store = SessionStore()
+        for session in sessions:
+            store.append(session)
+        return store
+
+    def _create_session(self, task_name: str, minutes: int) -> Session:
+        session = Session(task_name)
+        session.start_time = datetime.now()
+        session.end_time = session.start_time + timedelta(minutes=minutes)
+        session.is_running = False
+        return session
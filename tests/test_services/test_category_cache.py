@@ -0,0 +1,199 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from src.services.category_cache import (
+    CachedCategorizer,
+    CategoryCache,
+    clear_caches,
+    get_cache,
+    get_similarity_index,
+)
+from src.utils.task_names import normalize_task_name
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeCategorizer:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        self.calls.append(list(tasks))
+        return {"categories": [{"name": task.split()[0], "tasks": [task]} for task in tasks]}
+
+
+class TestCategoryCache:
+    def test_get_cache_shares_one_instance_per_path(self, tmp_path: Path) -> None:
+        clear_caches()
+
+        cache = get_cache(str(tmp_path / "cache.json"))
+
+        assert get_cache(str(tmp_path / "cache.json")) is cache
+        assert get_cache(str(tmp_path / "other.json")) is not cache
+        clear_caches()
+
+    def test_normalize_task_name_collapses_whitespace_and_case(self) -> None:
+        assert normalize_task_name("  ProjectA   Review ") == "projecta review"
+
+    def test_get_returns_stored_category(self) -> None:
+        cache = CategoryCache()
+        cache.put("ProjectA Review", "ProjectA")
+
+        assert cache.get("projecta  review") == "ProjectA"
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+    def test_get_counts_misses(self) -> None:
+        cache = CategoryCache()
+
+        assert cache.get("Unknown") is None
+        assert cache.misses == 1
+        assert cache.hit_rate == 0.0
+
+    def test_expired_entries_are_misses(self) -> None:
+        clock = FakeClock()
+        cache = CategoryCache(ttl=60, clock=clock)
+        cache.put("Task", "Category")
+
+        clock.now += 61
+
+        assert cache.get("Task") is None
+        assert len(cache) == 0
+
+    def test_items_leave_out_expired_entries(self) -> None:
+        clock = FakeClock()
+        cache = CategoryCache(ttl=60, clock=clock)
+        cache.put("Old", "Category")
+        clock.now += 30
+        cache.put("New", "Category")
+
+        clock.now += 31
+
+        assert cache.items() == [("new", "Category")]
+
+    def test_similarity_index_is_shared_and_follows_live_labels(self, tmp_path: Path) -> None:
+        pytest.importorskip("numpy")
+        clear_caches()
+        cache = get_cache(str(tmp_path / "cache.json"))
+        cache.put("ProjectA Review", "Reviews")
+        cache.put("週次定例", "社内")
+        index = get_similarity_index(cache)
+        cache.ttl = 1e-9
+
+        assert get_similarity_index(cache) is index
+        assert len(index) == 0
+        clear_caches()
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = CategoryCache(max_entries=2)
+        cache.put("Task 1", "A")
+        cache.put("Task 2", "B")
+        cache.get("Task 1")
+        cache.put("Task 3", "C")
+
+        assert cache.get("Task 2") is None
+        assert cache.get("Task 1") == "A"
+        assert cache.get("Task 3") == "C"
+
+    def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "categories.json")
+        cache = CategoryCache(path)
+        cache.put("Task 1", "A")
+        cache.put("Task 2", "B")
+        cache.save()
+
+        reloaded = CategoryCache(path)
+
+        assert len(reloaded) == 2
+        assert reloaded.get("Task 2") == "B"
+
+    def test_load_drops_expired_entries(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "categories.json")
+        clock = FakeClock()
+        cache = CategoryCache(path, ttl=60, clock=clock)
+        cache.put("Task 1", "A")
+        cache.save()
+
+        clock.now += 61
+        reloaded = CategoryCache(path, ttl=60, clock=clock)
+
+        assert len(reloaded) == 0
+
+    def test_unreadable_cache_file_starts_empty(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "categories.json")
+        with open(path, "w", encoding="utf-8") as cache_file:
+            cache_file.write("{not json")
+
+        assert len(CategoryCache(path)) == 0
+
+    def test_saved_file_is_versioned_json(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "categories.json")
+        cache = CategoryCache(path)
+        cache.put("タスク", "カテゴリ")
+        cache.save()
+
+        with open(path, encoding="utf-8") as cache_file:
+            data = json.load(cache_file)
+
+        assert data["version"] == 1
+        assert data["entries"][0][:2] == ["タスク", "カテゴリ"]
+
+
+class TestCachedCategorizer:
+    def test_only_misses_are_sent_to_model(self) -> None:
+        categorizer = FakeCategorizer()
+        cache = CategoryCache()
+        cache.put("ProjectA Review", "ProjectA")
+        cached = CachedCategorizer(categorizer, cache)
+
+        result = cached.categorize_tasks(["ProjectA Review", "ProjectB Design"])
+
+        assert categorizer.calls == [["ProjectB Design"]]
+        assert result == {
+            "categories": [
+                {"name": "ProjectA", "tasks": ["ProjectA Review"]},
+                {"name": "ProjectB", "tasks": ["ProjectB Design"]},
+            ]
+        }
+
+    def test_cache_hits_are_reported_before_model_call(self) -> None:
+        categorizer = FakeCategorizer()
+        cache = CategoryCache()
+        cache.put("ProjectA Review", "ProjectA")
+        reported: List[Tuple[Dict[str, Any], int]] = []
+        cached = CachedCategorizer(
+            categorizer, cache, lambda category: reported.append((category, len(categorizer.calls)))
+        )
+
+        cached.categorize_tasks(["ProjectA Review", "ProjectB Design"])
+
+        assert reported == [({"name": "ProjectA", "tasks": ["ProjectA Review"]}, 0)]
+
+    def test_model_responses_populate_cache(self) -> None:
+        categorizer = FakeCategorizer()
+        cached = CachedCategorizer(categorizer, CategoryCache())
+
+        cached.categorize_tasks(["ProjectA Review"])
+        cached.categorize_tasks(["ProjectA Review"])
+
+        assert len(categorizer.calls) == 1
+        assert cached.model_calls == 1
+        assert cached.saved_calls == 1
+        assert cached.cache.hit_rate == 0.5
+
+    def test_empty_task_list_is_not_counted(self) -> None:
+        categorizer = FakeCategorizer()
+        cached = CachedCategorizer(categorizer, CategoryCache())
+
+        assert cached.categorize_tasks([]) == {"categories": []}
+        assert cached.saved_calls == 0
+        assert categorizer.calls == []
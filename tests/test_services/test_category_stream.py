@@ -0,0 +1,43 @@
+import json
+from typing import Any, Dict, List
+
+from src.services.category_stream import CategoryStreamParser
+
+CATEGORIES: List[Dict[str, Any]] = [
+    {"name": "ProjectA", "tasks": ["ProjectA Review", "ProjectA {draft}"]},
+    {"name": 'Quote " and } brace', "tasks": ["a\\b", "[x]"]},
+    {"name": "その他", "tasks": []},
+]
+
+
+def _feed_in_pieces(text: str, size: int) -> List[Dict[str, Any]]:
+    parser = CategoryStreamParser()
+    completed: List[Dict[str, Any]] = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start : start + size]))
+    return completed
+
+
+class TestCategoryStreamParser:
+    def test_categories_are_parsed_for_any_chunk_size(self) -> None:
+        text = json.dumps({"categories": CATEGORIES}, ensure_ascii=False, indent=2)
+
+        for size in (1, 2, 5, 17, len(text)):
+            assert _feed_in_pieces(text, size) == CATEGORIES
+
+    def test_code_fences_are_ignored(self) -> None:
+        text = "```json\n" + json.dumps({"categories": CATEGORIES[:1]}) + "\n```"
+
+        assert _feed_in_pieces(text, 3) == CATEGORIES[:1]
+
+    def test_category_is_returned_as_soon_as_it_closes(self) -> None:
+        parser = CategoryStreamParser()
+
+        assert parser.feed('{"categories": [{"name": "A", "tasks": ["a1"]}') == [{"name": "A", "tasks": ["a1"]}]
+        assert parser.feed(', {"name": "B", "tasks": [') == []
+        assert parser.feed('"b1"]}]}') == [{"name": "B", "tasks": ["b1"]}]
+
+    def test_nested_objects_inside_a_category_are_not_reported(self) -> None:
+        text = '{"categories": [{"name": "A", "meta": {"score": 1}, "tasks": []}]}'
+
+        assert _feed_in_pieces(text, 4) == [{"name": "A", "meta": {"score": 1}, "tasks": []}]
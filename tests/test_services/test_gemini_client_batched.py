@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from src.services.gemini_client import GeminiClient
+from src.services.request_scheduler import RequestScheduler
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeAsyncModel:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.prompts: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content_async(self, prompt: str) -> FakeResponse:
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+        tasks = json.loads(prompt.split("タスクリスト:\n", 1)[1].split("\n", 1)[0])
+        categories: Dict[str, List[str]] = {}
+        for task in tasks:
+            categories.setdefault(task.split()[0], []).append(task)
+        return FakeResponse(
+            json.dumps({"categories": [{"name": name, "tasks": names} for name, names in categories.items()]})
+        )
+
+
+class TestGeminiClientBatched:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_chunks_respect_token_budget(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        tasks = [f"タスク{i:02d}" for i in range(10)]
+
+        chunks = client._chunk_tasks(tasks, max_chunk_tokens=30)
+
+        assert [task for chunk in chunks for task in chunk] == tasks
+        assert all(sum(len(task) + 4 for task in chunk) <= 30 for chunk in chunks)
+        assert len(chunks) == 4
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_oversized_task_gets_its_own_chunk(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+
+        chunks = client._chunk_tasks(["a" * 100, "b"], max_chunk_tokens=10)
+
+        assert chunks == [["a" * 100], ["b"]]
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_batched_results_are_merged(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        model = FakeAsyncModel()
+        client.model = model  # type: ignore[assignment]
+        tasks = [f"Project{p} task{t}" for t in range(5) for p in "AB"]
+
+        result = asyncio.run(client.categorize_tasks_batched(tasks, max_chunk_tokens=40))
+
+        assert len(model.prompts) > 1
+        assert result == {
+            "categories": [
+                {"name": "ProjectA", "tasks": [f"ProjectA task{t}" for t in range(5)]},
+                {"name": "ProjectB", "tasks": [f"ProjectB task{t}" for t in range(5)]},
+            ]
+        }
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_concurrency_is_bounded(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        model = FakeAsyncModel(latency=0.01)
+        client.model = model  # type: ignore[assignment]
+        tasks = [f"Project{i} task" for i in range(20)]
+
+        asyncio.run(client.categorize_tasks_batched(tasks, max_chunk_tokens=20, max_concurrency=3))
+
+        assert len(model.prompts) == 20
+        assert model.max_in_flight == 3
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_merge_unifies_category_spelling(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        results: List[Any] = [
+            {"categories": [{"name": "ProjectA", "tasks": ["a1"]}]},
+            {"categories": [{"name": "projecta ", "tasks": ["a2", "a1"]}, {"name": "X", "tasks": ["unknown"]}]},
+        ]
+
+        merged = client._merge_categories(["a1", "a2", "b1"], results)
+
+        assert merged == {
+            "categories": [{"name": "ProjectA", "tasks": ["a1", "a2"]}, {"name": "その他", "tasks": ["b1"]}]
+        }
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_merge_maps_echoed_variants_to_requested_names(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock
+    ) -> None:
+        client = GeminiClient(api_key="test_key")
+        results: List[Any] = [{"categories": [{"name": "A", "tasks": ["ｔａｓｋ  one", "TASK TWO"]}]}]
+
+        merged = client._merge_categories(["Task One", "task two"], results)
+
+        assert merged == {"categories": [{"name": "A", "tasks": ["Task One", "task two"]}]}
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_failed_chunk_falls_back_to_mock(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        client.model = MagicMock()
+        client.model.generate_content_async.side_effect = Exception("API Error")
+
+        result = asyncio.run(client.categorize_tasks_batched(["プロジェクトA開発", "雑務"]))
+
+        assert result == {
+            "categories": [
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]},
+                {"name": "その他", "tasks": ["雑務"]},
+            ]
+        }
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_batched_empty_tasks(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+
+        assert asyncio.run(client.categorize_tasks_batched([])) == {"categories": []}
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_chunks_are_routed_through_scheduler(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        threads: List[str] = []
+
+        def generate_content(prompt: str) -> FakeResponse:
+            threads.append(threading.current_thread().name)
+            tasks = json.loads(prompt.split("タスクリスト:\n", 1)[1].split("\n", 1)[0])
+            return FakeResponse(json.dumps({"categories": [{"name": "A", "tasks": tasks}]}))
+
+        mock_model_class.return_value.generate_content.side_effect = generate_content
+        scheduler = RequestScheduler()
+        tasks = [f"タスク{i:02d}" for i in range(10)]
+
+        result = asyncio.run(client.categorize_tasks_batched(tasks, max_chunk_tokens=30, scheduler=scheduler))
+        scheduler.close()
+
+        assert result == {"categories": [{"name": "A", "tasks": tasks}]}
+        assert len(threads) == 4
+        assert all(name.startswith("llm-request") for name in threads)
+        mock_model_class.return_value.generate_content_async.assert_not_called()
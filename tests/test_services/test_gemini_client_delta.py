@@ -0,0 +1,140 @@
+import json
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.gemini_client import DeltaCategorizer, GeminiClient
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeDeltaModel:
+    def __init__(self, replies: List[Dict[str, Any]]) -> None:
+        self.replies = replies
+        self.prompts: List[str] = []
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        self.prompts.append(prompt)
+        return FakeResponse(json.dumps(self.replies.pop(0), ensure_ascii=False))
+
+
+def _prompt_list(prompt: str, heading: str) -> List[str]:
+    return json.loads(prompt.split(f"{heading}:\n", 1)[1].split("\n", 1)[0])  # type: ignore
+
+
+class TestDeltaPrompt:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_delta_prompt_lists_known_categories(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        model = FakeDeltaModel([{"categories": [{"name": "ProjectA", "tasks": ["ProjectA Review"]}]}])
+        client.model = model  # type: ignore[assignment]
+
+        result = client.categorize_tasks(["ProjectA Review"], category_names=["ProjectA", "社内"])
+
+        assert result == {"categories": [{"name": "ProjectA", "tasks": ["ProjectA Review"]}]}
+        assert _prompt_list(model.prompts[0], "既存のカテゴリ") == ["ProjectA", "社内"]
+        assert _prompt_list(model.prompts[0], "新しいタスク") == ["ProjectA Review"]
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_delta_reply_keeps_only_requested_tasks(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock
+    ) -> None:
+        client = GeminiClient(api_key="test_key")
+        reply = {"categories": [{"name": "ProjectA", "tasks": ["ProjectA Design", "ProjectA Old"]}]}
+        client.model = FakeDeltaModel([reply])  # type: ignore[assignment]
+
+        result = client.categorize_tasks(["ProjectA Design", "Lunch"], category_names=["ProjectA"])
+
+        assert result == {
+            "categories": [{"name": "ProjectA", "tasks": ["ProjectA Design"]}, {"name": "その他", "tasks": ["Lunch"]}]
+        }
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_token_estimate_grows_with_context(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+
+        assert client.estimate_tokens(["task"], ["ProjectA"]) > client.estimate_tokens(["task"])
+
+
+class TestDeltaCategorizer:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_only_new_tasks_are_sent(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        model = FakeDeltaModel([{"categories": [{"name": "projecta", "tasks": ["ProjectA Design"]}]}])
+        client.model = model  # type: ignore[assignment]
+        delta = DeltaCategorizer(client)
+        delta.extend([("ProjectA Review", "ProjectA"), ("Standup", "社内")])
+
+        result = delta.categorize_tasks(["ProjectA Review", "ProjectA Design", "Standup"])
+
+        # The model's respelling joins the existing category
+        assert result == {
+            "categories": [
+                {"name": "ProjectA", "tasks": ["ProjectA Review", "ProjectA Design"]},
+                {"name": "社内", "tasks": ["Standup"]},
+            ]
+        }
+        assert _prompt_list(model.prompts[0], "新しいタスク") == ["ProjectA Design"]
+        assert _prompt_list(model.prompts[0], "既存のカテゴリ") == ["ProjectA", "社内"]
+        assert delta.sent_tasks == 1
+        assert len(delta) == 3
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_known_tasks_skip_the_model(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        model = FakeDeltaModel([])
+        client.model = model  # type: ignore[assignment]
+        delta = DeltaCategorizer(client)
+        delta.learn("ProjectA Review", "ProjectA")
+
+        result = delta.categorize_tasks(["ｐｒｏｊｅｃｔａ review"])
+
+        assert result == {"categories": [{"name": "ProjectA", "tasks": ["ｐｒｏｊｅｃｔａ review"]}]}
+        assert model.prompts == []
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_results_merge_into_prior_mapping(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        client.model = FakeDeltaModel(  # type: ignore[assignment]
+            [{"categories": [{"name": "ProjectB", "tasks": ["ProjectB Kickoff"]}]}]
+        )
+        delta = DeltaCategorizer(client)
+        delta.learn("ProjectA Review", "ProjectA")
+
+        delta.categorize_tasks(["ProjectB Kickoff"])
+
+        assert delta.categories == {
+            "categories": [
+                {"name": "ProjectA", "tasks": ["ProjectA Review"]},
+                {"name": "ProjectB", "tasks": ["ProjectB Kickoff"]},
+            ]
+        }
+
+
+class FailingModel:
+    def generate_content(self, prompt: str) -> FakeResponse:
+        raise RuntimeError("503 The model is overloaded")
+
+
+class TestDeltaErrors:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_failed_request_is_not_learned(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        client.model = FailingModel()  # type: ignore[assignment]
+        delta = DeltaCategorizer(client)
+
+        with pytest.raises(RuntimeError):
+            delta.categorize_tasks(["週次定例"])
+
+        assert len(delta) == 0
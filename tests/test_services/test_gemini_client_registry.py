@@ -0,0 +1,78 @@
+import gc
+import threading
+import weakref
+from typing import Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.categorizer_chain import CategorizerChain
+from src.services.gemini_client import GeminiClient, clear_clients, get_client
+from src.services.request_scheduler import RequestScheduler
+
+
+@pytest.fixture(autouse=True)
+def empty_registry() -> Iterator[None]:
+    clear_clients()
+    yield
+    clear_clients()
+
+
+class TestGeminiClientRegistry:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_get_client_reuses_instance(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        first = get_client("test_key")
+        second = get_client("test_key")
+
+        assert first is second
+        mock_configure.assert_called_once_with(api_key="test_key")
+        mock_model_class.assert_called_once()
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_get_client_separates_keys_only(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        first = get_client("test_key")
+        other_key = get_client("other_key")
+
+        assert first is not other_key
+        assert first.scheduler is None
+        assert mock_configure.call_count == 2
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_chains_with_new_schedulers_share_the_client_without_keeping_them(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock
+    ) -> None:
+        schedulers: List["weakref.ref[RequestScheduler]"] = []
+        for _ in range(3):
+            scheduler = RequestScheduler()
+            chain = CategorizerChain("test_key", scheduler=scheduler)
+            assert chain.delta.client is get_client("test_key")
+            scheduler.close()
+            schedulers.append(weakref.ref(scheduler))
+        del scheduler, chain
+        gc.collect()
+
+        mock_configure.assert_called_once_with(api_key="test_key")
+        assert all(ref() is None for ref in schedulers)
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_concurrent_callers_share_one_client(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        clients: List[GeminiClient] = []
+        barrier = threading.Barrier(8)
+
+        def fetch() -> None:
+            barrier.wait()
+            clients.append(get_client("test_key"))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(clients) == 8
+        assert all(client is clients[0] for client in clients)
+        mock_configure.assert_called_once()
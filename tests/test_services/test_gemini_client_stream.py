@@ -0,0 +1,94 @@
+import json
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock, patch
+
+from src.services.gemini_client import DeltaCategorizer, GeminiClient
+
+
+class FakeChunk:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeStreamingModel:
+    def __init__(self, reply: Dict[str, Any], chunk_size: int = 7) -> None:
+        self.text = "```json\n" + json.dumps(reply, ensure_ascii=False) + "\n```"
+        self.chunk_size = chunk_size
+        self.chunks_sent = 0
+        self.streamed: List[bool] = []
+
+    def generate_content(self, prompt: str, stream: bool = False) -> Iterator[FakeChunk]:
+        self.streamed.append(stream)
+        for start in range(0, len(self.text), self.chunk_size):
+            self.chunks_sent += 1
+            yield FakeChunk(self.text[start : start + self.chunk_size])
+
+
+REPLY = {
+    "categories": [
+        {"name": "ProjectA", "tasks": ["ProjectA Review", "ProjectA Design"]},
+        {"name": "ProjectB", "tasks": ["ＰＲＯＪＥＣＴＢ kickoff", "Unrequested"]},
+    ]
+}
+TASKS = ["ProjectA Review", "ProjectA Design", "ProjectB Kickoff", "Lunch"]
+
+
+class TestGeminiClientStreaming:
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_categories_are_reported_while_streaming(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock
+    ) -> None:
+        client = GeminiClient(api_key="test_key")
+        model = FakeStreamingModel(REPLY)
+        client.model = model  # type: ignore[assignment]
+        reported: List[Dict[str, Any]] = []
+        chunks_at_report: List[int] = []
+
+        def on_category(category: Dict[str, Any]) -> None:
+            reported.append(category)
+            chunks_at_report.append(model.chunks_sent)
+
+        result = client.categorize_tasks(TASKS, on_category=on_category)
+
+        assert model.streamed == [True]
+        assert reported == [
+            {"name": "ProjectA", "tasks": ["ProjectA Review", "ProjectA Design"]},
+            {"name": "ProjectB", "tasks": ["ProjectB Kickoff"]},
+        ]
+        assert chunks_at_report[0] < model.chunks_sent
+        assert result == {
+            "categories": [
+                {"name": "ProjectA", "tasks": ["ProjectA Review", "ProjectA Design"]},
+                {"name": "ProjectB", "tasks": ["ProjectB Kickoff"]},
+                {"name": "その他", "tasks": ["Lunch"]},
+            ]
+        }
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_stream_failure_falls_back_to_mock(self, mock_model_class: MagicMock, mock_configure: MagicMock) -> None:
+        client = GeminiClient(api_key="test_key")
+        client.model = MagicMock()
+        client.model.generate_content.side_effect = Exception("API Error")
+
+        result = client.categorize_tasks(["プロジェクトA開発"], on_category=lambda category: None)
+
+        assert result == {"categories": [{"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]}]}
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_delta_categorizer_reports_known_spelling(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock
+    ) -> None:
+        client = GeminiClient(api_key="test_key")
+        client.model = FakeStreamingModel(  # type: ignore[assignment]
+            {"categories": [{"name": "projecta", "tasks": ["ProjectA Design"]}]}
+        )
+        reported: List[Dict[str, Any]] = []
+        delta = DeltaCategorizer(client, on_category=reported.append)
+        delta.learn("ProjectA Review", "ProjectA")
+
+        delta.categorize_tasks(["ProjectA Design"])
+
+        assert reported == [{"name": "ProjectA", "tasks": ["ProjectA Design"]}]
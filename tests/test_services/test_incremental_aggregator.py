@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytest
+
+from src.models.session import Session
+from src.models.task_tracker import TaskTracker
+from src.services.category_aggregator import CategoryAggregator
+from src.services.incremental_aggregator import IncrementalAggregator
+
+
+class TestIncrementalAggregator:
+    def test_summary_matches_full_aggregation(self) -> None:
+        sessions = [
+            self._create_session("プロジェクトB会議", minutes=20),
+            self._create_session("プロジェクトA開発", minutes=30),
+            self._create_session("雑務", minutes=10),
+            self._create_session("プロジェクトA設計", minutes=40),
+            self._create_session("プロジェクトB会議", minutes=5),
+        ]
+        categories = self._categories()
+
+        aggregator = IncrementalAggregator(categories)
+        for session in sessions:
+            aggregator.on_task_event("stop", session)
+
+        assert aggregator.summarize() == CategoryAggregator().aggregate(sessions, categories)
+
+    def test_categories_set_after_sessions_move_existing_totals(self) -> None:
+        sessions = [
+            self._create_session("プロジェクトA開発", minutes=30),
+            self._create_session("プロジェクトB会議", minutes=20),
+        ]
+        aggregator = IncrementalAggregator()
+        for session in sessions:
+            aggregator.on_task_event("stop", session)
+
+        assert aggregator.summarize() == []
+
+        aggregator.set_categories(self._categories())
+
+        assert aggregator.summarize() == CategoryAggregator().aggregate(sessions, self._categories())
+
+    def test_recategorization_moves_only_changed_tasks(self) -> None:
+        aggregator = IncrementalAggregator(self._categories())
+        aggregator.on_task_event("stop", self._create_session("プロジェクトA開発", minutes=30))
+        aggregator.on_task_event("stop", self._create_session("プロジェクトA設計", minutes=40))
+
+        aggregator.set_categories(
+            {
+                "categories": [
+                    {"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]},
+                    {"name": "設計", "tasks": ["プロジェクトA設計"]},
+                ]
+            }
+        )
+        result = aggregator.summarize()
+
+        assert [category["name"] for category in result] == ["プロジェクトA", "設計"]
+        assert result[0]["total_seconds"] == 30 * 60
+        assert result[1]["total_seconds"] == 40 * 60
+        assert result[1]["tasks"][0]["name"] == "プロジェクトA設計"
+
+    def test_running_session_is_included_in_summary(self) -> None:
+        tracker = TaskTracker()
+        aggregator = IncrementalAggregator(self._categories())
+        aggregator.attach(tracker)
+
+        tracker.start_task("プロジェクトA開発")
+        running = aggregator.summarize()
+        tracker.stop_all()
+        stopped = aggregator.summarize()
+
+        expected = CategoryAggregator().aggregate(tracker.get_all_sessions(), self._categories())
+        assert running[0]["name"] == "プロジェクトA"
+        assert running[0]["total_seconds"] <= stopped[0]["total_seconds"]
+        assert _totals(stopped) == pytest.approx(_totals(expected))
+
+    def test_attach_includes_existing_sessions(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("プロジェクトA開発")
+        tracker.start_task("プロジェクトB会議")
+        tracker.stop_all()
+
+        aggregator = IncrementalAggregator(self._categories())
+        aggregator.attach(tracker)
+
+        expected = CategoryAggregator().aggregate(tracker.get_all_sessions(), self._categories())
+        assert _names(aggregator.summarize()) == _names(expected)
+        assert _totals(aggregator.summarize()) == pytest.approx(_totals(expected))
+
+    def test_removed_sessions_leave_the_summary(self) -> None:
+        tracker = TaskTracker()
+        tracker.sessions = [
+            self._create_session("プロジェクトA開発", minutes=30),
+            self._create_session("プロジェクトA設計", minutes=40),
+            self._create_session("プロジェクトB会議", minutes=20),
+            self._create_session("プロジェクトA開発", minutes=10),
+        ]
+        aggregator = IncrementalAggregator(self._categories())
+        aggregator.attach(tracker)
+
+        tracker.remove_sessions(tracker.sessions[:3])
+
+        result = aggregator.summarize()
+        assert result == CategoryAggregator().aggregate(tracker.sessions, self._categories())
+        assert [task["name"] for task in result[0]["tasks"]] == ["プロジェクトA開発"]
+        assert result[0]["total_seconds"] == 10 * 60
+
+    def test_categories_match_name_variants(self) -> None:
+        sessions = [
+            self._create_session("プロジェクトA開発", minutes=30),
+            self._create_session("ﾌﾟﾛｼﾞｪｸﾄA開発", minutes=10),
+        ]
+        categories: Dict[str, Any] = {"categories": [{"name": "プロジェクトA", "tasks": ["プロジェクトＡ開発"]}]}
+
+        aggregator = IncrementalAggregator(categories)
+        for session in sessions:
+            aggregator.on_task_event("stop", session)
+
+        result = aggregator.summarize()
+        assert result == CategoryAggregator().aggregate(sessions, categories)
+        assert result[0]["total_seconds"] == 40 * 60
+
+    def _categories(self) -> Dict[str, Any]:
+        return {
+            "categories": [
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA開発", "プロジェクトA設計"]},
+                {"name": "プロジェクトB", "tasks": ["プロジェクトB会議"]},
+            ]
+        }
+
+    def _create_session(self, task_name: str, minutes: int) -> Session:
+        session = Session(task_name)
+        session.start_time = datetime.now()
+        session.end_time = session.start_time + timedelta(minutes=minutes)
+        session.is_running = False
+        return session
+
+
+def _names(result: List[Dict[str, Any]]) -> List[str]:
+    return [category["name"] for category in result]
+
+
+def _totals(result: List[Dict[str, Any]]) -> List[float]:
+    return [category["total_seconds"] for category in result]
@@ -0,0 +1,265 @@
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.gemini_client import GeminiClient
+from src.services.request_scheduler import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    RequestScheduler,
+    TokenBucket,
+    backoff_delay,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity_has_no_delay(self) -> None:
+        bucket = TokenBucket(rate_per_minute=60)
+
+        delays = [bucket.reserve(1, now=0.0) for _ in range(60)]
+
+        assert delays == [0.0] * 60
+
+    def test_exhausted_bucket_returns_refill_delay(self) -> None:
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        bucket.reserve(2, now=0.0)
+
+        assert bucket.reserve(1, now=0.0) == pytest.approx(1.0)
+        assert bucket.reserve(1, now=0.0) == pytest.approx(2.0)
+
+    def test_bucket_refills_over_time(self) -> None:
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        bucket.reserve(2, now=0.0)
+
+        assert bucket.reserve(1, now=1.0) == 0.0
+
+    def test_rate_limiter_waits_for_slower_budget(self) -> None:
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60)
+
+        assert limiter.reserve(60, now=0.0) == 0.0
+        assert limiter.reserve(30, now=0.0) == pytest.approx(30.0)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_failures(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+        breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+    def test_half_opens_after_reset_timeout(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now += 10
+
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+
+    def test_failure_while_half_open_reopens(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 10
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+
+    def test_success_closes(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+
+        breaker.record_success()
+
+        assert breaker.state == "closed"
+
+
+class TestBackoffDelay:
+    def test_delay_is_bounded_by_exponential_ceiling(self) -> None:
+        rng = random.Random(0)
+
+        for attempt in range(10):
+            delay = backoff_delay(attempt, base=0.5, cap=8.0, rng=rng)
+            assert 0.0 <= delay <= min(8.0, 0.5 * 2**attempt)
+
+
+class TestRequestScheduler:
+    def test_submit_returns_result(self) -> None:
+        scheduler = RequestScheduler()
+
+        assert scheduler.submit(lambda: 42).result(timeout=5) == 42
+        scheduler.close()
+
+        metrics = scheduler.metrics()
+        assert metrics.submitted == 1
+        assert metrics.completed == 1
+        assert metrics.queue_depth == 0
+
+    def test_higher_priority_runs_first(self) -> None:
+        scheduler = RequestScheduler(max_workers=1)
+        order: List[str] = []
+
+        with scheduler._condition:
+            futures = [
+                scheduler.submit(lambda name=name: order.append(name), priority=priority)  # type: ignore[misc]
+                for name, priority in [("low", 0), ("high", 2), ("mid", 1), ("low2", 0)]
+            ]
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.close()
+
+        assert order == ["high", "mid", "low", "low2"]
+
+    def test_failed_requests_are_retried(self) -> None:
+        attempts: List[int] = []
+
+        def flaky() -> str:
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("quota exceeded")
+            return "ok"
+
+        scheduler = RequestScheduler(max_retries=3, backoff_base=0.001)
+
+        assert scheduler.submit(flaky).result(timeout=5) == "ok"
+        scheduler.close()
+        assert scheduler.metrics().retries == 2
+
+    def test_exhausted_retries_raise(self) -> None:
+        def failing() -> None:
+            raise RuntimeError("quota exceeded")
+
+        scheduler = RequestScheduler(max_retries=1, backoff_base=0.001, breaker=CircuitBreaker(failure_threshold=10))
+
+        with pytest.raises(RuntimeError):
+            scheduler.submit(failing).result(timeout=5)
+        scheduler.close()
+        assert scheduler.metrics().failed == 1
+
+    def test_open_circuit_rejects_requests(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        scheduler = RequestScheduler(breaker=breaker)
+
+        with pytest.raises(CircuitOpenError):
+            scheduler.submit(lambda: 42).result(timeout=5)
+        scheduler.close()
+        assert scheduler.metrics().rejected == 1
+
+    def test_rate_limit_smooths_bursts(self) -> None:
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+        limiter.requests = TokenBucket(rate_per_minute=600, capacity=1)
+        scheduler = RequestScheduler(limiter=limiter)
+
+        futures = [scheduler.submit(lambda: None) for _ in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.close()
+
+        metrics = scheduler.metrics()
+        assert metrics.completed == 3
+        assert metrics.max_wait >= 0.15
+
+    def test_close_fails_requests_waiting_on_rate_limit(self) -> None:
+        limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=1_000_000)
+        scheduler = RequestScheduler(limiter=limiter)
+        first = scheduler.submit(lambda: 1)
+        waiting = [scheduler.submit(lambda: 2) for _ in range(2)]
+        assert first.result(timeout=5) == 1
+
+        started = time.monotonic()
+        scheduler.close()
+
+        assert time.monotonic() - started < 1.0
+        for future in waiting:
+            with pytest.raises(CircuitOpenError):
+                future.result(timeout=1)
+        assert scheduler.metrics().rejected == 2
+
+    def test_close_does_not_wait_for_queued_requests_or_calls_in_flight(self) -> None:
+        started_call = threading.Event()
+        release = threading.Event()
+
+        def blocking_call() -> bool:
+            started_call.set()
+            return release.wait()
+
+        def failing() -> None:
+            raise RuntimeError("quota exceeded")
+
+        scheduler = RequestScheduler(max_workers=1, backoff_base=30.0, backoff_cap=30.0, rng=random.Random(1))
+        in_flight = scheduler.submit(blocking_call)
+        assert started_call.wait(timeout=5)
+        backlog = scheduler.submit(lambda: 42)
+        retrying = scheduler.submit(failing)
+
+        started = time.monotonic()
+        scheduler.close()
+
+        assert time.monotonic() - started < 1.0
+        for future in (backlog, retrying):
+            with pytest.raises(CircuitOpenError):
+                future.result(timeout=1)
+        release.set()
+        assert in_flight.result(timeout=5) is True
+
+    def test_gemini_client_routes_through_scheduler(self) -> None:
+        scheduler = RequestScheduler()
+        calls: List[str] = []
+        lock = threading.Lock()
+
+        with patch("google.generativeai.configure"), patch("google.generativeai.GenerativeModel"):
+            client = GeminiClient(api_key="test_key", scheduler=scheduler)
+
+        def request_categories(
+            tasks: List[str], category_names: Sequence[str] = (), on_category: Optional[Any] = None
+        ) -> Dict[str, Any]:
+            with lock:
+                calls.append(threading.current_thread().name)
+            return {"categories": [{"name": "A", "tasks": tasks}]}
+
+        client.request_categories = request_categories  # type: ignore[method-assign]
+
+        result = client.categorize_tasks(["task"])
+        scheduler.close()
+
+        assert result == {"categories": [{"name": "A", "tasks": ["task"]}]}
+        assert calls[0].startswith("llm-request")
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    def test_gemini_client_falls_back_when_circuit_is_open(
+        self, mock_model_class: MagicMock, mock_configure: MagicMock
+    ) -> None:
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        scheduler = RequestScheduler(breaker=breaker)
+        client = GeminiClient(api_key="test_key", scheduler=scheduler)
+
+        result = client.categorize_tasks(["プロジェクトA開発"])
+        scheduler.close()
+
+        assert result == {"categories": [{"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]}]}
+        mock_model_class.return_value.generate_content.assert_not_called()
@@ -0,0 +1,212 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from src.services.rule_categorizer import (
+    DEFAULT_RULES,
+    CategoryRule,
+    RuleCategorizer,
+    RuleFirstCategorizer,
+    load_rules,
+)
+
+
+class FakeCategorizer:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        self.calls.append(list(tasks))
+        return {"categories": [{"name": "LLM", "tasks": tasks}]}
+
+
+class TestRuleCategorizer:
+    def test_keyword_matches_anywhere_case_insensitively(self) -> None:
+        categorizer = RuleCategorizer([CategoryRule("keyword", "Standup", "Meetings")])
+
+        assert categorizer.categorize("daily STANDUP notes") == "Meetings"
+        assert categorizer.categorize("daily notes") is None
+
+    def test_rules_match_full_width_and_spacing_variants(self) -> None:
+        categorizer = RuleCategorizer([CategoryRule("prefix", "Daily Report", "Reports"), *DEFAULT_RULES])
+
+        assert categorizer.categorize("ＤＡＩＬＹ　 report 10/17") == "Reports"
+        assert categorizer.categorize("プロジェクトＢ会議") == "プロジェクトB"
+
+    def test_overlapping_keywords_resolve_by_rule_order(self) -> None:
+        categorizer = RuleCategorizer(
+            [
+                CategoryRule("keyword", "review", "Review"),
+                CategoryRule("keyword", "code", "Coding"),
+                CategoryRule("keyword", "she", "She"),
+                CategoryRule("keyword", "hers", "Hers"),
+            ]
+        )
+
+        assert categorizer.categorize("code review") == "Review"
+        assert categorizer.categorize("ushers") == "She"
+        assert categorizer.categorize("hers") == "Hers"
+
+    def test_prefix_only_matches_at_start(self) -> None:
+        categorizer = RuleCategorizer([CategoryRule("prefix", "OPS-", "Operations")])
+
+        assert categorizer.categorize("ops-123 deploy") == "Operations"
+        assert categorizer.categorize("deploy OPS-123") is None
+
+    def test_regex_category_comes_from_capture_group(self) -> None:
+        categorizer = RuleCategorizer(DEFAULT_RULES)
+
+        assert categorizer.categorize("プロジェクトX React開発") == "プロジェクトX"
+        assert categorizer.categorize("ABC案件 見積もり") == "ABC案件"
+        assert categorizer.categorize("メール返信") is None
+
+    def test_regex_rule_order_wins_over_match_position(self) -> None:
+        categorizer = RuleCategorizer(
+            [
+                CategoryRule("regex", r"(Project[A-Z])"),
+                CategoryRule("regex", r"(プロジェクト[A-Z])"),
+            ]
+        )
+
+        assert categorizer.categorize("プロジェクトB と ProjectA") == "ProjectA"
+
+    def test_regex_with_fixed_category(self) -> None:
+        categorizer = RuleCategorizer([CategoryRule("regex", r"^#\d+", "Tickets")])
+
+        assert categorizer.categorize("#42 fix login") == "Tickets"
+
+    def test_earliest_rule_wins_across_kinds(self) -> None:
+        categorizer = RuleCategorizer(
+            [
+                CategoryRule("regex", r"(Project[A-Z])"),
+                CategoryRule("keyword", "meeting", "Meetings"),
+            ]
+        )
+
+        assert categorizer.categorize("ProjectA meeting") == "ProjectA"
+        assert categorizer.categorize("team meeting") == "Meetings"
+
+    def test_categorize_tasks_puts_unmatched_in_other(self) -> None:
+        categorizer = RuleCategorizer(DEFAULT_RULES)
+
+        result = categorizer.categorize_tasks(["雑務", "プロジェクトA開発", "勉強会"])
+
+        assert result == {
+            "categories": [
+                {"name": "その他", "tasks": ["雑務", "勉強会"]},
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]},
+            ]
+        }
+
+    def test_load_rules_from_json(self, tmp_path: Path) -> None:
+        path = tmp_path / "rules.json"
+        path.write_text(
+            json.dumps(
+                {"rules": [{"category": "社内", "keywords": ["定例"], "prefixes": ["社内"], "patterns": [r"^1on1"]}]}
+            ),
+            encoding="utf-8",
+        )
+
+        rules = load_rules(str(path))
+
+        assert rules == [
+            CategoryRule("keyword", "定例", "社内"),
+            CategoryRule("prefix", "社内", "社内"),
+            CategoryRule("regex", r"^1on1", "社内"),
+        ]
+
+    def test_load_rules_rejects_invalid_pattern(self, tmp_path: Path) -> None:
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"rules": [{"category": "社内", "patterns": ["(unclosed"]}]}), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Invalid pattern '\\(unclosed'"):
+            load_rules(str(path))
+
+    def test_load_rules_rejects_pattern_without_category_or_group(self, tmp_path: Path) -> None:
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"rules": [{"patterns": ["^1on1"]}]}), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="needs a category or a capture group"):
+            load_rules(str(path))
+
+    def test_standalone_only_patterns_are_matched_separately(self) -> None:
+        categorizer = RuleCategorizer(
+            [
+                CategoryRule("regex", r"(?i)meeting", "Meetings"),
+                CategoryRule("regex", r"(\w)\1{2}", "Repeats"),
+                CategoryRule("regex", r"(?P<ticket>[A-Z]+-\d+)"),
+                CategoryRule("regex", r"(?P<ticket>#\d+)"),
+            ]
+            + DEFAULT_RULES
+        )
+
+        assert categorizer.categorize("Team MEETING") == "Meetings"
+        assert categorizer.categorize("zzz cleanup") == "Repeats"
+        assert categorizer.categorize("fix ABC-12") == "ABC-12"
+        assert categorizer.categorize("fix #42") == "#42"
+        assert categorizer.categorize("プロジェクトA開発") == "プロジェクトA"
+
+    def test_separate_pattern_keeps_rule_order(self) -> None:
+        categorizer = RuleCategorizer(
+            [
+                CategoryRule("regex", r"(?i)review", "Reviews"),
+                CategoryRule("regex", r"(Project[A-Z])"),
+            ]
+        )
+
+        assert categorizer.categorize("ProjectA Review") == "Reviews"
+        assert categorizer.categorize("ProjectA design") == "ProjectA"
+
+    def test_rule_order_holds_within_runs_split_by_a_separate_pattern(self) -> None:
+        categorizer = RuleCategorizer(
+            [
+                CategoryRule("regex", r"(Project[A-Z])"),
+                CategoryRule("regex", r"(?i)review", "Reviews"),
+                CategoryRule("regex", r"(プロジェクト[A-Z])"),
+                CategoryRule("regex", r"(Task\d)"),
+            ]
+        )
+
+        assert categorizer.categorize("Task1 プロジェクトB") == "プロジェクトB"
+        assert categorizer.categorize("Task1 review ProjectC") == "ProjectC"
+        assert categorizer.categorize("Task1 review") == "Reviews"
+        assert categorizer.categorize("Task1 設計") == "Task1"
+
+
+class TestRuleFirstCategorizer:
+    def test_only_unresolved_tasks_reach_fallback(self) -> None:
+        fallback = FakeCategorizer()
+        categorizer = RuleFirstCategorizer(RuleCategorizer(DEFAULT_RULES), fallback)
+
+        result = categorizer.categorize_tasks(["プロジェクトA開発", "雑務", "プロジェクトA開発"])
+
+        assert fallback.calls == [["雑務"]]
+        assert result == {
+            "categories": [
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]},
+                {"name": "LLM", "tasks": ["雑務"]},
+            ]
+        }
+        assert categorizer.resolved_locally == 1
+        assert categorizer.sent_to_fallback == 1
+
+    def test_rule_matches_are_reported_before_fallback(self) -> None:
+        fallback = FakeCategorizer()
+        reported: List[Tuple[Dict[str, Any], int]] = []
+        categorizer = RuleFirstCategorizer(
+            RuleCategorizer(DEFAULT_RULES), fallback, lambda category: reported.append((category, len(fallback.calls)))
+        )
+
+        categorizer.categorize_tasks(["プロジェクトA開発", "雑務"])
+
+        assert reported == [({"name": "プロジェクトA", "tasks": ["プロジェクトA開発"]}, 0)]
+
+    def test_fallback_is_skipped_when_everything_resolves(self) -> None:
+        fallback = FakeCategorizer()
+        categorizer = RuleFirstCategorizer(RuleCategorizer(DEFAULT_RULES), fallback)
+
+        categorizer.categorize_tasks(["ProjectX design"])
+
+        assert fallback.calls == []
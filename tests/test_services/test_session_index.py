@@ -0,0 +1,157 @@
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from src.models.session import Session
+from src.models.task_tracker import TaskTracker
+from src.services.session_index import SessionIndex
+
+
+class TestSessionIndex:
+    def test_overlapping_returns_sessions_in_window(self) -> None:
+        index = SessionIndex(self._create_day())
+
+        slices = index.overlapping(datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 12, 30))
+
+        assert [s.session.task_name for s in slices] == ["Task 1", "Task 2", "Task 3"]
+
+    def test_sessions_are_clipped_to_window(self) -> None:
+        index = SessionIndex(self._create_day())
+
+        slices = index.overlapping(datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 12, 30))
+
+        assert slices[0].start_time == datetime(2024, 1, 1, 10, 30)
+        assert slices[0].end_time == datetime(2024, 1, 1, 11, 0)
+        assert slices[0].duration == 30 * 60
+        assert slices[2].start_time == datetime(2024, 1, 1, 12, 0)
+        assert slices[2].end_time == datetime(2024, 1, 1, 12, 30)
+
+    def test_window_outside_sessions_is_empty(self) -> None:
+        index = SessionIndex(self._create_day())
+
+        assert index.overlapping(datetime(2024, 1, 1, 8, 0), datetime(2024, 1, 1, 9, 0)) == []
+        assert index.overlapping(datetime(2024, 1, 2, 8, 0), datetime(2024, 1, 2, 9, 0)) == []
+
+    def test_unknown_pause_layout_is_clipped_proportionally(self) -> None:
+        session = self._create_session("Task 1", datetime(2024, 1, 1, 10, 0), minutes=60)
+        session.paused_time = 20 * 60
+        index = SessionIndex([session])
+
+        slices = index.overlapping(datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 10, 30))
+
+        assert slices[0].duration == 20 * 60
+
+    def test_pauses_seen_through_tracker_are_clipped_exactly(self) -> None:
+        tracker = TaskTracker()
+        index = SessionIndex()
+        index.attach(tracker)
+        tracker.start_task("Task 1")
+        time.sleep(0.05)
+        tracker.pause_current()
+        time.sleep(0.1)
+        tracker.resume_current()
+        time.sleep(0.05)
+        tracker.stop_all()
+        session = tracker.sessions[0]
+        assert session.start_time is not None
+
+        before_pause = index.overlapping(session.start_time, session.start_time + timedelta(milliseconds=40))
+        whole = index.overlapping(session.start_time, session.start_time + timedelta(seconds=1))
+
+        assert before_pause[0].duration == 0.04
+        assert abs(whole[0].duration - session.get_duration()) < 1e-5
+
+    def test_current_pause_is_clipped_exactly(self) -> None:
+        tracker = TaskTracker()
+        tracker.start_task("Task 1")
+        time.sleep(0.05)
+        tracker.pause_current()
+        index = SessionIndex()
+        index.attach(tracker)
+        time.sleep(0.05)
+        session = tracker.sessions[0]
+        assert session.start_time is not None
+
+        slices = index.overlapping(session.start_time, datetime.now() + timedelta(seconds=1))
+
+        assert abs(slices[0].duration - session.get_duration()) < 1e-5
+
+    def test_sessions_of_every_length_are_found_by_overlap(self) -> None:
+        start = datetime(2024, 1, 1)
+        sessions = [
+            self._create_session(f"Task {minutes}", start + timedelta(minutes=minutes * 7), minutes=minutes)
+            for minutes in (1, 2, 5, 30, 90, 600, 3000)
+        ]
+        index = SessionIndex(sessions)
+
+        for window_minutes in range(0, 4000, 45):
+            window_start = start + timedelta(minutes=window_minutes)
+            window_end = window_start + timedelta(minutes=30)
+            expected = [
+                s.task_name
+                for s in sessions
+                if s.start_time is not None
+                and s.end_time is not None
+                and s.start_time < window_end
+                and s.end_time > window_start
+            ]
+            assert [s.session.task_name for s in index.overlapping(window_start, window_end)] == expected
+
+    def test_out_of_order_sessions_are_indexed(self) -> None:
+        sessions = self._create_day()
+        index = SessionIndex(reversed(sessions))
+
+        slices = index.overlapping(datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 1, 18, 0))
+
+        assert [s.session.task_name for s in slices] == ["Task 1", "Task 2", "Task 3"]
+
+    def test_long_session_spanning_later_ones_is_found(self) -> None:
+        long_session = self._create_session("Long", datetime(2024, 1, 1, 9, 0), minutes=600)
+        index = SessionIndex([long_session] + self._create_day())
+
+        slices = index.overlapping(datetime(2024, 1, 1, 15, 0), datetime(2024, 1, 1, 16, 0))
+
+        assert [s.session.task_name for s in slices] == ["Long"]
+
+    def test_attached_index_follows_tracker(self) -> None:
+        tracker = TaskTracker()
+        index = SessionIndex()
+        index.attach(tracker)
+
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        now = datetime.now()
+        running = index.overlapping(now - timedelta(minutes=1), now + timedelta(minutes=1))
+        tracker.stop_all()
+
+        assert len(index) == 2
+        assert [s.session.task_name for s in running] == ["Task 1", "Task 2"]
+
+    def test_removed_sessions_are_not_found(self) -> None:
+        tracker = TaskTracker()
+        tracker.sessions = [
+            self._create_session("Task 1", datetime(2024, 1, 1, 9, 0), minutes=240),
+            *self._create_day(),
+        ]
+        index = SessionIndex()
+        index.attach(tracker)
+
+        tracker.remove_sessions(tracker.sessions[:2])
+        slices = index.overlapping(datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 1, 10, 30))
+
+        assert len(index) == 2
+        assert slices == []
+
+    def _create_day(self) -> List[Session]:
+        return [
+            self._create_session("Task 1", datetime(2024, 1, 1, 10, 0), minutes=60),
+            self._create_session("Task 2", datetime(2024, 1, 1, 11, 0), minutes=60),
+            self._create_session("Task 3", datetime(2024, 1, 1, 12, 0), minutes=60),
+        ]
+
+    def _create_session(self, task_name: str, start: datetime, minutes: int) -> Session:
+        session = Session(task_name)
+        session.start_time = start
+        session.end_time = start + timedelta(minutes=minutes)
+        session.is_running = False
+        return session
@@ -0,0 +1,139 @@
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.services.similarity_categorizer import SimilarityCategorizer, SimilarityFirstCategorizer  # noqa: E402
+
+
+class FakeCategorizer:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def categorize_tasks(self, tasks: List[str]) -> Dict[str, Any]:
+        self.calls.append(list(tasks))
+        return {"categories": [{"name": "社内", "tasks": tasks}]}
+
+
+class TestSimilarityCategorizer:
+    def test_near_duplicate_name_gets_same_category(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("プロジェクトA 打ち合わせ", "プロジェクトA")
+        index.add("経費精算", "社内")
+
+        assert index.categorize("プロジェクトA 打合せ") == "プロジェクトA"
+        assert index.categorize("経費精算 3月分") == "社内"
+
+    def test_unrelated_name_is_not_resolved(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("プロジェクトA 打ち合わせ", "プロジェクトA")
+
+        assert index.categorize("メール返信") is None
+
+    def test_ambiguous_match_between_categories_is_not_resolved(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("プロジェクトA 打ち合わせ", "プロジェクトA")
+        index.add("プロジェクトB 打ち合わせ", "プロジェクトB")
+
+        match = index.nearest(["プロジェクトC 打ち合わせ"])[0]
+
+        assert match is not None
+        assert match[2] == pytest.approx(0.0)
+        assert index.categorize("プロジェクトC 打ち合わせ") is None
+
+    def test_exact_name_scores_one(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("Design Review", "Reviews")
+
+        match = index.nearest(["design  review"])[0]
+
+        assert match is not None
+        assert match[0] == "Reviews"
+        assert match[1] == pytest.approx(1.0)
+
+    def test_relabel_updates_existing_row(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("経費精算", "その他")
+        index.add("経費精算", "社内")
+
+        assert len(index) == 1
+        assert index.categorize("経費精算") == "社内"
+
+    def test_index_grows_past_initial_capacity(self) -> None:
+        index = SimilarityCategorizer(dimensions=64)
+        index.extend((f"タスク{i}", f"カテゴリ{i % 3}") for i in range(SimilarityCategorizer.INITIAL_CAPACITY + 10))
+
+        assert len(index) == SimilarityCategorizer.INITIAL_CAPACITY + 10
+        assert index.nearest(["タスク5"])[0] is not None
+
+    def test_removed_row_is_filled_by_the_last_row(self) -> None:
+        index = SimilarityCategorizer()
+        index.extend([("経費精算", "社内"), ("ProjectA Review", "Reviews"), ("週次定例", "会議")])
+
+        index.remove("経費精算")
+
+        assert len(index) == 2
+        assert index.categorize("経費精算") is None
+        assert index.categorize("週次定例") == "会議"
+        assert index.categorize("ProjectA Review") == "Reviews"
+
+    def test_sync_keeps_given_labels_without_revectorizing(self) -> None:
+        index = SimilarityCategorizer()
+        index.extend([("経費精算", "社内"), ("週次定例", "会議")])
+
+        with patch.object(index, "_vectorize", wraps=index._vectorize) as mock_vectorize:
+            index.sync([("週次定例", "社内"), ("ProjectA Review", "Reviews")])
+
+        assert mock_vectorize.call_count == 1
+        assert len(index) == 2
+        assert index.categorize("経費精算") is None
+        assert index.categorize("週次定例") == "社内"
+
+    def test_empty_index_resolves_nothing(self) -> None:
+        index = SimilarityCategorizer()
+
+        assert index.partition(["タスク"]) == ({}, ["タスク"])
+
+
+class TestSimilarityFirstCategorizer:
+    def test_confident_matches_skip_fallback(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("プロジェクトA 打ち合わせ", "プロジェクトA")
+        fallback = FakeCategorizer()
+        categorizer = SimilarityFirstCategorizer(index, fallback)
+
+        result = categorizer.categorize_tasks(["プロジェクトA 打合せ", "経費精算"])
+
+        assert fallback.calls == [["経費精算"]]
+        assert result == {
+            "categories": [
+                {"name": "プロジェクトA", "tasks": ["プロジェクトA 打合せ"]},
+                {"name": "社内", "tasks": ["経費精算"]},
+            ]
+        }
+
+    def test_confident_matches_are_reported_before_fallback(self) -> None:
+        index = SimilarityCategorizer()
+        index.add("プロジェクトA 打ち合わせ", "プロジェクトA")
+        fallback = FakeCategorizer()
+        reported: List[Tuple[Dict[str, Any], int]] = []
+        categorizer = SimilarityFirstCategorizer(
+            index, fallback, lambda category: reported.append((category, len(fallback.calls)))
+        )
+
+        categorizer.categorize_tasks(["プロジェクトA 打合せ", "経費精算"])
+
+        assert reported == [({"name": "プロジェクトA", "tasks": ["プロジェクトA 打合せ"]}, 0)]
+
+    def test_fallback_answers_are_learned(self) -> None:
+        fallback = FakeCategorizer()
+        categorizer = SimilarityFirstCategorizer(SimilarityCategorizer(), fallback)
+
+        categorizer.categorize_tasks(["経費精算 3月分"])
+        categorizer.categorize_tasks(["経費精算 4月分"])
+
+        assert fallback.calls == [["経費精算 3月分"]]
+        assert categorizer.resolved_locally == 1
+        assert categorizer.sent_to_fallback == 1
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.models.session import Session, datetime_to_epoch_ns
+from src.models.task_tracker import TaskTracker
+from src.services.category_aggregator import CategoryAggregator
+from src.services.incremental_aggregator import IncrementalAggregator
+from src.services.session_index import SessionIndex
+
+np = pytest.importorskip("numpy")
+
+from src.storage.archive import ArchiveFormatError, SessionArchive, seal_sessions  # noqa: E402
+
+
+class TestSessionArchive:
+    def test_seal_moves_old_sessions_into_archive(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        tracker = self._tracker_with_days(["Task A", "Task B", "Task A"])
+
+        sealed = seal_sessions(tracker, path, before=datetime(2024, 1, 3))
+
+        assert sealed == 2
+        assert [s.task_name for s in tracker.sessions] == ["Task A"]
+        with SessionArchive(path) as archive:
+            assert len(archive) == 2
+            assert archive.task_names == ("Task A", "Task B")
+            assert archive.sessions.task_codes().tolist() == [0, 1]
+            assert archive.sessions.start_ns().tolist() == [
+                datetime_to_epoch_ns(datetime(2024, 1, 1, 10, 0, 0)),
+                datetime_to_epoch_ns(datetime(2024, 1, 2, 10, 0, 0)),
+            ]
+            assert archive.sessions.durations_ns().tolist() == [50 * 60 * 1_000_000_000] * 2
+
+    def test_rows_are_memory_mapped_without_copies(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        seal_sessions(self._tracker_with_days(["Task A"]), path, before=datetime(2024, 1, 2))
+
+        archive = SessionArchive(path)
+
+        assert not archive.sessions.rows.flags.owndata
+        assert not archive.sessions.rows.flags.writeable
+        archive.close()
+
+    def test_sealing_twice_extends_archive(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        tracker = self._tracker_with_days(["Task A", "Task B", "Task C"])
+
+        seal_sessions(tracker, path, before=datetime(2024, 1, 2))
+        seal_sessions(tracker, path, before=datetime(2024, 1, 4))
+
+        assert tracker.sessions == []
+        with SessionArchive(path) as archive:
+            assert archive.task_names == ("Task A", "Task B", "Task C")
+            assert archive.sessions.task_codes().tolist() == [0, 1, 2]
+
+    def test_between_selects_sessions_starting_in_range(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        seal_sessions(self._tracker_with_days(["Task A", "Task B", "Task C"]), path, before=datetime(2024, 1, 4))
+
+        with SessionArchive(path) as archive:
+            selected = archive.between(datetime(2024, 1, 2), datetime(2024, 1, 3))
+
+            assert len(selected) == 1
+            assert [archive.task_names[code] for code in selected.task_codes().tolist()] == ["Task B"]
+
+    def test_archived_sessions_can_be_aggregated(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        seal_sessions(self._tracker_with_days(["Task A", "Task B", "Task A"]), path, before=datetime(2024, 1, 4))
+        categories = {"categories": [{"name": "Project", "tasks": ["Task A", "Task B"]}]}
+
+        with SessionArchive(path) as archive:
+            result = CategoryAggregator().aggregate_store(archive.sessions, categories)
+
+        assert result[0]["total_seconds"] == 150 * 60
+        assert [task["name"] for task in result[0]["tasks"]] == ["Task A", "Task B"]
+
+    def test_sealing_updates_attached_components(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        tracker = self._tracker_with_days(["Task A", "Task B", "Task A"])
+        categories = {"categories": [{"name": "Project", "tasks": ["Task A", "Task B"]}]}
+        aggregator = IncrementalAggregator(categories)
+        aggregator.attach(tracker)
+        index = SessionIndex()
+        index.attach(tracker)
+
+        seal_sessions(tracker, path, before=datetime(2024, 1, 3))
+
+        result = aggregator.summarize()
+        assert result[0]["total_seconds"] == 50 * 60
+        assert [task["name"] for task in result[0]["tasks"]] == ["Task A"]
+        assert [s.session for s in index.overlapping(datetime(2024, 1, 1), datetime(2024, 1, 4))] == tracker.sessions
+
+    def test_invalid_archive_raises(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.archive"
+        path.write_bytes(b"x" * 64)
+
+        with pytest.raises(ArchiveFormatError):
+            SessionArchive(str(path))
+
+    def test_sealing_appends_without_rewriting_archived_rows(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.archive"
+        tracker = self._tracker_with_days(["Task A", "Task B", "Task C"])
+        seal_sessions(tracker, str(path), before=datetime(2024, 1, 3))
+        first_rows = path.read_bytes()[32:]
+        inode = path.stat().st_ino
+
+        seal_sessions(tracker, str(path), before=datetime(2024, 1, 4))
+
+        assert path.stat().st_ino == inode
+        assert path.read_bytes()[32 : 32 + len(first_rows)] == first_rows
+        with SessionArchive(str(path)) as archive:
+            assert len(archive) == 3
+            assert archive.task_names == ("Task A", "Task B", "Task C")
+
+    def test_sealing_an_earlier_session_keeps_rows_sorted(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        tracker = self._tracker_with_days(["Task A", "Task B"])
+        long_session = tracker.sessions[0]
+        long_session.end_time = datetime(2024, 1, 3, 12, 0)
+
+        seal_sessions(tracker, path, before=datetime(2024, 1, 3))
+        seal_sessions(tracker, path, before=datetime(2024, 1, 4))
+
+        with SessionArchive(path) as archive:
+            assert [archive.task_names[code] for code in archive.sessions.task_codes().tolist()] == ["Task A", "Task B"]
+            assert archive.sessions.start_ns().tolist() == sorted(archive.sessions.start_ns().tolist())
+
+    def test_between_includes_sessions_started_before_the_window(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        tracker = self._tracker_with_days(["Task A", "Task B", "Task C"])
+        tracker.sessions[0].end_time = datetime(2024, 1, 2, 12, 0)
+        seal_sessions(tracker, path, before=datetime(2024, 1, 4))
+
+        with SessionArchive(path) as archive:
+            selected = archive.between(datetime(2024, 1, 2, 11, 0), datetime(2024, 1, 2, 11, 30))
+            earlier = archive.between(datetime(2024, 1, 1, 12, 0), datetime(2024, 1, 1, 13, 0))
+
+            assert [archive.task_names[code] for code in selected.task_codes().tolist()] == ["Task A"]
+            assert [archive.task_names[code] for code in earlier.task_codes().tolist()] == ["Task A"]
+
+    def test_empty_archive_file_raises_format_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.archive"
+        path.write_bytes(b"")
+
+        with pytest.raises(ArchiveFormatError):
+            SessionArchive(str(path))
+
+    def test_closing_keeps_selected_rows_readable(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.archive")
+        seal_sessions(self._tracker_with_days(["Task A", "Task B"]), path, before=datetime(2024, 1, 3))
+
+        with SessionArchive(path) as archive:
+            selected = archive.between(datetime(2024, 1, 1), datetime(2024, 1, 3))
+
+        assert len(archive) == 0
+        assert selected.durations_ns().tolist() == [50 * 60 * 1_000_000_000] * 2
+
+    def _tracker_with_days(self, task_names: List[str]) -> TaskTracker:
+        tracker = TaskTracker()
+        for day, task_name in enumerate(task_names):
+            session = Session(task_name)
+            session.start_time = datetime(2024, 1, 1 + day, 10, 0, 0)
+            session.end_time = session.start_time + timedelta(hours=1)
+            session.paused_time = 10 * 60
+            session.is_running = False
+            tracker.sessions.append(session)
+        return tracker
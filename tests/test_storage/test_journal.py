@@ -0,0 +1,218 @@
+import gc
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.models.task_tracker import TaskTracker
+from src.storage.journal import JournalCorruptedError, SessionJournal
+
+
+class TestSessionJournal:
+    def test_load_without_journal_returns_empty_tracker(self, tmp_path: Path) -> None:
+        tracker = SessionJournal(str(tmp_path / "sessions.journal")).load()
+
+        assert tracker.sessions == []
+        assert tracker.current_session is None
+
+    def test_replay_restores_finished_sessions(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+        tracker.pause_current()
+        tracker.resume_current()
+        tracker.start_task("Task 2")
+        tracker.stop_all()
+        expected = [(s.task_name, s.start_time, s.end_time) for s in tracker.sessions]
+
+        restored = SessionJournal(path).load()
+
+        assert [(s.task_name, s.start_time, s.end_time) for s in restored.sessions] == expected
+        assert restored.current_session is None
+        for original, replayed in zip(tracker.sessions, restored.sessions):
+            assert replayed.get_duration() == pytest.approx(original.get_duration(), abs=1e-5)
+
+    def test_replay_restores_running_paused_session(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        tracker.pause_current()
+
+        restored = SessionJournal(path).load()
+
+        assert restored.current_session is not None
+        assert restored.current_session.task_name == "Task 2"
+        assert restored.current_session.is_running is True
+        assert restored.current_session.is_paused is True
+        restored.resume_current()
+        restored.stop_all()
+
+    def test_events_after_reload_are_appended(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+
+        journal = SessionJournal(path)
+        restored = journal.load()
+        journal.attach(restored)
+        restored.start_task("Task 2")
+        restored.stop_all()
+        journal.close()
+
+        replayed = SessionJournal(path).load()
+
+        assert [s.task_name for s in replayed.sessions] == ["Task 1", "Task 2"]
+        assert replayed.current_session is None
+
+    def test_torn_trailing_record_is_discarded(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+        tracker.stop_all()
+        size = os.path.getsize(path)
+        with open(path, "ab") as journal_file:
+            journal_file.write(b"\x01\x00\x00")
+
+        restored = SessionJournal(path).load()
+
+        assert [s.task_name for s in restored.sessions] == ["Task 1"]
+        assert os.path.getsize(path) == size
+
+    def test_compaction_truncates_journal_and_keeps_state(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        journal = SessionJournal(path, compact_every=3)
+        tracker = journal.load()
+        journal.attach(tracker)
+        for i in range(5):
+            tracker.start_task(f"Task {i % 2}")
+        tracker.pause_current()
+        journal.close()
+
+        assert os.path.exists(journal.snapshot_path)
+        assert os.path.getsize(path) < 5 * 2 * 16
+
+        restored = SessionJournal(path).load()
+
+        assert [s.task_name for s in restored.sessions] == [f"Task {i % 2}" for i in range(5)]
+        assert restored.current_session is not None
+        assert restored.current_session.is_paused is True
+
+    def test_stale_journal_after_interrupted_compaction_is_ignored(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        journal = SessionJournal(path)
+        tracker = journal.load()
+        journal.attach(tracker)
+        tracker.start_task("Task 1")
+        tracker.stop_all()
+        with open(path, "rb") as journal_file:
+            stale_journal = journal_file.read()
+        journal.compact(tracker)
+        journal.close()
+        with open(path, "wb") as journal_file:
+            journal_file.write(stale_journal)
+
+        restored = SessionJournal(path).load()
+
+        assert [s.task_name for s in restored.sessions] == ["Task 1"]
+
+    def test_removed_sessions_are_not_replayed(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        tracker.start_task("Task 3")
+
+        tracker.remove_sessions(tracker.sessions[:2])
+
+        restored = SessionJournal(path).load()
+        assert [s.task_name for s in restored.sessions] == ["Task 3"]
+        assert restored.current_session is not None
+
+    def test_invalid_journal_raises(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.journal"
+        path.write_bytes(b"not a journal file")
+
+        with pytest.raises(JournalCorruptedError):
+            SessionJournal(str(path)).load()
+
+    def test_failed_load_turns_the_collector_back_on(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.journal"
+        path.write_bytes(b"not a journal file")
+
+        with pytest.raises(JournalCorruptedError):
+            SessionJournal(str(path)).load()
+        assert gc.isenabled()
+
+    def test_quarantine_moves_corrupted_files_aside(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.journal"
+        path.write_bytes(b"not a journal file")
+        journal = SessionJournal(str(path))
+        with pytest.raises(JournalCorruptedError):
+            journal.load()
+
+        moved = journal.quarantine()
+        tracker = journal.load()
+        journal.attach(tracker)
+        tracker.start_task("Task 1")
+        journal.close()
+
+        assert [Path(moved_path).read_bytes() for moved_path in moved] == [b"not a journal file"]
+        assert [s.task_name for s in SessionJournal(str(path)).load().sessions] == ["Task 1"]
+
+    def test_last_event_of_a_burst_is_synced_after_the_interval(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        synced = threading.Event()
+        real_fsync = os.fsync
+
+        def fsync(fd: int) -> None:
+            real_fsync(fd)
+            synced.set()
+
+        journal = SessionJournal(str(tmp_path / "sessions.journal"), fsync_interval=0.05)
+        tracker = journal.load()
+        journal.attach(tracker)
+        monkeypatch.setattr(os, "fsync", fsync)
+        journal.sync()
+        synced.clear()
+
+        tracker.start_task("Task 1")
+
+        assert not synced.is_set()
+        assert synced.wait(timeout=2)
+        journal.close()
+
+    def test_pause_is_recorded_at_the_session_pause_instant(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+        tracker.pause_current()
+        tracker.resume_current()
+        tracker.stop_all()
+        paused_ns = tracker.sessions[0].get_paused_ns()
+
+        restored = SessionJournal(path).load()
+
+        assert restored.sessions[0].get_paused_ns() == paused_ns
+
+    def test_resume_after_restart_is_recorded_at_the_resume_instant(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.journal")
+        tracker = self._attached_tracker(path)
+        tracker.start_task("Task 1")
+        tracker.pause_current()
+        tracker = self._attached_tracker(path)
+        tracker.resume_current()
+        tracker.stop_all()
+        paused_ns = tracker.sessions[0].get_paused_ns()
+
+        restored = SessionJournal(path).load()
+
+        assert restored.sessions[0].get_paused_ns() == paused_ns
+
+    def _attached_tracker(self, path: str) -> TaskTracker:
+        journal = SessionJournal(path, fsync_interval=0)
+        tracker = journal.load()
+        journal.attach(tracker)
+        return tracker
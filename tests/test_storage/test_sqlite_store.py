@@ -0,0 +1,130 @@
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.session import Session
+from src.models.task_tracker import TaskTracker
+from src.storage.journal import SessionJournal
+from src.storage.sqlite_store import SqliteSessionStore
+
+
+class TestSqliteSessionStore:
+    def test_uses_wal_journal_mode(self, tmp_path: Path) -> None:
+        with SqliteSessionStore(str(tmp_path / "sessions.db")) as store:
+            (mode,) = store._connection.execute("PRAGMA journal_mode").fetchone()
+
+        assert mode == "wal"
+
+    def test_each_append_is_committed_immediately(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.db")
+        store = SqliteSessionStore(path)
+        store.append(self._create_session("Task A", 0))
+
+        with SqliteSessionStore(path) as reader:
+            assert len(reader) == 1
+        store.close()
+
+    def test_task_tracker_session_survives_without_close(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.db")
+        tracker = TaskTracker(store=SqliteSessionStore(path))
+        tracker.start_task("Task 1")
+        tracker.stop_all()
+
+        with SqliteSessionStore(path) as reader:
+            assert [s.task_name for s in reader.sessions_for_task("Task 1")] == ["Task 1"]
+
+    def test_sessions_between_queries_start_time_range(self, tmp_path: Path) -> None:
+        with SqliteSessionStore(str(tmp_path / "sessions.db")) as store:
+            store.extend(self._create_session(f"Task {day}", day) for day in range(5))
+
+            sessions = store.sessions_between(datetime(2024, 1, 2), datetime(2024, 1, 4))
+
+        assert [s.task_name for s in sessions] == ["Task 1", "Task 2"]
+        assert sessions[0].start_time == datetime(2024, 1, 2, 10, 0, 0)
+        assert sessions[0].get_duration() == 50 * 60
+
+    def test_sessions_for_task(self, tmp_path: Path) -> None:
+        with SqliteSessionStore(str(tmp_path / "sessions.db")) as store:
+            store.extend(self._create_session("Task A" if day % 2 else "Task B", day) for day in range(4))
+
+            sessions = store.sessions_for_task("Task A")
+
+        assert [s.start_time for s in sessions] == [datetime(2024, 1, 2, 10, 0, 0), datetime(2024, 1, 4, 10, 0, 0)]
+
+    def test_task_totals_are_summed_in_sql(self, tmp_path: Path) -> None:
+        with SqliteSessionStore(str(tmp_path / "sessions.db")) as store:
+            store.extend(self._create_session("Task A" if day % 2 else "Task B", day) for day in range(4))
+
+            totals = store.task_totals_between(datetime(2024, 1, 1), datetime(2024, 1, 4))
+
+        assert totals == {"Task B": 100 * 60, "Task A": 50 * 60}
+        assert list(totals) == ["Task B", "Task A"]
+
+    def test_task_tracker_writes_stopped_sessions(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.db")
+        store = SqliteSessionStore(path)
+        tracker = TaskTracker(store=store)
+        tracker.start_task("Task 1")
+        tracker.start_task("Task 2")
+        tracker.stop_all()
+        store.close()
+
+        with SqliteSessionStore(path) as reader:
+            assert len(reader) == 2
+
+    def test_storing_a_session_twice_keeps_one_row(self, tmp_path: Path) -> None:
+        session = self._create_session("Task A", 0)
+
+        with SqliteSessionStore(str(tmp_path / "sessions.db")) as store:
+            store.append(session)
+            store.extend([session, self._create_session("Task B", 0)])
+
+            assert len(store) == 2
+
+    def test_journal_restarts_do_not_duplicate_rows(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "sessions.db")
+        journal_path = str(tmp_path / "sessions.journal")
+        for restart in range(3):
+            with SqliteSessionStore(db_path) as store:
+                journal = SessionJournal(journal_path, fsync_interval=0)
+                tracker = journal.load(store=store)
+                journal.attach(tracker)
+                tracker.start_task(f"Task {restart}")
+                tracker.stop_all()
+                journal.detach()
+
+                assert len(tracker.sessions) == restart + 1
+                assert len(store) == restart + 1
+
+    def test_duplicates_from_older_databases_are_removed(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "sessions.db")
+        connection = sqlite3.connect(path)
+        connection.executescript(
+            "CREATE TABLE sessions (id INTEGER PRIMARY KEY, task_name TEXT NOT NULL, start_time INTEGER NOT NULL, "
+            "end_time INTEGER NOT NULL, paused_ns INTEGER NOT NULL);"
+            "INSERT INTO sessions (task_name, start_time, end_time, paused_ns) VALUES ('Task A', 1, 2, 0);"
+            "INSERT INTO sessions (task_name, start_time, end_time, paused_ns) VALUES ('Task A', 1, 2, 0);"
+        )
+        connection.commit()
+        connection.close()
+
+        with SqliteSessionStore(path) as store:
+            assert len(store) == 1
+
+    def test_running_session_cannot_be_stored(self, tmp_path: Path) -> None:
+        session = Session("Task 1")
+        session.start()
+
+        with SqliteSessionStore(str(tmp_path / "sessions.db")) as store:
+            with pytest.raises(AssertionError, match="Only stopped sessions can be stored"):
+                store.append(session)
+
+    def _create_session(self, task_name: str, day: int) -> Session:
+        session = Session(task_name)
+        session.start_time = datetime(2024, 1, 1, 10, 0, 0) + timedelta(days=day)
+        session.end_time = session.start_time + timedelta(hours=1)
+        session.paused_time = 10 * 60
+        session.is_running = False
+        return session
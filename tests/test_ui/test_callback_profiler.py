@@ -0,0 +1,137 @@
+import io
+import time
+import tkinter as tk
+from typing import Callable, Iterator, List
+from unittest.mock import Mock
+
+import pytest
+
+from src.ui import callback_profiler
+from src.ui.callback_profiler import CallbackProfiler, LatencyHistogram, callback_name
+
+
+@pytest.fixture
+def log() -> io.StringIO:
+    return io.StringIO()
+
+
+@pytest.fixture
+def profiler(log: io.StringIO) -> Iterator[CallbackProfiler]:
+    profiler = CallbackProfiler(log, budget_ms=5.0)
+    yield profiler
+    profiler.close()
+
+
+def _after_wrapper(func: Callable[[], None]) -> Callable[[], None]:
+    # Mirrors how tkinter's after() wraps its callback
+    def callit() -> None:
+        func()
+
+    callit.__name__ = func.__name__
+    return callit
+
+
+class Handler:
+    def on_click(self) -> None:
+        pass
+
+
+def _stuck_handler() -> None:
+    time.sleep(0.1)
+
+
+class TestCallbackName:
+    def test_bound_method_is_named_by_class(self) -> None:
+        assert callback_name(Handler().on_click) == "Handler.on_click"
+
+    def test_after_wrapper_is_unwrapped(self) -> None:
+        assert callback_name(_after_wrapper(Handler().on_click)) == "Handler.on_click"
+
+
+class TestLatencyHistogram:
+    def test_percentiles_use_bucket_bounds_capped_at_max(self) -> None:
+        histogram = LatencyHistogram()
+        for elapsed_ms in [0.5] * 90 + [3.0] * 9 + [40.0]:
+            histogram.add(elapsed_ms, 16.0)
+
+        assert histogram.count == 100
+        assert histogram.percentile(0.5) == 1.0
+        assert histogram.percentile(0.95) == 4.0
+        assert histogram.percentile(1.0) == 40.0
+        assert histogram.slow == 1
+        assert histogram.mean_ms == pytest.approx(1.12)
+
+    def test_empty_histogram_reports_zero(self) -> None:
+        assert LatencyHistogram().percentile(0.99) == 0.0
+
+
+class TestCallbackProfiler:
+    def test_fast_callbacks_are_recorded_but_not_logged(self, profiler: CallbackProfiler, log: io.StringIO) -> None:
+        for _ in range(3):
+            with profiler.measure("MainWindow._on_start_click"):
+                pass
+
+        assert profiler.histograms["MainWindow._on_start_click"].count == 3
+        assert profiler.slow_calls == 0
+        assert log.getvalue() == ""
+
+    def test_slow_callback_is_logged_with_stack_sample(self, profiler: CallbackProfiler, log: io.StringIO) -> None:
+        with profiler.measure("MainWindow._on_stop_click"):
+            _stuck_handler()
+
+        output = log.getvalue()
+        assert profiler.slow_calls == 1
+        assert "Slow UI callback MainWindow._on_stop_click" in output
+        assert "in _stuck_handler" in output
+
+    def test_nested_sections_are_timed_separately(self, profiler: CallbackProfiler, log: io.StringIO) -> None:
+        with profiler.measure("MainWindow._on_stop_click"):
+            with profiler.measure("SummaryScreen.__init__"):
+                time.sleep(0.02)
+
+        assert profiler.histograms["SummaryScreen.__init__"].slow == 1
+        assert profiler.histograms["MainWindow._on_stop_click"].slow == 1
+        assert profiler.slow_calls == 1
+        assert "Slow UI callback SummaryScreen.__init__" in log.getvalue()
+
+    def test_install_times_tk_callbacks(self, profiler: CallbackProfiler) -> None:
+        original = tk.CallWrapper
+        calls: List[int] = []
+        profiler.install()
+        try:
+            wrapper = tk.CallWrapper(_after_wrapper(lambda: calls.append(1)), None, Mock())
+            wrapper()
+        finally:
+            profiler.uninstall()
+
+        assert tk.CallWrapper is original
+        assert calls == [1]
+        assert [name for name in profiler.histograms] == [
+            "TestCallbackProfiler.test_install_times_tk_callbacks.<locals>.<lambda>"
+        ]
+
+    def test_module_measure_reports_to_installed_profiler_only(self, profiler: CallbackProfiler) -> None:
+        with callback_profiler.measure("SummaryScreen.__init__"):
+            pass
+        assert profiler.histograms == {}
+
+        profiler.install()
+        try:
+            with callback_profiler.measure("SummaryScreen.__init__"):
+                pass
+        finally:
+            profiler.uninstall()
+        assert profiler.histograms["SummaryScreen.__init__"].count == 1
+
+    def test_close_dumps_stats_slowest_first(self, log: io.StringIO) -> None:
+        profiler = CallbackProfiler(log, budget_ms=5.0)
+        with profiler.measure("MainWindow._update_task_list"):
+            pass
+        with profiler.measure("MainWindow._on_stop_click"):
+            time.sleep(0.01)
+
+        profiler.close()
+
+        report = log.getvalue().split("UI callback latency", 1)[1].splitlines()
+        assert report[2].startswith("MainWindow._on_stop_click")
+        assert report[3].startswith("MainWindow._update_task_list")
@@ -1,4 +1,6 @@
 import tkinter as tk
+from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
 from src.ui.main_window import MainWindow
@@ -47,6 +49,19 @@ class TestMainWindow:
 
         assert window.start_button["state"] == "normal"
 
+    @patch("src.ui.main_window.messagebox")
+    def test_corrupted_journal_starts_fresh(self, mock_messagebox: Mock, tmp_path: Path, monkeypatch: Any) -> None:
+        journal_path = tmp_path / "sessions.journal"
+        journal_path.write_bytes(b"not a journal file")
+        monkeypatch.setenv("TASK_TRACKER_JOURNAL", str(journal_path))
+
+        window = MainWindow()
+
+        assert window.task_tracker.sessions == []
+        mock_messagebox.showwarning.assert_called_once()
+        assert list(tmp_path.glob("sessions.journal.corrupt-*"))
+        window.root.destroy()
+
     def test_main_window_has_task_tracker(self) -> None:
         window = MainWindow()
 
@@ -57,6 +72,7 @@ class TestMainWindow:
     def test_start_button_starts_new_task(self, mock_tracker_class: Mock) -> None:
         mock_tracker = Mock()
         mock_tracker.get_all_sessions.return_value = []
+        mock_tracker.sessions = []
         mock_tracker.current_session = None
         mock_tracker_class.return_value = mock_tracker
 
@@ -135,6 +151,57 @@ class TestMainWindow:
         for i in range(3):
             assert f"Task {i+1}" in window.task_list.get(i)
 
+    def test_task_switch_appends_row_and_finishes_previous_row(self) -> None:
+        window = MainWindow()
+        window.task_input.insert(0, "Task 1")
+        window._on_start_click()
+        window.task_input.insert(0, "Task 2")
+        window._on_start_click()
+
+        assert window.task_list.size() == 2
+        assert not window.task_list.get(0).endswith("▶")
+        assert window.task_list.get(1).endswith("▶")
+
+    def test_tick_only_rewrites_running_row(self) -> None:
+        window = MainWindow()
+        for i in range(3):
+            window.task_input.insert(0, f"Task {i+1}")
+            window._on_start_click()
+
+        with (
+            patch.object(window.task_list, "delete") as mock_delete,
+            patch.object(window, "_format_row", wraps=window._format_row) as mock_format,
+        ):
+            window._update_task_list()
+
+        assert [call.args[0] for call in mock_format.call_args_list] == [window.task_tracker.sessions[2]]
+        assert all(call.args == (2,) for call in mock_delete.call_args_list)
+
+    def test_removed_sessions_leave_the_task_list(self) -> None:
+        window = MainWindow()
+        for i in range(3):
+            window.task_input.insert(0, f"Task {i+1}")
+            window._on_start_click()
+        window.task_tracker.stop_all()
+
+        window.task_tracker.remove_sessions(window.task_tracker.sessions[:2])
+
+        assert window.task_list.size() == 1
+        assert "Task 3" in window.task_list.get(0)
+
+    def test_task_switches_keep_one_pending_tick(self) -> None:
+        window = MainWindow()
+        with (
+            patch.object(window.root, "after", return_value="after#1") as mock_after,
+            patch.object(window.root, "after_cancel") as mock_cancel,
+        ):
+            for i in range(3):
+                window.task_input.insert(0, f"Task {i+1}")
+                window._on_start_click()
+
+        assert mock_after.call_count == 3
+        assert mock_cancel.call_count == 2
+
     def test_main_window_has_stop_button(self) -> None:
         window = MainWindow()
 
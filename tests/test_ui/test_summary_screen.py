@@ -0,0 +1,179 @@
+import queue
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from src.models.session import Session
+from src.models.task_tracker import TaskTracker
+from src.services.category_aggregator import CategoryAggregator
+from src.services.session_index import SessionIndex
+from src.ui.summary_screen import SummaryScreen
+
+
+class FakeRoot:
+    def __init__(self) -> None:
+        self.pending: Dict[str, Callable[[], None]] = {}
+        self.destroyed = False
+        self._next_id = 0
+
+    def after(self, delay_ms: int, callback: Callable[[], None]) -> str:
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        del self.pending[after_id]
+
+    def destroy(self) -> None:
+        self.destroyed = True
+
+
+class FakeTree:
+    def __init__(self) -> None:
+        self.rows: Dict[str, Tuple[str, Tuple[str, str]]] = {}
+        self._next_id = 0
+
+    def insert(self, parent: str, index: Any, text: str = "", values: Tuple[str, str] = ("", "")) -> str:
+        self._next_id += 1
+        item = f"I{self._next_id}"
+        self.rows[item] = (text, values)
+        return item
+
+    def delete(self, *items: str) -> None:
+        for item in items:
+            del self.rows[item]
+
+
+class FakeChain:
+    # Stands in for CategorizerChain; streams the first category before returning or raising
+    error: Optional[Exception] = None
+
+    def __init__(self, api_key: str, scheduler: Any = None, on_category: Any = None) -> None:
+        self.on_category = on_category
+
+    def categorize_tasks(self, task_names: List[str]) -> Dict[str, Any]:
+        self.on_category({"name": "Project", "tasks": task_names[:1]})
+        if self.error is not None:
+            raise self.error
+        return {"categories": [{"name": "Other", "tasks": task_names[1:]}]}
+
+
+class TestSummaryScreenCategorization:
+    def test_worker_streams_categories_and_reports_done(self) -> None:
+        screen = self._create_screen()
+
+        with patch("src.services.categorizer_chain.CategorizerChain", FakeChain):
+            screen._run_categorization("key", ["Task A", "Task B"])
+
+        assert self._drain(screen) == [
+            ("categories", {"categories": [{"name": "Project", "tasks": ["Task A"]}]}),
+            ("categories", {"categories": [{"name": "Other", "tasks": ["Task B"]}]}),
+            ("done", None),
+        ]
+
+    def test_worker_reports_error_before_done(self) -> None:
+        screen = self._create_screen()
+
+        with (
+            patch("src.services.categorizer_chain.CategorizerChain", FakeChain),
+            patch.object(FakeChain, "error", RuntimeError("quota exceeded")),
+        ):
+            screen._run_categorization("key", ["Task A"])
+
+        assert self._drain(screen)[1:] == [("error", "quota exceeded"), ("done", None)]
+
+    def test_poll_shows_error_and_removes_loading_row_when_done(self) -> None:
+        screen = self._create_screen()
+        screen._results.put(("error", "quota exceeded"))
+        screen._results.put(("done", None))
+
+        screen._poll_results()
+
+        assert list(screen.category_tree.rows.values()) == [("エラー", ("quota exceeded", ""))]
+        assert screen._loading_item is None
+        assert screen._poll_id is None
+        assert screen.root.pending == {}
+
+    def test_poll_applies_categories_and_polls_again_until_done(self) -> None:
+        screen = self._create_screen()
+        categories = {"categories": [{"name": "Project", "tasks": ["Task A"]}]}
+        screen._results.put(("categories", categories))
+
+        with patch.object(screen, "_apply_categories") as mock_apply:
+            screen._poll_results()
+
+        mock_apply.assert_called_once_with(categories)
+        assert screen._loading_item in screen.category_tree.rows
+        assert list(screen.root.pending) == [screen._poll_id]
+
+    def test_close_cancels_pending_poll(self) -> None:
+        screen = self._create_screen()
+        screen._poll_results()
+
+        screen._on_close()
+
+        assert screen.root.pending == {}
+        assert screen._poll_id is None
+        assert screen.root.destroyed
+
+    def test_without_aggregator_categories_are_totalled_from_columns(self) -> None:
+        pytest.importorskip("numpy")
+        tracker = TaskTracker()
+        tracker.start_task("Task A")
+        tracker.start_task("Task B")
+        tracker.stop_all()
+        screen = self._create_screen()
+        screen.sessions = tracker.get_all_sessions()
+        screen.columns = tracker.get_session_columns()
+        screen.aggregator = None
+        screen._task_to_category = {}
+        categories = {"categories": [{"name": "Project", "tasks": ["Task A", "Task B"]}]}
+
+        with (
+            patch.object(screen, "_render_categories") as mock_render,
+            patch.object(CategoryAggregator, "aggregate", side_effect=AssertionError("sessions were scanned")),
+        ):
+            screen._apply_categories(categories)
+
+        (aggregated,) = mock_render.call_args.args
+        assert [task["name"] for task in aggregated[0]["tasks"]] == ["Task A", "Task B"]
+
+    def test_today_total_counts_only_the_part_after_midnight(self) -> None:
+        screen = self._create_screen()
+        now = datetime(2024, 1, 2, 12, 0)
+        screen.index = SessionIndex(
+            [
+                self._create_session("Yesterday", datetime(2024, 1, 1, 9, 0), minutes=60),
+                self._create_session("Overnight", datetime(2024, 1, 1, 23, 0), minutes=90),
+                self._create_session("Morning", datetime(2024, 1, 2, 9, 0), minutes=45),
+            ]
+        )
+
+        assert screen._today_text(now) == "本日の作業時間: 1:15:00"
+
+    def _create_session(self, task_name: str, start: datetime, minutes: int) -> Session:
+        session = Session(task_name)
+        session.start_time = start
+        session.end_time = start + timedelta(minutes=minutes)
+        session.is_running = False
+        return session
+
+    def _create_screen(self) -> Any:
+        # Built without __init__ so no Tk display is needed; only the state the worker and poll use is set
+        screen: Any = SummaryScreen.__new__(SummaryScreen)
+        screen.root = FakeRoot()
+        screen.category_tree = FakeTree()
+        screen.scheduler = None
+        screen._results = queue.Queue()
+        screen._poll_id = None
+        screen._loading_item = screen.category_tree.insert("", "end", text="分類中...", values=("1個のタスク", ""))
+        return screen
+
+    def _drain(self, screen: Any) -> List[Tuple[str, Any]]:
+        results = []
+        while not screen._results.empty():
+            results.append(screen._results.get_nowait())
+        return results
@@ -0,0 +1,133 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.ui.tick_scheduler import TickScheduler, delay_to_next_boundary
+
+
+class FakeRoot:
+    def __init__(self) -> None:
+        self.pending: Dict[str, Tuple[int, Callable[[], None]]] = {}
+        self.bindings: Dict[str, List[Callable[[Any], None]]] = {}
+        self.scheduled: List[int] = []
+        self._next_id = 0
+
+    def after(self, delay_ms: int, callback: Callable[[], None]) -> str:
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = (delay_ms, callback)
+        self.scheduled.append(delay_ms)
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        del self.pending[after_id]
+
+    def bind(self, sequence: str, callback: Callable[[Any], None], add: Optional[str] = None) -> None:
+        self.bindings.setdefault(sequence, []).append(callback)
+
+    def fire(self) -> None:
+        assert len(self.pending) == 1
+        _, (_, callback) = self.pending.popitem()
+        callback()
+
+    def send(self, sequence: str, widget: Any) -> None:
+        event = type("Event", (), {"widget": widget})()
+        for callback in self.bindings[sequence]:
+            callback(event)
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scheduler(root: FakeRoot, clock: FakeClock) -> TickScheduler:
+    return TickScheduler(root, clock=clock)  # type: ignore[arg-type]
+
+
+class TestDelayToNextBoundary:
+    def test_delay_lands_just_after_next_second(self) -> None:
+        assert delay_to_next_boundary(100.25, 1000) == 751
+        assert delay_to_next_boundary(100.0, 1000) == 1001
+
+    def test_late_timer_does_not_accumulate_drift(self) -> None:
+        assert delay_to_next_boundary(100.03, 1000) == 971
+
+    def test_early_timer_skips_to_following_boundary(self) -> None:
+        assert delay_to_next_boundary(100.9995, 1000) == 1001
+
+
+class TestTickScheduler:
+    def test_ticks_align_to_wall_clock_seconds(self) -> None:
+        root = FakeRoot()
+        clock = FakeClock(10.4)
+        calls: List[float] = []
+        ticks = _scheduler(root, clock)
+
+        ticks.register(lambda: calls.append(clock.now))
+        clock.now = 11.05
+        root.fire()
+
+        assert root.scheduled == [601, 951]
+        assert calls == [11.05]
+
+    def test_inactive_displays_do_not_schedule(self) -> None:
+        root = FakeRoot()
+        live = [True]
+        calls: List[int] = []
+        ticks = _scheduler(root, FakeClock(0.5))
+        ticks.register(lambda: calls.append(1), lambda: live[0])
+
+        live[0] = False
+        root.fire()
+
+        assert calls == []
+        assert root.pending == {}
+
+        live[0] = True
+        ticks.wake()
+        assert len(root.pending) == 1
+
+    def test_one_timer_serves_every_subscriber(self) -> None:
+        root = FakeRoot()
+        calls: List[str] = []
+        ticks = _scheduler(root, FakeClock(0.5))
+        for name in ("list", "clock", "status"):
+            ticks.register(lambda name=name: calls.append(name))  # type: ignore[misc]
+
+        root.fire()
+
+        assert calls == ["list", "clock", "status"]
+        assert len(root.pending) == 1
+
+    def test_minimized_window_suspends_until_restored(self) -> None:
+        root = FakeRoot()
+        calls: List[int] = []
+        ticks = _scheduler(root, FakeClock(0.5))
+        ticks.register(lambda: calls.append(1))
+
+        root.send("<Unmap>", root)
+        assert root.pending == {}
+
+        root.send("<Map>", root)
+        assert calls == [1]
+        assert len(root.pending) == 1
+
+    def test_child_widget_unmap_is_ignored(self) -> None:
+        root = FakeRoot()
+        ticks = _scheduler(root, FakeClock(0.5))
+        ticks.register(lambda: None)
+
+        root.send("<Unmap>", object())
+
+        assert len(root.pending) == 1
+
+    def test_unregistered_display_stops_ticks(self) -> None:
+        root = FakeRoot()
+        ticks = _scheduler(root, FakeClock(0.5))
+        handle = ticks.register(lambda: None)
+
+        ticks.unregister(handle)
+
+        assert root.pending == {}
@@ -0,0 +1,57 @@
+from src.ui.virtual_list import RowWindow
+
+
+class TestRowWindow:
+    def test_window_shows_first_rows(self) -> None:
+        window = RowWindow(visible=10)
+        window.set_total(100_000)
+
+        assert window.rows() == range(0, 10)
+        assert window.fractions() == (0.0, 10 / 100_000)
+
+    def test_short_list_shows_every_row(self) -> None:
+        window = RowWindow(visible=10)
+        window.set_total(3)
+
+        assert window.rows() == range(0, 3)
+        assert window.fractions() == (0.0, 1.0)
+
+    def test_scrolling_is_clamped_to_the_last_page(self) -> None:
+        window = RowWindow(visible=10)
+        window.set_total(100)
+
+        window.scroll_by(95)
+        assert window.rows() == range(90, 100)
+
+        window.scroll_by(-200)
+        assert window.top == 0
+
+        window.scroll_to(0.5)
+        assert window.rows() == range(50, 60)
+
+    def test_follow_tail_keeps_newest_row_visible(self) -> None:
+        window = RowWindow(visible=3, follow_tail=True)
+        for total in range(1, 6):
+            window.set_total(total)
+
+        assert window.rows() == range(2, 5)
+        assert window.contains(4)
+        assert not window.contains(1)
+
+    def test_follow_tail_stops_when_scrolled_away(self) -> None:
+        window = RowWindow(visible=3, follow_tail=True)
+        window.set_total(10)
+        window.scroll_to(0.0)
+
+        window.set_total(11)
+
+        assert window.rows() == range(0, 3)
+
+    def test_resizing_keeps_window_inside_rows(self) -> None:
+        window = RowWindow(visible=5)
+        window.set_total(20)
+        window.scroll_by(15)
+
+        window.set_visible(8)
+
+        assert window.rows() == range(12, 20)
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 
 from src.models.session import Session
-from src.utils.markdown import format_sessions_to_markdown
+from src.utils.markdown import SessionMarkdownLines, format_sessions_to_markdown
 
 
 class TestMarkdown:
@@ -51,3 +51,49 @@ class TestMarkdown:
 
         assert "# Task Summary" in markdown
         assert "No tasks recorded." in markdown
+
+    def test_lines_match_formatted_markdown(self) -> None:
+        sessions = []
+        for i in range(2):
+            session = Session(f"Task {i+1}")
+            session.start_time = datetime(2024, 1, 1, 10, 0, 0) + timedelta(hours=i)
+            session.end_time = session.start_time + timedelta(minutes=20 * (i + 1))
+            session.is_running = False
+            sessions.append(session)
+        expected = (
+            "# Task Summary\n"
+            "\n"
+            "## Tasks\n"
+            "\n"
+            "- **Task 1**: 00:20:00\n"
+            "  - Start: 2024-01-01 10:00:00\n"
+            "  - End: 2024-01-01 10:20:00\n"
+            "\n"
+            "- **Task 2**: 00:40:00\n"
+            "  - Start: 2024-01-01 11:00:00\n"
+            "  - End: 2024-01-01 11:40:00\n"
+            "\n"
+            "## Total Time: 01:00:00"
+        )
+
+        lines = SessionMarkdownLines(sessions)
+
+        assert format_sessions_to_markdown(sessions) == expected
+        assert [lines.line(index) for index in range(len(lines))] == expected.split("\n")
+
+    def test_empty_lines_match_formatted_markdown(self) -> None:
+        lines = SessionMarkdownLines([])
+
+        assert format_sessions_to_markdown([]) == "# Task Summary\n\nNo tasks recorded."
+        assert [lines.line(index) for index in range(len(lines))] == ["# Task Summary", "", "No tasks recorded."]
+
+    def test_lines_are_built_on_demand(self) -> None:
+        session = Session("Long Day")
+        session.start_time = datetime(2024, 1, 1, 9, 0, 0)
+        session.end_time = session.start_time + timedelta(minutes=5)
+        session.is_running = False
+        lines = SessionMarkdownLines([session] * 100_000)
+
+        assert len(lines) == 4 + 4 * 100_000 + 1
+        assert lines.line(4 + 4 * 99_999) == "- **Long Day**: 00:05:00"
+        assert lines.line(len(lines) - 1) == "## Total Time: 8333:20:00"
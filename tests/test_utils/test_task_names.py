@@ -0,0 +1,40 @@
+from src.utils.task_names import TaskNameIndex, normalize_task_name
+
+
+class TestNormalizeTaskName:
+    def test_full_width_characters_become_half_width(self) -> None:
+        assert normalize_task_name("ＰｒｏｊｅｃｔＡ　開発１") == "projecta 開発1"
+
+    def test_half_width_katakana_becomes_full_width(self) -> None:
+        assert normalize_task_name("ﾌﾟﾛｼﾞｪｸﾄA") == "プロジェクトa"
+
+    def test_whitespace_is_collapsed_and_trimmed(self) -> None:
+        assert normalize_task_name("  Review \t PR\n 12 ") == "review pr 12"
+
+    def test_casefold_can_be_disabled(self) -> None:
+        assert normalize_task_name(" ＡＰＩ  Design", casefold=False) == "API Design"
+
+
+class TestTaskNameIndex:
+    def test_first_spelling_becomes_canonical(self) -> None:
+        index = TaskNameIndex()
+
+        assert index.canonical("API  Design") == "API Design"
+        assert index.canonical("ａｐｉ design") == "API Design"
+        assert index.lookup("Api Design") == "API Design"
+        assert index.lookup("Other") is None
+        assert len(index) == 1
+
+    def test_case_sensitive_index_keeps_case_variants_apart(self) -> None:
+        index = TaskNameIndex(casefold=False)
+
+        assert index.canonical("Review") == "Review"
+        assert index.canonical("review") == "review"
+        assert index.canonical("Ｒｅｖｉｅｗ") == "Review"
+
+    def test_canonicalize_removes_variants_in_order(self) -> None:
+        index = TaskNameIndex()
+
+        names = index.canonicalize(["雑務", "Task  A", "task a", "雑務", "ＴＡＳＫ Ａ", "Task B"])
+
+        assert names == ["雑務", "Task A", "Task B"]